@@ -3,16 +3,24 @@
 # Date    :  3/10/2025
 # Author: Jody Ingram
 # Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+#           Requires NumPy for the enemy swarm - https://pypi.org/project/numpy
 # Select your specific mage; kill 20 enemies to win; get hit and loose
 
+import time
+STARTUP_BEGIN = time.perf_counter()  # Startup is timed from here
+
 import pygame
 import sys
 import os
 import random
-from enemy import Enemy
-
-# Initialize pygame
-pygame.init()
+import argparse
+from enemy import EnemySwarm
+from fixed_timestep import FixedTimestep, lerp, TUNED_HZ
+from text_cache import get_font, render_text, warm_fonts
+from frame_profiler import FrameProfiler, disabled_profiler
+from replay import ReplayRecorder, numbered_path, state_checksum
+from assets import get_sprite
+from input_map import InputMap
 
 # Constants
 SCREEN_WIDTH = 800
@@ -29,11 +37,65 @@ GRAVITY = 0.5
 JUMP_STRENGTH = -10
 PROJECTILE_SPEED = 7
 ENEMY_SPAWN_RATE = 2000  # milliseconds
+ENEMY_SPAWN_FLOOR = 500  # Shortest spawn delay the game speeds up to, in milliseconds
+ENEMY_SPAWN_SPEEDUP = 50  # Milliseconds taken off the spawn delay per kill
+PHYSICS_HZ = 60  # Physics steps per second, independent of FPS
+PROJECTILE_POOL_SIZE = 256  # Idle projectiles kept for reuse
+DIRTY_RECT_RENDERING = False  # Only push changed regions of the screen
+DIRTY_FULL_REDRAW_RATIO = 0.5  # Fall back to a full flip above this share of dirty area
+
+# Player actions, also the input codes stored in replays (see replay.py)
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_JUMP = 3
+ACTION_SHOOT = 4
+ACTION_STOP = 5
+PLAYER_ACTIONS = (ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP, ACTION_SHOOT, ACTION_STOP)
+
+# Actions for the game over screen, never recorded
+ACTION_RESTART = "restart"
+ACTION_QUIT = "quit"
+
+# Key bindings: actions fire on key down, and letting go of either arrow stops the mage
+MAGE_PRESS = {
+    ACTION_LEFT: (pygame.K_LEFT,),
+    ACTION_RIGHT: (pygame.K_RIGHT,),
+    ACTION_JUMP: (pygame.K_UP, pygame.K_SPACE),
+    ACTION_SHOOT: (pygame.K_z,),
+    ACTION_RESTART: (pygame.K_r,),
+    ACTION_QUIT: (pygame.K_q,),
+}
+MAGE_RELEASE = {ACTION_STOP: (pygame.K_LEFT, pygame.K_RIGHT)}
+
+# Fonts used by the menus and HUD, loaded in the background at startup
+UI_FONTS = (("Arial", 40), ("Arial", 24), ("Arial", 20))
+
+# The window and clock are created by init_display(), so importing this module
+# (replays, benchmarks, tools) doesn't open a window
+screen = None
+clock = None
+
+# Milliseconds from STARTUP_BEGIN to each startup milestone
+startup_marks = {}
 
-# Set up the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Mages of Might and Power")
-clock = pygame.time.Clock()
+def mark_startup(name):
+    if name not in startup_marks:
+        startup_marks[name] = (time.perf_counter() - STARTUP_BEGIN) * 1000
+
+def startup_report():
+    return "Startup: " + ", ".join(f"{name} after {ms:.0f} ms" for name, ms in startup_marks.items())
+
+# Set up the screen, initializing only the subsystems the game uses (no audio or joysticks)
+def init_display():
+    global screen, clock
+    if screen is None:
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Mages of Might and Power")
+        clock = pygame.time.Clock()
+        mark_startup("window")
+    return screen
 
 # Create placeholder images
 def create_colored_surface(width, height, color):
@@ -41,46 +103,115 @@ def create_colored_surface(width, height, color):
     surface.fill(color)
     return surface
 
+# Projectile look per mage type: color and (width, height)
+PROJECTILE_STYLES = {
+    "fire": (RED, (20, 10)),
+    "water": (BLUE, (15, 15)),
+    "earth": (GREEN, (25, 25)),
+    "air": (YELLOW, (30, 8)),
+}
+
+# Solid-color sprite from the shared atlas
+def get_colored_sprite(width, height, color):
+    return get_sprite(("colored", width, height, color), (width, height), lambda surface: surface.fill(color))
+
+# One shared image per mage type, created on first use
+def get_projectile_image(mage_type):
+    color, (width, height) = PROJECTILE_STYLES[mage_type]
+    return get_colored_sprite(width, height, color)
+
 # Projectile class
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction, mage_type):
+    def __init__(self, x, y, direction, mage_type, pool=None, speed=PROJECTILE_SPEED, size=None):
         super().__init__()
         self.mage_type = mage_type
+        self.pool = pool
         
         # Set properties based on mage type
-        if mage_type == "fire":
-            self.color = RED
-            self.width, self.height = 20, 10
-        elif mage_type == "water":
-            self.color = BLUE
-            self.width, self.height = 15, 15
-        elif mage_type == "earth":
-            self.color = GREEN
-            self.width, self.height = 25, 25
-        elif mage_type == "air":
-            self.color = YELLOW
-            self.width, self.height = 30, 8
+        self.color, (self.width, self.height) = PROJECTILE_STYLES[mage_type]
             
-        # Create the projectile image
-        self.image = pygame.Surface((self.width, self.height))
-        self.image.fill(self.color)
+        # Shared projectile image
+        self.image = get_projectile_image(mage_type)
         self.rect = self.image.get_rect()
+        self.launch(x, y, direction, speed, size)
         
-        # Set position and direction
+    def launch(self, x, y, direction, speed=PROJECTILE_SPEED, size=None):
+        # Set position and direction (also used when a pooled projectile is reused);
+        # size overrides the mage type's projectile size, for balance tuning
+        width, height = size or PROJECTILE_STYLES[self.mage_type][1]
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = width, height
+            self.image = get_colored_sprite(width, height, self.color)
+            self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        self.x, self.y = self.rect.topleft
+        self.prev_x, self.prev_y = self.x, self.y
         self.direction = direction
-        self.speed = PROJECTILE_SPEED
+        self.speed = speed
+        self.active = True
+        
+    def update(self, time_scale=1.0):
+        self.prev_x = self.x
         
-    def update(self):
         # Move in the correct direction
         if self.direction == "right":
-            self.rect.x += self.speed
+            self.x += self.speed * time_scale
         else:
-            self.rect.x -= self.speed
+            self.x -= self.speed * time_scale
+        self.rect.x = round(self.x)
             
         # Remove if off screen
         if self.rect.right < 0 or self.rect.left > SCREEN_WIDTH:
             self.kill()
+    
+    def kill(self):
+        super().kill()
+        # Hand the projectile back for reuse instead of leaving it to the GC
+        if self.active:
+            self.active = False
+            if self.pool is not None:
+                self.pool.release(self)
+
+# Reuses killed projectiles so rapid fire doesn't churn sprites
+class ProjectilePool:
+    def __init__(self, max_size=PROJECTILE_POOL_SIZE):
+        self.max_size = max_size
+        self.free = {}
+        self.free_count = 0
+        
+        # Stats
+        self.allocated = 0
+        self.reused = 0
+        self.discarded = 0
+    
+    def acquire(self, x, y, direction, mage_type, speed=PROJECTILE_SPEED, size=None):
+        free = self.free.get(mage_type)
+        if free:
+            projectile = free.pop()
+            self.free_count -= 1
+            self.reused += 1
+            projectile.launch(x, y, direction, speed, size)
+            return projectile
+        
+        self.allocated += 1
+        return Projectile(x, y, direction, mage_type, self, speed, size)
+    
+    def release(self, projectile):
+        if self.free_count >= self.max_size:
+            self.discarded += 1
+            return
+        self.free.setdefault(projectile.mage_type, []).append(projectile)
+        self.free_count += 1
+    
+    def stats(self):
+        return {
+            "allocated": self.allocated,
+            "allocations_avoided": self.reused,
+            "pooled": self.free_count,
+            "discarded": self.discarded,
+        }
+
+projectile_pool = ProjectilePool()
 
 # Player class
 class Player(pygame.sprite.Sprite):
@@ -103,10 +234,14 @@ class Player(pygame.sprite.Sprite):
             self.attack_type = "wind streak"
         
         # Create temporary sprite
-        self.image = create_colored_surface(40, 60, self.color)
+        self.image = get_colored_sprite(40, 60, self.color)
         self.rect = self.image.get_rect()
         self.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100)
         
+        # Exact position; rect is rounded from it after each physics step
+        self.x, self.y = self.rect.topleft
+        self.prev_x, self.prev_y = self.x, self.y
+        
         # Movement attributes
         self.velocity_x = 0
         self.velocity_y = 0
@@ -114,26 +249,31 @@ class Player(pygame.sprite.Sprite):
         self.facing_right = True
         self.kills = 0
     
-    def update(self):
+    def update(self, time_scale=1.0):
+        # time_scale shrinks each step when physics runs faster than 60 Hz
+        self.prev_x, self.prev_y = self.x, self.y
+        
         # Apply gravity
         if not self.on_ground:
-            self.velocity_y += GRAVITY
+            self.velocity_y += GRAVITY * time_scale
         
         # Update position
-        self.rect.x += self.velocity_x
-        self.rect.y += self.velocity_y
+        self.x += self.velocity_x * time_scale
+        self.y += self.velocity_y * time_scale
         
         # Check boundaries
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
+        if self.x < 0:
+            self.x = 0
+        if self.x + self.rect.width > SCREEN_WIDTH:
+            self.x = SCREEN_WIDTH - self.rect.width
         
         # Simple ground collision (temporary)
-        if self.rect.bottom > SCREEN_HEIGHT:
-            self.rect.bottom = SCREEN_HEIGHT
+        if self.y + self.rect.height > SCREEN_HEIGHT:
+            self.y = SCREEN_HEIGHT - self.rect.height
             self.velocity_y = 0
             self.on_ground = True
+        
+        self.rect.topleft = (round(self.x), round(self.y))
     
     def move_left(self):
         self.velocity_x = -PLAYER_SPEED
@@ -151,23 +291,119 @@ class Player(pygame.sprite.Sprite):
             self.velocity_y = JUMP_STRENGTH
             self.on_ground = False
     
-    def shoot(self):
-        # Create a new projectile
+    def shoot(self, pool=projectile_pool, speed=PROJECTILE_SPEED, size=None):
+        # Take a projectile from the pool (or create one if there is no pool)
         direction = "right" if self.facing_right else "left"
         if self.facing_right:
-            projectile = Projectile(self.rect.right, self.rect.centery, direction, self.mage_type)
+            x = self.rect.right
+        else:
+            x = self.rect.left
+        
+        if pool is None:
+            return Projectile(x, self.rect.centery, direction, self.mage_type, None, speed, size)
+        return pool.acquire(x, self.rect.centery, direction, self.mage_type, speed, size)
+
+# Where each sprite is drawn, between its previous and current physics positions
+def sprite_positions(sprites, alpha=1.0):
+    positions = []
+    for sprite in sprites:
+        if hasattr(sprite, "prev_x"):
+            position = (round(lerp(sprite.prev_x, sprite.x, alpha)), round(lerp(sprite.prev_y, sprite.y, alpha)))
         else:
-            projectile = Projectile(self.rect.left, self.rect.centery, direction, self.mage_type)
+            position = sprite.rect.topleft
+        positions.append((sprite, sprite.image, position))
+    return positions
+
+def draw_sprites(surface, sprites, alpha=1.0):
+    surface.blits([(image, position) for _, image, position in sprite_positions(sprites, alpha)], False)
+
+# Static part of the game screen
+def create_level_background():
+    background = create_colored_surface(SCREEN_WIDTH, SCREEN_HEIGHT, BLACK)
+    
+    # Draw level (placeholder)
+    pygame.draw.rect(background, WHITE, [0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20])
+    return background.convert()
+
+# Opt-in renderer that only redraws and pushes the parts of the screen that changed
+class DirtyRectRenderer:
+    def __init__(self, surface, background, full_redraw_ratio=DIRTY_FULL_REDRAW_RATIO):
+        self.surface = surface
+        self.background = background
+        self.full_redraw_ratio = full_redraw_ratio
+        self.screen_area = surface.get_width() * surface.get_height()
+        self.previous = None
+        
+        # Stats
+        self.frames = 0
+        self.full_redraws = 0
+        self.dirty_ratio = 1.0
+        self.total_dirty_ratio = 0.0
+    
+    def render(self, items):
+        # items is a list of (key, image, position) in drawing order; an item is
+        # dirty when its image or rect differs from the last frame
+        current = {}
+        for key, image, position in items:
+            current[key] = (image, image.get_rect(topleft=position))
+        
+        dirty = []
+        if self.previous is not None:
+            for key, (image, rect) in current.items():
+                old = self.previous.get(key)
+                if old is None:
+                    dirty.append(rect)
+                elif old[0] is not image or old[1] != rect:
+                    dirty.append(old[1])
+                    dirty.append(rect)
+            for key, (image, rect) in self.previous.items():
+                if key not in current:
+                    dirty.append(rect)
             
-        return projectile
+            screen_rect = self.surface.get_rect()
+            dirty = [rect.clip(screen_rect) for rect in dirty]
+            dirty = [rect for rect in dirty if rect.width and rect.height]
+            # Overlapping rects are counted twice, which only errs towards a full redraw
+            dirty_area = sum(rect.width * rect.height for rect in dirty)
+            self.dirty_ratio = min(1.0, dirty_area / self.screen_area)
+        else:
+            self.dirty_ratio = 1.0
+        
+        self.previous = current
+        self.frames += 1
+        self.total_dirty_ratio += self.dirty_ratio
+        
+        if self.dirty_ratio >= self.full_redraw_ratio:
+            # So much changed that one full flip is cheaper
+            self.full_redraws += 1
+            self.surface.blit(self.background, (0, 0))
+            self.surface.blits([(image, rect) for image, rect in current.values()], False)
+            pygame.display.flip()
+            return
+        
+        if not dirty:
+            return
+        
+        # Restore the background under changed regions, then redraw whatever touches them
+        for rect in dirty:
+            self.surface.blit(self.background, rect, rect)
+        for image, rect in current.values():
+            if rect.collidelist(dirty) != -1:
+                self.surface.blit(image, rect)
+        pygame.display.update(dirty)
+    
+    def average_dirty_ratio(self):
+        return self.total_dirty_ratio / self.frames if self.frames else 0.0
+    
+    def report(self):
+        return (f"Dirty rects: {self.frames} frames, {self.full_redraws} full redraws, "
+                f"average dirty area {self.average_dirty_ratio():.1%}")
 
 # Character selection screen
-def character_selection_screen():
-    title_font = pygame.font.SysFont("Arial", 40)
-    option_font = pygame.font.SysFont("Arial", 24)
-    
-    title_text = title_font.render("Select Your Mage", True, WHITE)
-    title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
+# Text is left out until font_warmup (a warm_fonts thread) has loaded the fonts,
+# so the first frame doesn't wait on the system font scan
+def character_selection_screen(font_warmup=None):
+    init_display()
     
     mage_types = ["fire", "water", "earth", "air"]
     mage_colors = [RED, BLUE, GREEN, YELLOW]
@@ -177,20 +413,28 @@ def character_selection_screen():
     
     selected = None
     
+    # The menu only reads clicks (and the window closing)
+    controls = InputMap(events=(pygame.MOUSEBUTTONDOWN,))
+    controls.activate()
+    
     while selected is None:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            
+        frame_input = controls.poll()
+        if frame_input.quit:
+            pygame.quit()
+            sys.exit()
+        
+        for event in frame_input.events:
             if event.type == pygame.MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
                 for i, rect in enumerate(mage_rects):
-                    if rect.collidepoint(pos):
+                    if rect.collidepoint(event.pos):
                         selected = mage_types[i]
         
+        fonts_ready = font_warmup is None or not font_warmup.is_alive()
+        
         screen.fill(BLACK)
-        screen.blit(title_text, title_rect)
+        if fonts_ready:
+            title_text = render_text(get_font("Arial", 40), "Select Your Mage", WHITE)
+            screen.blit(title_text, title_text.get_rect(center=(SCREEN_WIDTH // 2, 80)))
         
         # Draw mage options
         mage_rects = []
@@ -208,140 +452,313 @@ def character_selection_screen():
             pygame.draw.rect(screen, color, mage_rect)
             
             # Draw mage name
-            name_text = option_font.render(name, True, WHITE)
-            name_rect = name_text.get_rect(center=(rect_x + rect_width // 2, rect_y + rect_height + 30))
-            screen.blit(name_text, name_rect)
+            if fonts_ready:
+                name_text = render_text(get_font("Arial", 24), name, WHITE)
+                name_rect = name_text.get_rect(center=(rect_x + rect_width // 2, rect_y + rect_height + 30))
+                screen.blit(name_text, name_rect)
         
         pygame.display.flip()
+        mark_startup("first frame")
+        if fonts_ready:
+            mark_startup("fonts ready")
         clock.tick(FPS)
     
     return selected
 
-# Main game loop
-def game_loop(player):
-    # Game state
-    game_over = False
-    victory = False
-    score = 0
+# One match: the player, sprite groups, enemy spawning and win/lose state.
+# Time is simulated (advanced by each physics step), so a match only depends
+# on its seed and inputs.
+class GameWorld:
+    def __init__(self, player, start_time=0, profiler=disabled_profiler, seed=None, spawn_rate=ENEMY_SPAWN_RATE,
+                 spawn_floor=ENEMY_SPAWN_FLOOR, projectile_speed=PROJECTILE_SPEED, projectile_sizes=None):
+        self.player = player
+        self.profiler = profiler
+        self.game_over = False
+        self.victory = False
+        self.time = start_time  # Milliseconds
+        
+        # Create sprite groups; enemies are an array-backed swarm
+        self.all_sprites = pygame.sprite.Group()
+        self.enemies = EnemySwarm(SCREEN_WIDTH, SCREEN_HEIGHT, seed)
+        self.projectiles = pygame.sprite.Group()
+        self.all_sprites.add(player)
+        
+        # Balance settings (swept by mages_balance.py); projectile_sizes maps
+        # mage type -> (width, height) for the types that differ from PROJECTILE_STYLES
+        self.spawn_rate = spawn_rate
+        self.spawn_floor = spawn_floor
+        self.projectile_speed = projectile_speed
+        self.projectile_sizes = projectile_sizes or {}
+        
+        # Enemy spawning timer
+        self.last_enemy_spawn = start_time
+        self.enemy_spawn_delay = spawn_rate
     
-    # Create sprite groups
-    all_sprites = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    projectiles = pygame.sprite.Group()
-    all_sprites.add(player)
+    @property
+    def finished(self):
+        return self.game_over or self.victory
     
-    # Enemy spawning timer
-    last_enemy_spawn = pygame.time.get_ticks()
-    enemy_spawn_delay = ENEMY_SPAWN_RATE
+    def handle_actions(self, actions):
+        # Applies the player's actions; returns them, for recording
+        if self.finished:
+            return []
+        actions = [action for action in actions if action in PLAYER_ACTIONS]
+        for action in actions:
+            self.apply_action(action)
+        return actions
     
-    # Main game loop
-    running = True
-    while running:
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            
-            if not game_over and not victory:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_LEFT:
-                        player.move_left()
-                    if event.key == pygame.K_RIGHT:
-                        player.move_right()
-                    if event.key == pygame.K_UP or event.key == pygame.K_SPACE:
-                        player.jump()
-                    if event.key == pygame.K_z:
-                        new_projectile = player.shoot()
-                        projectiles.add(new_projectile)
-                        all_sprites.add(new_projectile)
-                
-                if event.type == pygame.KEYUP:
-                    if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
-                        player.stop()
+    def apply_action(self, action):
+        player = self.player
+        if action == ACTION_LEFT:
+            player.move_left()
+        elif action == ACTION_RIGHT:
+            player.move_right()
+        elif action == ACTION_JUMP:
+            player.jump()
+        elif action == ACTION_SHOOT:
+            self.shoot()
+        elif action == ACTION_STOP:
+            player.stop()
+    
+    def shoot(self):
+        player = self.player
+        new_projectile = player.shoot(speed=self.projectile_speed, size=self.projectile_sizes.get(player.mage_type))
+        self.projectiles.add(new_projectile)
+        self.all_sprites.add(new_projectile)
+        return new_projectile
+    
+    def spawn_enemy(self, count=1):
+        self.enemies.spawn(count)
+    
+    def step(self, time_scale=1.0):
+        # One fixed physics step
+        player = self.player
+        profiler = self.profiler
+        self.time += time_scale * 1000 / TUNED_HZ
+        current_time = self.time
+        with profiler.scope("update"):
+            self.all_sprites.update(time_scale)
+            self.enemies.update(player.rect.centerx, player.rect.centery, time_scale)
         
-        # Update
-        # Update
-        if not game_over and not victory:
-            all_sprites.update()
-            
-            # Spawn enemies
-            current_time = pygame.time.get_ticks()
-            if current_time - last_enemy_spawn > enemy_spawn_delay:
-                new_enemy = Enemy(SCREEN_WIDTH, SCREEN_HEIGHT, player)
-                enemies.add(new_enemy)
-                all_sprites.add(new_enemy)
-                last_enemy_spawn = current_time
+        # Spawn enemies
+        with profiler.scope("spawn"):
+            if current_time - self.last_enemy_spawn > self.enemy_spawn_delay:
+                self.spawn_enemy()
+                self.last_enemy_spawn = current_time
                 
-                # Gradually decrease spawn time as game progresses (to a minimum of 500ms)
-                enemy_spawn_delay = max(500, ENEMY_SPAWN_RATE - player.kills * 50)
-            
+                # Gradually decrease spawn time as game progresses (down to the spawn floor)
+                self.enemy_spawn_delay = max(self.spawn_floor, self.spawn_rate - player.kills * ENEMY_SPAWN_SPEEDUP)
+        
+        with profiler.scope("collisions"):
             # Check for collisions between player and enemies
-            if pygame.sprite.spritecollide(player, enemies, False):
-                game_over = True
+            if self.enemies.collides_with(player.rect):
+                self.game_over = True
                 
             # Check for collisions between projectiles and enemies
-            hits = pygame.sprite.groupcollide(projectiles, enemies, True, True)
-            for hit in hits:
-                player.kills += 1
-                
-            # Check for game over or victory
-            if player.kills >= 20:
-                victory = True
+            projectiles = self.projectiles.sprites()
+            hits = self.enemies.resolve_hits([projectile.rect for projectile in projectiles])
+            for projectile, hit in zip(projectiles, hits):
+                if hit:
+                    projectile.kill()
+                    player.kills += 1
+            
+        # Check for game over or victory
+        if player.kills >= 20:
+            self.victory = True
+    
+    def checksum(self):
+        # Everything a step can change, for replay verification
+        player = self.player
+        enemies = self.enemies
+        n = len(enemies)
+        return state_checksum(
+            (player.x, player.y, player.velocity_x, player.velocity_y, player.kills, 
+             self.game_over, self.victory, self.time, self.last_enemy_spawn, self.enemy_spawn_delay),
+            [projectile.x for projectile in self.projectiles],
+            enemies.x[:n].tobytes(), enemies.y[:n].tobytes())
+    
+    def ui_items(self, font):
+        # Draw UI
+        kill_text = render_text(font, f"Enemies Defeated: {self.player.kills}/20", WHITE)
+        items = [("kills", kill_text, (10, 10))]
+        
+        # Draw game over or victory message
+        if self.game_over:
+            message = render_text(font, "Game Over! Press R to restart or Q to quit", RED)
+            items.append(("game over", message, (SCREEN_WIDTH // 2 - message.get_width() // 2, SCREEN_HEIGHT // 2)))
+        
+        if self.victory:
+            message = render_text(font, "Victory! Press R to restart or Q to quit", GREEN)
+            items.append(("victory", message, (SCREEN_WIDTH // 2 - message.get_width() // 2, SCREEN_HEIGHT // 2)))
+        return items
+    
+    def draw(self, surface, font, alpha=1.0):
         # Draw
-        screen.fill(BLACK)
+        surface.fill(BLACK)
         
         # Draw level (placeholder)
-        pygame.draw.rect(screen, WHITE, [0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20])
+        pygame.draw.rect(surface, WHITE, [0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20])
         
-        # Draw sprites
-        all_sprites.draw(screen)
+        # Draw enemies, then the player and projectiles on top
+        self.enemies.draw(surface, alpha)
+        draw_sprites(surface, self.all_sprites, alpha)
         
-        # Draw UI
-        font = pygame.font.SysFont("Arial", 20)
-        kill_text = font.render(f"Enemies Defeated: {player.kills}/20", True, WHITE)
-        screen.blit(kill_text, (10, 10))
+        for _, image, position in self.ui_items(font):
+            surface.blit(image, position)
+
+# Main game loop
+def game_loop(player, dirty_rects=DIRTY_RECT_RENDERING, profiler=None, seed=None, recorder=None, controls=None):
+    # Per-phase timings; F3 shows the overlay
+    if profiler is None:
+        profiler = FrameProfiler()
+    init_display()
+    
+    # Keyboard input, read once at the start of each frame
+    if controls is None:
+        controls = InputMap(MAGE_PRESS, MAGE_RELEASE)
+    controls.activate()
+    
+    # Game state
+    world = GameWorld(player, 0, profiler, seed)
+    
+    # Actions waiting for the next physics step, when recording
+    pending = []
+    
+    # Physics runs in fixed steps, independent of the frame rate
+    timestep = FixedTimestep(PHYSICS_HZ)
+    
+    # UI text comes from the shared text cache, so unchanged text is not re-rendered
+    font = get_font("Arial", 20)
+    
+    renderer = None
+    if dirty_rects:
+        background = create_level_background()
+        renderer = DirtyRectRenderer(screen, background)
+    
+    # Main game loop
+    result = "quit"
+    running = True
+    end_screen_shown = False
+    while running:
+        profiler.begin_frame()
         
-        # Draw game over or victory message
-        if game_over:
-            message = font.render("Game Over! Press R to restart or Q to quit", True, RED)
-            screen.blit(message, (SCREEN_WIDTH // 2 - message.get_width() // 2, SCREEN_HEIGHT // 2))
+        # Handle input
+        with profiler.scope("events"):
+            frame_input = controls.poll()
+            if frame_input.quit:
+                running = False
+            for event in frame_input.events:
+                profiler.handle_event(event)
+            pending.extend(world.handle_actions(frame_input.actions))
         
-        if victory:
-            message = font.render("Victory! Press R to restart or Q to quit", True, GREEN)
-            screen.blit(message, (SCREEN_WIDTH // 2 - message.get_width() // 2, SCREEN_HEIGHT // 2))
+        # Update
+        alpha = 1.0
+        if not world.finished:
+            # Run as many fixed physics steps as real time calls for
+            for _ in range(timestep.advance()):
+                world.step(timestep.time_scale)
+                controls.applied()
+                if recorder is not None:
+                    recorder.record(pending, world.checksum())
+                pending = []
+                if world.finished:
+                    break
+            else:
+                alpha = timestep.alpha
         
-        pygame.display.flip()
+        if renderer is not None:
+            with profiler.scope("draw"):
+                renderer.render(world.enemies.render_items(alpha) + sprite_positions(world.all_sprites, alpha) + 
+                                world.ui_items(font))
+        else:
+            with profiler.scope("draw"):
+                world.draw(screen, font, alpha)
+                profiler.draw_overlay(screen, font)
+            with profiler.scope("flip"):
+                pygame.display.flip()
+        controls.presented()
+        
+        profiler.end_frame()
         clock.tick(FPS)
         
-        # Handle game over or victory
-        if game_over or victory:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_r]:
-                return "restart"
-            elif keys[pygame.K_q]:
-                return "quit"
+        # Handle game over or victory. Restart and quit only count from the
+        # frame after the end screen first showed, so a key pressed as the
+        # match ends can't skip it.
+        if world.finished:
+            controls.discard()
+            if not end_screen_shown:
+                end_screen_shown = True
+            elif ACTION_RESTART in frame_input.actions:
+                running = False
+                result = "restart"
+            elif ACTION_QUIT in frame_input.actions:
+                running = False
     
-    return "quit"
+    if renderer is not None:
+        print(renderer.report())
+    return result
+
+# Rebuilds a recorded match; step(codes) applies the actions and re-runs one physics step
+def replay_world(replay):
+    world = GameWorld(Player(replay.meta["mage"]), 0, seed=replay.seed)
+    time_scale = FixedTimestep(replay.physics_hz).time_scale
+    
+    def step(codes):
+        for action in codes:
+            world.apply_action(action)
+        world.step(time_scale)
+        return world.checksum()
+    return world, step
 
 # Main game function
-def main():
+def main(dirty_rects=DIRTY_RECT_RENDERING, profile=False, profile_output=None, record=None, input_latency=False):
+    # One profiler and one set of controls for the whole session; the profiler
+    # records when asked for, F3 shows it otherwise
+    profiler = FrameProfiler(enabled=profile or profile_output is not None)
+    controls = InputMap(MAGE_PRESS, MAGE_RELEASE)
     running = True
+    match = 0
+    
+    # Open the window, then load fonts while the selection screen draws
+    init_display()
+    font_warmup = warm_fonts(UI_FONTS)
     
     while running:
         # Start with character selection screen
-        selected_mage = character_selection_screen()
+        selected_mage = character_selection_screen(font_warmup)
+        if match == 0:
+            print(startup_report())
         
         # Create player with selected mage type
         player = Player(selected_mage)
         
+        # Every match gets its own seed so it can be recorded and replayed
+        match += 1
+        seed = random.randrange(2 ** 31)
+        recorder = ReplayRecorder("mages", seed, PHYSICS_HZ, mage=selected_mage) if record else None
+        
         # Start game loop
-        result = game_loop(player)
+        result = game_loop(player, dirty_rects, profiler, seed, recorder, controls)
+        if recorder is not None:
+            recorder.save(numbered_path(record, match))
         
         if result == "quit":
             running = False
+    
+    if profile_output:
+        profiler.export(profile_output)
+    if input_latency:
+        print(controls.latency.report())
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Mages of Might and Power")
+    parser.add_argument("--dirty-rects", action="store_true", help="only redraw and push changed screen regions")
+    parser.add_argument("--profile", action="store_true", help="record per-phase frame timings (F3 shows them)")
+    parser.add_argument("--profile-out", help="export timings on exit (.csv, *trace*.json or .json)")
+    parser.add_argument("--record", help="save each match as a replay file (play it back with replay.py)")
+    parser.add_argument("--input-latency", action="store_true", help="report input-to-display latency on exit")
+    args = parser.parse_args()
+    
+    main(DIRTY_RECT_RENDERING or args.dirty_rects, args.profile, args.profile_out, args.record, args.input_latency)
     pygame.quit()
     sys.exit()
-
@@ -3,12 +3,24 @@
 # Date    :  3/10/2025
 # Author: Jody Ingram
 # Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+#           Requires NumPy for the snow particle engine - https://pypi.org/project/numpy
 # Fun platformer starring a Penguin
 
 import pygame
 import random
 import sys
 import math
+import os
+import time
+import argparse
+from fixed_timestep import FixedTimestep, lerp
+from text_cache import get_font, render_text, text_cache
+from frame_profiler import FrameProfiler, disabled_profiler
+from penguin_levels import LevelFile, CONTINUES_LEFT, CONTINUES_RIGHT
+from replay import ReplayRecorder, state_checksum
+from assets import assets, get_sprite
+from input_map import InputMap
+import numpy as np
 
 # Initialize Pygame
 pygame.init()
@@ -21,6 +33,12 @@ GRAVITY = 0.5
 JUMP_STRENGTH = -12
 PLAYER_SPEED = 5
 SNOWFLAKE_COUNT = 100
+HEADLESS_FRAMES = 10000
+PHYSICS_HZ = 60  # Physics steps per second, independent of FPS
+SPATIAL_CELL_SIZE = 100  # Broadphase grid cell size in pixels
+STREAM_CHUNKS_BEHIND = 1  # Level chunks kept loaded behind the camera
+STREAM_CHUNKS_AHEAD = 2  # Level chunks loaded ahead of the camera
+SNOW_SURFARRAY_THRESHOLD = 2000  # Above this many flakes, draw by writing pixels directly
 
 # Colors
 WHITE = (255, 255, 255)
@@ -32,12 +50,60 @@ DARK_BLUE = (25, 25, 112)
 ICE_BLUE = (220, 240, 255)
 GRAY = (128, 128, 128)
 
+# Transparent color for sprites drawn from primitives
+SPRITE_COLORKEY = (255, 0, 255)
+
+# Penguin frames are baked with this much room around the body for the beak,
+# flippers and head
+PENGUIN_FRAME_OFFSET = (20, 20)
+PENGUIN_FRAME_COLORKEY = SPRITE_COLORKEY
+
+# Platforms: colors per style, and the shared tiles every platform is drawn from
+PLATFORM_STYLES = {
+    "ice": {"color": ICE_BLUE, "border": LIGHT_BLUE},
+}
+DEFAULT_PLATFORM_STYLE = "ice"
+PLATFORM_TILE = 200  # Pixels per body tile; wide tiles keep the blit count per frame low
+PLATFORM_CRYSTAL_SPACING = 20  # One possible ice crystal per this many pixels
+PLATFORM_EDGE = 2  # Width of the edge highlight and shadow
+PLATFORM_VARIANTS = 8  # Body tiles (crystal layouts) per style and height
+
+# Background
+BACKGROUND_SEED = 2025
+DEFAULT_THEME = {
+    "sky_top": SKY_BLUE,
+    "sky_bottom": (85, 106, 235),
+    "mountain": (220, 220, 255),  # Light bluish-white
+    "snow": WHITE,
+}
+
 # Game states
 MENU = 0
 PLAYING = 1
 GAME_OVER = 2
 
+# Replay input codes (see replay.py)
+INPUT_START = 1
+INPUT_LEFT = 2
+INPUT_RIGHT = 3
+INPUT_JUMP = 4
+INPUT_QUIT = "quit"  # Closes the game, never recorded
+
+# Key bindings; Space both starts a game and jumps
+PENGUIN_PRESS = {
+    INPUT_QUIT: (pygame.K_ESCAPE,),
+    INPUT_START: (pygame.K_SPACE, pygame.K_RETURN),
+    INPUT_JUMP: (pygame.K_SPACE, pygame.K_UP, pygame.K_w),
+}
+PENGUIN_HOLD = {
+    INPUT_LEFT: (pygame.K_LEFT, pygame.K_a),
+    INPUT_RIGHT: (pygame.K_RIGHT, pygame.K_d),
+}
+
 class Penguin:
+    __slots__ = ("x", "y", "width", "height", "vel_x", "vel_y", "on_ground", "facing_right", 
+                 "animation_count", "animation_timer", "jump_count", "health", "prev_x", "prev_y")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -48,52 +114,74 @@ class Penguin:
         self.on_ground = False
         self.facing_right = True
         self.animation_count = 0
+        self.animation_timer = 0
         self.jump_count = 0
         self.health = 100
+        self.prev_x = x
+        self.prev_y = y
+        
+    def update(self, platforms, time_scale=1.0, world_width=SCREEN_WIDTH):
+        # time_scale shrinks each step when physics runs faster than 60 Hz
+        self.prev_x = self.x
+        self.prev_y = self.y
         
-    def update(self, platforms):
         # Apply gravity
-        self.vel_y += GRAVITY
+        self.vel_y += GRAVITY * time_scale
         
         # Update position
-        self.x += self.vel_x
-        self.y += self.vel_y
+        step_x = self.vel_x * time_scale
+        step_y = self.vel_y * time_scale
+        self.x += step_x
+        self.y += step_y
         
         # Check boundaries
         if self.x < 0:
             self.x = 0
-        if self.x > SCREEN_WIDTH - self.width:
-            self.x = SCREEN_WIDTH - self.width
+        if self.x > world_width - self.width:
+            self.x = world_width - self.width
         
         # Reset on_ground
         self.on_ground = False
         
         # Check collision with platforms
+        if isinstance(platforms, SpatialHash):
+            # Resolving a collision only ever pushes the penguin back towards where
+            # it was before this move, so the swept box holds every candidate
+            swept_x = min(self.x, self.x - step_x)
+            swept_y = min(self.y, self.y - step_y)
+            platforms = platforms.query(swept_x, swept_y, 
+                                        self.width + abs(step_x), self.height + abs(step_y))
         for platform in platforms:
             if self.check_collision(platform):
                 # Collision from top
-                if self.vel_y > 0 and self.y + self.height - self.vel_y <= platform.y:
+                if self.vel_y > 0 and self.y + self.height - step_y <= platform.y:
                     self.y = platform.y - self.height
                     self.vel_y = 0
+                    step_y = 0
                     self.on_ground = True
                     self.jump_count = 0
                 # Collision from bottom
-                elif self.vel_y < 0 and self.y - self.vel_y >= platform.y + platform.height:
+                elif self.vel_y < 0 and self.y - step_y >= platform.y + platform.height:
                     self.y = platform.y + platform.height
                     self.vel_y = 0
+                    step_y = 0
                 # Collision from left
-                elif self.vel_x > 0 and self.x + self.width - self.vel_x <= platform.x:
+                elif self.vel_x > 0 and self.x + self.width - step_x <= platform.x:
                     self.x = platform.x - self.width
                     self.vel_x = 0
+                    step_x = 0
                 # Collision from right
-                elif self.vel_x < 0 and self.x - self.vel_x >= platform.x + platform.width:
+                elif self.vel_x < 0 and self.x - step_x >= platform.x + platform.width:
                     self.x = platform.x + platform.width
                     self.vel_x = 0
+                    step_x = 0
         
-        # Animation counter
+        # Animation counter (advances once per 60 Hz frame whatever the step rate)
         if self.vel_x != 0:
-            self.animation_count = (self.animation_count + 1) % 30
+            self.animation_timer = (self.animation_timer + time_scale) % 30
+            self.animation_count = int(self.animation_timer)
         else:
+            self.animation_timer = 0
             self.animation_count = 0
             
         # Update facing direction
@@ -116,23 +204,66 @@ class Penguin:
             self.y + self.height > platform.y
         )
     
-    def draw(self, screen):
+    def render_position(self, alpha=1.0):
+        # Position between the previous and current physics step
+        if alpha >= 1.0:
+            return self.x, self.y
+        return lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+    
+    def frame_key(self):
+        # Everything the drawing depends on besides position
+        moving = self.vel_x != 0
+        return (self.width, self.height, self.facing_right, moving, self.animation_count if moving else 0)
+    
+    @classmethod
+    def get_frame(cls, key):
+        # Pose frames are drawn once into the shared sprite atlas
+        width, height, facing_right, moving, animation_count = key
+        offset_x, offset_y = PENGUIN_FRAME_OFFSET
+        
+        def draw(frame):
+            pose = cls(offset_x, offset_y)
+            pose.width, pose.height = width, height
+            pose.facing_right = facing_right
+            pose.vel_x = 1 if moving else 0
+            pose.animation_count = animation_count
+            pose.draw_primitives(frame, offset_x, offset_y)
+        
+        return get_sprite(("penguin",) + key, (width + 2 * offset_x, height + 2 * offset_y), 
+                          draw, PENGUIN_FRAME_COLORKEY)
+    
+    @classmethod
+    def prebake_frames(cls, width=40, height=60):
+        # Standing frame plus every walking frame, for both directions
+        for facing_right in (True, False):
+            cls.get_frame((width, height, facing_right, False, 0))
+            for animation_count in range(30):
+                cls.get_frame((width, height, facing_right, True, animation_count))
+    
+    def draw(self, screen, alpha=1.0, camera_x=0):
+        x, y = self.render_position(alpha)
+        offset_x, offset_y = PENGUIN_FRAME_OFFSET
+        screen.blit(self.get_frame(self.frame_key()), (int(x - camera_x) - offset_x, int(y) - offset_y))
+    
+    def draw_primitives(self, screen, x, y):
+        # Reference drawing used to bake the frame cache
+        
         # Body (dark blue oval)
         pygame.draw.ellipse(screen, DARK_BLUE, 
-                           (self.x, self.y + 10, self.width, self.height - 10))
+                           (x, y + 10, self.width, self.height - 10))
         
         # Belly (white oval)
         belly_width = self.width * 0.7
         belly_height = (self.height - 10) * 0.7
-        belly_x = self.x + (self.width - belly_width) / 2
-        belly_y = self.y + 20
+        belly_x = x + (self.width - belly_width) / 2
+        belly_y = y + 20
         pygame.draw.ellipse(screen, WHITE, 
                            (belly_x, belly_y, belly_width, belly_height))
         
         # Head (dark blue circle)
         head_radius = self.width // 2
-        head_x = self.x + self.width // 2
-        head_y = self.y + 5
+        head_x = x + self.width // 2
+        head_y = y + 5
         pygame.draw.circle(screen, DARK_BLUE, (head_x, head_y), head_radius)
         
         # Eyes (white circles)
@@ -178,7 +309,7 @@ class Penguin:
         
         # Feet
         feet_color = (255, 165, 0)  # Orange
-        feet_y = self.y + self.height - 5
+        feet_y = y + self.height - 5
         
         # Walking animation (move feet back and forth)
         if self.vel_x != 0:
@@ -187,11 +318,11 @@ class Penguin:
             feet_offset = 0
             
         if self.facing_right:
-            left_foot_x = self.x + self.width // 3 - feet_offset
-            right_foot_x = self.x + 2 * self.width // 3 + feet_offset
+            left_foot_x = x + self.width // 3 - feet_offset
+            right_foot_x = x + 2 * self.width // 3 + feet_offset
         else:
-            left_foot_x = self.x + self.width // 3 + feet_offset
-            right_foot_x = self.x + 2 * self.width // 3 - feet_offset
+            left_foot_x = x + self.width // 3 + feet_offset
+            right_foot_x = x + 2 * self.width // 3 - feet_offset
             
         pygame.draw.polygon(screen, feet_color, [
             (left_foot_x, feet_y),
@@ -207,7 +338,7 @@ class Penguin:
         
         # Flippers
         flipper_color = DARK_BLUE
-        flipper_y = self.y + 30
+        flipper_y = y + 30
         flipper_height = 10
         flipper_width = 15
         
@@ -218,53 +349,318 @@ class Penguin:
             flipper_angle = 0
             
         if self.facing_right:
-            flipper_x = self.x + self.width
+            flipper_x = x + self.width
             pygame.draw.ellipse(screen, flipper_color, 
                               pygame.Rect(flipper_x - 5, flipper_y, flipper_width, flipper_height))
         else:
-            flipper_x = self.x
+            flipper_x = x
             pygame.draw.ellipse(screen, flipper_color, 
                               pygame.Rect(flipper_x - flipper_width + 5, flipper_y, flipper_width, flipper_height))
 
 class Platform:
-    def __init__(self, x, y, width, height):
+    # Drawn from a fixed set of shared pieces: PLATFORM_TILE wide body tiles on
+    # a grid anchored at x = 0, plus a left and a right edge, so the sprite
+    # cache holds the same few surfaces however many platform widths a level
+    # uses. Which tile (and so which crystal layout) a column of the grid gets
+    # depends only on its level position and the seed, so the decoration never
+    # changes between frames. A piece of a longer platform (see LevelStreamer)
+    # skips the edge on each side that continues into the next piece.
+    __slots__ = ("x", "y", "width", "height", "style", "seed", "color", "border_color",
+                 "continues_left", "continues_right")
+    
+    def __init__(self, x, y, width, height, style=DEFAULT_PLATFORM_STYLE, seed=0,
+                 continues_left=False, continues_right=False):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.color = ICE_BLUE
-        self.border_color = LIGHT_BLUE
+        self.style = style
+        self.seed = seed
+        self.continues_left = continues_left
+        self.continues_right = continues_right
+        self.color = PLATFORM_STYLES[style]["color"]
+        self.border_color = PLATFORM_STYLES[style]["border"]
         
-    def draw(self, screen):
-        # Main platform
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+    def tile_variant(self, column):
+        return hash((column, self.y, self.seed)) % PLATFORM_VARIANTS
         
-        # Top edge highlight
-        pygame.draw.line(screen, WHITE, (self.x, self.y), (self.x + self.width, self.y), 2)
+    def get_tile(self, variant):
+        key = ("platform_tile", PLATFORM_TILE, self.height, self.style, variant)
+        return get_sprite(key, (PLATFORM_TILE, self.height), lambda image: self.draw_tile(image, variant))
         
-        # Left edge highlight
-        pygame.draw.line(screen, WHITE, (self.x, self.y), (self.x, self.y + self.height), 2)
+    def get_edge(self, side):
+        key = ("platform_edge", side, self.height, self.style)
+        color = WHITE if side == "left" else self.border_color
+        return get_sprite(key, (PLATFORM_EDGE, self.height), lambda image: image.fill(color))
         
-        # Bottom edge shadow
-        pygame.draw.line(screen, self.border_color, 
-                        (self.x, self.y + self.height - 1), 
-                        (self.x + self.width, self.y + self.height - 1), 2)
+    def draw(self, screen, camera_x=0):
+        # Only the columns on screen are blitted; partial columns at either end are clipped
+        camera_x = int(camera_x)
+        left = max(self.x, camera_x)
+        right = min(self.x + self.width, camera_x + screen.get_width())
+        if left >= right:
+            return
+        tiles = {}
+        blits = []
+        for column in range(left // PLATFORM_TILE, (right - 1) // PLATFORM_TILE + 1):
+            variant = self.tile_variant(column)
+            tile = tiles.get(variant)
+            if tile is None:
+                tile = tiles[variant] = self.get_tile(variant)
+            tile_left = column * PLATFORM_TILE
+            start = max(left, tile_left)
+            end = min(right, tile_left + PLATFORM_TILE)
+            blits.append((tile, (start - camera_x, self.y), (start - tile_left, 0, end - start, self.height)))
+        if not self.continues_left:
+            blits.append((self.get_edge("left"), (self.x - camera_x, self.y)))
+        if not self.continues_right:
+            blits.append((self.get_edge("right"), (self.x + self.width - PLATFORM_EDGE - camera_x, self.y)))
+        screen.blits(blits, False)
         
-        # Right edge shadow
-        pygame.draw.line(screen, self.border_color, 
-                        (self.x + self.width - 1, self.y), 
-                        (self.x + self.width - 1, self.y + self.height), 2)
+    def draw_tile(self, image, variant):
+        # One PLATFORM_TILE wide piece of platform body: top highlight, bottom
+        # shadow and the variant's ice crystals
+        width = PLATFORM_TILE
+        image.fill(self.color)
+        pygame.draw.rect(image, WHITE, (0, 0, width, PLATFORM_EDGE))
+        pygame.draw.rect(image, self.border_color, (0, self.height - PLATFORM_EDGE, width, PLATFORM_EDGE))
         
         # Ice crystals (small details)
-        for i in range(int(self.width / 20)):
-            crystal_x = self.x + 10 + i * 20
-            crystal_y = self.y + 3
+        rng = random.Random(variant)
+        for i in range(width // PLATFORM_CRYSTAL_SPACING):
+            if rng.random() < 0.3:  # Only draw some crystals
+                size = rng.randint(2, 4)
+                pygame.draw.rect(image, WHITE, (PLATFORM_CRYSTAL_SPACING // 2 + i * PLATFORM_CRYSTAL_SPACING, 3, size, size))
+
+class Collectible:
+    __slots__ = ("x", "y", "width", "height", "collected", "handle")
+    
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.width = 15
+        self.height = 15
+        self.collected = False
+        self.handle = None  # Set while the collectible is in an EntityStore
+        
+    def get_image(self):
+        width, height = self.width, self.height
+        
+        def draw(image):
+            pygame.draw.circle(image, (255, 215, 0), (width//2, height//2), width//2)
+            pygame.draw.circle(image, (255, 255, 0), (width//2, height//2), width//3)
+        
+        return get_sprite(("collectible", width, height), (width, height), draw, SPRITE_COLORKEY)
+        
+    def draw(self, screen, camera_x=0):
+        if not self.collected:
+            screen.blit(self.get_image(), (self.x - camera_x, self.y))
             
-            if random.random() < 0.3:  # Only draw some crystals
-                size = random.randint(2, 4)
-                pygame.draw.rect(screen, WHITE, (crystal_x, crystal_y, size, size))
+    def check_collision(self, penguin):
+        if not self.collected:
+            if (penguin.x < self.x + self.width and
+                penguin.x + penguin.width > self.x and
+                penguin.y < self.y + self.height and
+                penguin.y + penguin.height > self.y):
+                self.collected = True
+                return True
+        return False
+
+class EntityStore:
+    # Packed list of live entities. add() returns a handle that stays valid until
+    # that entity is removed; remove() moves the last entity into the hole, so
+    # iterating costs only as much as there are live entities.
+    def __init__(self):
+        self.items = []
+        self.handles = []  # Handle of the entity in each slot
+        self.slots = {}  # Handle -> slot
+        self.next_handle = 0
+        
+    def __len__(self):
+        return len(self.items)
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __contains__(self, handle):
+        return handle in self.slots
+    
+    def add(self, item):
+        handle = self.next_handle
+        self.next_handle += 1
+        self.slots[handle] = len(self.items)
+        self.items.append(item)
+        self.handles.append(handle)
+        return handle
+    
+    def get(self, handle):
+        slot = self.slots.get(handle)
+        return None if slot is None else self.items[slot]
+    
+    def remove(self, handle):
+        # Returns the removed entity, or None for a stale handle
+        slot = self.slots.pop(handle, None)
+        if slot is None:
+            return None
+        item = self.items[slot]
+        last_item = self.items.pop()
+        last_handle = self.handles.pop()
+        if slot < len(self.items):
+            self.items[slot] = last_item
+            self.handles[slot] = last_handle
+            self.slots[last_handle] = slot
+        return item
+    
+    def clear(self):
+        self.items.clear()
+        self.handles.clear()
+        self.slots.clear()
+
+class SpatialHash:
+    # Uniform grid broadphase for static objects with x, y, width and height.
+    # Queries return candidates in insertion order so collision resolution
+    # sees objects in the same order as a plain list scan would.
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+        self.next_order = 0
+        
+    def __len__(self):
+        return len(self.entries)
+    
+    def __iter__(self):
+        return iter(self.items())
+    
+    def cell_range(self, x, y, width, height):
+        size = self.cell_size
+        return (int(x // size), int(y // size), 
+                int((x + width) // size), int((y + height) // size))
+        
+    def insert(self, item):
+        if id(item) in self.entries:
+            self.remove(item)
+        order = self.next_order
+        self.next_order += 1
+        bounds = self.cell_range(item.x, item.y, item.width, item.height)
+        self.entries[id(item)] = (order, item, bounds)
+        
+        min_cx, min_cy, max_cx, max_cy = bounds
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                self.cells.setdefault((cx, cy), []).append((order, item))
+                
+    def remove(self, item):
+        entry = self.entries.pop(id(item), None)
+        if entry is None:
+            return False
+        order, _, (min_cx, min_cy, max_cx, max_cy) = entry
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self.cells[(cx, cy)]
+                bucket.remove((order, item))
+                if not bucket:
+                    del self.cells[(cx, cy)]
+        return True
+    
+    def query(self, x, y, width, height):
+        min_cx, min_cy, max_cx, max_cy = self.cell_range(x, y, width, height)
+        found = {}
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for order, item in bucket:
+                        found[order] = item
+        return [found[order] for order in sorted(found)]
+    
+    def items(self):
+        return [item for _, item, _ in sorted(self.entries.values(), key=lambda entry: entry[0])]
+
+class Camera:
+    # Horizontal scrolling: keeps the target a third of the way into the view
+    def __init__(self, world_width, view_width=SCREEN_WIDTH):
+        self.world_width = world_width
+        self.view_width = view_width
+        self.x = 0
+        
+    def position_for(self, target_x):
+        return max(0, min(target_x - self.view_width // 3, self.world_width - self.view_width))
+    
+    def follow(self, target_x):
+        self.x = self.position_for(target_x)
+        return self.x
+
+class LevelStreamer:
+    # Loads the chunks of a LevelFile around the camera into the collision
+    # indexes and evicts the rest, so memory stays flat however long the level is
+    def __init__(self, level, platform_index, collectible_index, live_collectibles,
+                 chunks_behind=STREAM_CHUNKS_BEHIND, chunks_ahead=STREAM_CHUNKS_AHEAD):
+        self.level = level
+        self.platform_index = platform_index
+        self.collectible_index = collectible_index
+        self.live_collectibles = live_collectibles
+        self.chunks_behind = chunks_behind
+        self.chunks_ahead = chunks_ahead
+        self.loaded = {}  # chunk -> (platforms, collectibles)
+        self.collected = set()  # (chunk, index) of collectibles picked up in evicted chunks
+        
+    def reset(self):
+        for chunk in list(self.loaded):
+            self.evict(chunk)
+        self.collected.clear()
+        
+    def update(self, camera_x, view_width=SCREEN_WIDTH):
+        level = self.level
+        first = max(0, level.chunk_at(camera_x) - self.chunks_behind)
+        last = min(level.chunk_count - 1, level.chunk_at(camera_x + view_width) + self.chunks_ahead)
+        
+        for chunk in list(self.loaded):
+            if chunk < first or chunk > last:
+                self.evict(chunk)
+        for chunk in range(first, last + 1):
+            if chunk not in self.loaded:
+                self.load(chunk)
+                
+    def load(self, chunk):
+        platform_data, collectible_data = self.level.read_chunk(chunk)
+        platforms = [Platform(x, y, width, height, continues_left=bool(flags & CONTINUES_LEFT),
+                              continues_right=bool(flags & CONTINUES_RIGHT))
+                     for x, y, width, height, flags in platform_data]
+        for platform in platforms:
+            self.platform_index.insert(platform)
+        
+        collectibles = []
+        for i, (x, y) in enumerate(collectible_data):
+            collectible = Collectible(x, y)
+            if (chunk, i) in self.collected:
+                collectible.collected = True
+            else:
+                add_collectible(collectible, self.collectible_index, self.live_collectibles)
+            collectibles.append(collectible)
+        self.loaded[chunk] = (platforms, collectibles)
+        
+    def evict(self, chunk):
+        platforms, collectibles = self.loaded.pop(chunk)
+        for platform in platforms:
+            self.platform_index.remove(platform)
+        for i, collectible in enumerate(collectibles):
+            if collectible.collected:
+                self.collected.add((chunk, i))
+            else:
+                remove_collectible(collectible, self.collectible_index, self.live_collectibles)
+                
+    def platforms(self):
+        return [platform for chunk in sorted(self.loaded) for platform in self.loaded[chunk][0]]
+    
+    def collectibles(self):
+        # Every collectible in the loaded chunks, collected or not
+        return [collectible for chunk in sorted(self.loaded) for collectible in self.loaded[chunk][1]]
 
 class Snowflake:
+    __slots__ = ("x", "y", "speed", "size", "wobble", "wobble_speed", "wobble_counter")
+    
     def __init__(self):
         self.reset()
         self.y = random.randint(0, SCREEN_HEIGHT)
@@ -292,54 +688,230 @@ class Snowflake:
     def draw(self, screen):
         pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size)
 
-def draw_background(screen):
-    # Create a gradient sky
-    for y in range(SCREEN_HEIGHT):
-        # Calculate color based on y position
-        r = int(135 - (y / SCREEN_HEIGHT * 50))
-        g = int(206 - (y / SCREEN_HEIGHT * 100))
-        b = int(235)
-        
-        color = (max(0, r), max(0, g), b)
-        pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
-    
-    # Draw distant mountains
-    mountain_color = (220, 220, 255)  # Light bluish-white
-    for i in range(4):
-        base_x = SCREEN_WIDTH * i / 3
-        width = random.randint(200, 400)
-        height = random.randint(100, 200)
-        
-        points = [
-            (base_x - width/2, SCREEN_HEIGHT - 100),
-            (base_x, SCREEN_HEIGHT - 100 - height),
-            (base_x + width/2, SCREEN_HEIGHT - 100)
-        ]
-        
-        pygame.draw.polygon(screen, mountain_color, points)
-    
-    # Draw snow on the ground
-    ground_rect = pygame.Rect(0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100)
-    pygame.draw.rect(screen, WHITE, ground_rect)
-    
-    # Draw some snow mounds
-    for i in range(10):
-        x = random.randint(0, SCREEN_WIDTH)
-        width = random.randint(50, 150)
-        height = random.randint(10, 30)
+class SnowField:
+    # Struct-of-arrays particle engine for snow. Behaves like a list of
+    # Snowflake objects, but every attribute lives in a NumPy array so updates
+    # and resets run as batched array operations.
+    MAX_SIZE = 4
+    
+    def __init__(self, count=SNOWFLAKE_COUNT, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
         
-        pygame.draw.ellipse(screen, WHITE, 
-                          (x - width/2, SCREEN_HEIGHT - 100 - height/2, width, height))
+        self.x = np.empty(count)
+        self.y = np.empty(count)
+        self.speed = np.empty(count)
+        self.size = np.empty(count, dtype=np.int32)
+        self.wobble = np.empty(count)
+        self.wobble_speed = np.empty(count)
+        self.wobble_counter = np.empty(count)
+        
+        self.reset(np.ones(count, dtype=bool))
+        self.y[:] = self.rng.integers(0, height, count, endpoint=True)
+        
+        self.sprites = {}
+        self.sprites_display = None  # Display surface the sprites were fetched for
+        self.stencils = {}
+        self.canvas = None
+        self.canvas_size = None
+        
+    def reset(self, mask):
+        # Same distributions as Snowflake.reset
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return
+        rng = self.rng
+        self.x[mask] = rng.integers(0, self.width, n, endpoint=True)
+        self.y[mask] = -10
+        self.speed[mask] = rng.uniform(1, 3, n)
+        self.size[mask] = rng.integers(1, self.MAX_SIZE, n, endpoint=True)
+        self.wobble[mask] = rng.uniform(-0.5, 0.5, n)
+        self.wobble_speed[mask] = rng.uniform(0.01, 0.05, n)
+        self.wobble_counter[mask] = rng.uniform(0, 6.28, n)  # Random start in the sin wave
+        
+    def update(self, time_scale=1.0):
+        if time_scale == 1.0:
+            self.y += self.speed
+            self.wobble_counter += self.wobble_speed
+            self.x += np.sin(self.wobble_counter) * self.wobble
+        else:
+            self.y += self.speed * time_scale
+            self.wobble_counter += self.wobble_speed * time_scale
+            self.x += np.sin(self.wobble_counter) * self.wobble * time_scale
+        
+        # Respawn flakes that left the screen
+        self.reset((self.y > self.height) | (self.x < 0) | (self.x > self.width))
+        
+    def get_sprites(self, screen):
+        # One pre-drawn circle per flake size, matching pygame.draw.circle output.
+        # Kept between frames, but fetched again when the display changes (e.g.
+        # the window opens after an offscreen draw), so the registry can hand
+        # out display-format copies.
+        display = pygame.display.get_surface()
+        if self.sprites and display is self.sprites_display:
+            return self.sprites
+        self.sprites_display = display
+        for size in range(1, self.MAX_SIZE + 1):
+            self.sprites[size] = get_sprite(("snowflake", size), (size * 2, size * 2), 
+                                            lambda sprite, size=size: pygame.draw.circle(sprite, WHITE, (size, size), size), 
+                                            BLACK)
+        return self.sprites
+    
+    def draw(self, screen):
+        size = self.size
+        # Top-left corner of each circle's bounding box
+        left = self.x.astype(np.int32) - size
+        top = self.y.astype(np.int32) - size
+        
+        if self.count >= SNOW_SURFARRAY_THRESHOLD:
+            self.draw_pixels(screen, left, top)
+            return
+        
+        # Skip flakes that are entirely off screen (new flakes start at y = -10)
+        visible = (top + 2 * size > 0) & (left + 2 * size > 0)
+        sprites = self.get_sprites(screen)
+        blit_list = [(sprites[s], (lx, ty)) for s, lx, ty in 
+                     zip(size[visible].tolist(), left[visible].tolist(), top[visible].tolist())]
+        screen.blits(blit_list, False)
+            
+    def draw_pixels(self, screen, left, top):
+        # Large fields: stamp every flake into a padded coverage mask with one
+        # fancy-indexed write per flake size, then fill the covered pixels at once
+        screen_width, screen_height = screen.get_size()
+        pad = 4 * self.MAX_SIZE
+        stride = screen_width + 2 * pad
+        
+        if self.canvas is None or self.canvas_size != (screen_width, screen_height):
+            self.canvas = np.zeros((screen_height + 2 * pad) * stride, dtype=bool)
+            self.canvas_size = (screen_width, screen_height)
+            self.stencils = {}
+            for flake_size, sprite in self.get_sprites(screen).items():
+                dx, dy = np.nonzero(pygame.surfarray.array_colorkey(sprite))
+                self.stencils[flake_size] = dy * stride + dx
+        
+        canvas = self.canvas
+        canvas[:] = False
+        
+        # Flakes stay inside the padding, the clip only guards against stray values
+        left = np.clip(left, -pad, screen_width + pad - 2 * self.MAX_SIZE) + pad
+        top = np.clip(top, -pad, screen_height + pad - 2 * self.MAX_SIZE) + pad
+        base = top.astype(np.int64) * stride + left
+        
+        for flake_size, offsets in self.stencils.items():
+            corners = base[self.size == flake_size]
+            canvas[(corners[:, None] + offsets).ravel()] = True
+        
+        covered = canvas.reshape(-1, stride)[pad:pad + screen_height, pad:pad + screen_width]
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            pixels[covered.T] = screen.map_rgb(WHITE)
+        finally:
+            del pixels
+
+class BackgroundLayer:
+    # Sky gradient, mountains and snow mounds baked once into a single surface.
+    # The layer is only rebuilt when it is invalidated (resize or theme change),
+    # so drawing it every frame costs one blit.
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, seed=BACKGROUND_SEED, theme=None):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.theme = dict(DEFAULT_THEME if theme is None else theme)
+        self.surface = None
+        self.bake_count = 0
+        
+    def invalidate(self):
+        self.surface = None
+        
+    def resize(self, width, height):
+        if (width, height) != (self.width, self.height):
+            self.width = width
+            self.height = height
+            self.invalidate()
+            
+    def set_theme(self, theme, seed=None):
+        self.theme = dict(theme)
+        if seed is not None:
+            self.seed = seed
+        self.invalidate()
+        
+    def bake(self):
+        width, height = self.width, self.height
+        theme = self.theme
+        rng = random.Random(self.seed)
+        surface = pygame.Surface((width, height))
+        
+        # Create a gradient sky
+        top_r, top_g, top_b = theme["sky_top"]
+        bottom_r, bottom_g, bottom_b = theme["sky_bottom"]
+        for y in range(height):
+            # Calculate color based on y position
+            t = y / height
+            r = int(top_r - t * (top_r - bottom_r))
+            g = int(top_g - t * (top_g - bottom_g))
+            b = int(top_b - t * (top_b - bottom_b))
+            
+            color = (max(0, r), max(0, g), max(0, b))
+            pygame.draw.line(surface, color, (0, y), (width, y))
+        
+        # Draw distant mountains
+        ground_y = height - 100
+        for i in range(4):
+            base_x = width * i / 3
+            mountain_width = rng.randint(200, 400)
+            mountain_height = rng.randint(100, 200)
+            
+            points = [
+                (base_x - mountain_width/2, ground_y),
+                (base_x, ground_y - mountain_height),
+                (base_x + mountain_width/2, ground_y)
+            ]
+            
+            pygame.draw.polygon(surface, theme["mountain"], points)
+        
+        # Draw snow on the ground
+        ground_rect = pygame.Rect(0, ground_y, width, 100)
+        pygame.draw.rect(surface, theme["snow"], ground_rect)
+        
+        # Draw some snow mounds
+        for i in range(10):
+            x = rng.randint(0, width)
+            mound_width = rng.randint(50, 150)
+            mound_height = rng.randint(10, 30)
+            
+            pygame.draw.ellipse(surface, theme["snow"], 
+                              (x - mound_width/2, ground_y - mound_height/2, mound_width, mound_height))
+        
+        # Match the display pixel format so the per-frame blit is a straight copy
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        
+        self.surface = surface
+        self.bake_count += 1
+        return surface
+    
+    def draw(self, screen):
+        if self.surface is None:
+            self.bake()
+        screen.blit(self.surface, (0, 0))
+
+# Shared layer used by draw_background
+background_layer = BackgroundLayer()
+
+def draw_background(screen):
+    background_layer.draw(screen)
 
 def draw_menu(screen, font):
-    title_font = pygame.font.Font(None, 64)
-    title_text = title_font.render("Penguin Platformer", True, DARK_BLUE)
+    title_font = get_font(None, 64)
+    title_text = render_text(title_font, "Penguin Platformer", DARK_BLUE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/3))
     
-    instruction_text = font.render("Press SPACE to Start", True, BLACK)
+    instruction_text = render_text(font, "Press SPACE to Start", BLACK)
     instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
     
-    credit_text = font.render("Use Arrow Keys or A/D to Move, SPACE to Jump", True, BLACK)
+    credit_text = render_text(font, "Use Arrow Keys or A/D to Move, SPACE to Jump", BLACK)
     credit_rect = credit_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT*2/3))
     
     screen.blit(title_text, title_rect)
@@ -351,14 +923,14 @@ def draw_menu(screen, font):
     menu_penguin.draw(screen)
 
 def draw_game_over(screen, font, score):
-    title_font = pygame.font.Font(None, 64)
-    title_text = title_font.render("Game Over", True, DARK_BLUE)
+    title_font = get_font(None, 64)
+    title_text = render_text(title_font, "Game Over", DARK_BLUE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/3))
     
-    score_text = font.render(f"Final Score: {score}", True, BLACK)
+    score_text = render_text(font, f"Final Score: {score}", BLACK)
     score_rect = score_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
     
-    instruction_text = font.render("Press SPACE to Play Again", True, BLACK)
+    instruction_text = render_text(font, "Press SPACE to Play Again", BLACK)
     instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT*2/3))
     
     screen.blit(title_text, title_rect)
@@ -367,7 +939,7 @@ def draw_game_over(screen, font, score):
 
 def draw_hud(screen, font, score, health):
     # Draw score
-    score_text = font.render(f"Score: {score}", True, BLACK)
+    score_text = render_text(font, f"Score: {score}", BLACK)
     screen.blit(score_text, (20, 20))
     
     # Draw health bar
@@ -379,29 +951,29 @@ def draw_hud(screen, font, score, health):
     pygame.draw.rect(screen, (255, 0, 0), (SCREEN_WIDTH - bar_width - 20, 20, filled_width, bar_height))
     pygame.draw.rect(screen, BLACK, (SCREEN_WIDTH - bar_width - 20, 20, bar_width, bar_height), 2)
     
-    health_text = font.render(f"Health: {health}", True, BLACK)
+    health_text = render_text(font, f"Health: {health}", BLACK)
     screen.blit(health_text, (SCREEN_WIDTH - bar_width - 20, 45))
 
-def main():
-    # Set up the screen
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Penguin Platformer")
-    
-    # Set up clock
-    clock = pygame.time.Clock()
-    
-    # Set up font
-    font = pygame.font.Font(None, 36)
-    
-    # Initialize game state
-    game_state = MENU
-    score = 0
-    
-    # Initialize penguin
-    penguin = Penguin(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2)
-    
-    # Create platforms
-    platforms = [
+# Uncollected collectibles live in both the spatial index (pickups) and an
+# EntityStore (drawing); collected ones are dropped from both
+
+def add_collectible(collectible, index, live):
+    index.insert(collectible)
+    collectible.handle = live.add(collectible)
+
+def remove_collectible(collectible, index, live):
+    index.remove(collectible)
+    live.remove(collectible.handle)
+    collectible.handle = None
+
+def reset_collectibles(collectibles, index, live):
+    live.clear()
+    for collectible in collectibles:
+        collectible.collected = False
+        add_collectible(collectible, index, live)
+
+def create_platforms():
+    return [
         # Ground
         Platform(0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 20),
         
@@ -413,141 +985,420 @@ def main():
         Platform(50, SCREEN_HEIGHT - 400, 150, 20),
         Platform(400, SCREEN_HEIGHT - 450, 150, 20),
     ]
-    
-    # Create snowflakes
-    snowflakes = [Snowflake() for _ in range(SNOWFLAKE_COUNT)]
-    
-    # Collectible items for score
-    class Collectible:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-            self.width = 15
-            self.height = 15
-            self.collected = False
-            
-        def draw(self, screen):
-            if not self.collected:
-                pygame.draw.circle(screen, (255, 215, 0), (self.x + self.width//2, self.y + self.height//2), self.width//2)
-                pygame.draw.circle(screen, (255, 255, 0), (self.x + self.width//2, self.y + self.height//2), self.width//3)
-                
-        def check_collision(self, penguin):
-            if not self.collected:
-                if (penguin.x < self.x + self.width and
-                    penguin.x + penguin.width > self.x and
-                    penguin.y < self.y + self.height and
-                    penguin.y + penguin.height > self.y):
-                    self.collected = True
-                    return True
-            return False
-    
-    # Create collectibles
+
+def create_collectibles(platforms, rng=random):
     collectibles = []
     for platform in platforms:
         for i in range(2):
-            x = platform.x + random.randint(20, platform.width - 20)
+            x = platform.x + rng.randint(20, platform.width - 20)
             y = platform.y - 30
             collectibles.append(Collectible(x, y))
-    
-    # Game loop
-    running = True
-    while running:
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                
-                if game_state == MENU and (event.key == pygame.K_SPACE or event.key == pygame.K_RETURN):
-                    game_state = PLAYING
-                    score = 0
-                    penguin = Penguin(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2)
-                    # Reset collectibles
-                    for collectible in collectibles:
-                        collectible.collected = False
-                    
-                if game_state == GAME_OVER and (event.key == pygame.K_SPACE or event.key == pygame.K_RETURN):
-                    game_state = PLAYING
-                    score = 0
-                    penguin = Penguin(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2)
-                    # Reset collectibles
-                    for collectible in collectibles:
-                        collectible.collected = False
-                
-                if game_state == PLAYING:
-                    if event.key == pygame.K_SPACE or event.key == pygame.K_UP or event.key == pygame.K_w:
-                        penguin.jump()
+    return collectibles
+
+class GameWorld:
+    # Everything one game needs (penguin, level, score, state), kept apart from
+    # the window and event loop so it can also be stepped headless. With a
+    # LevelFile the level scrolls and streams in chunks; otherwise it is the
+    # single hand-made screen.
+    def __init__(self, seed=None, snowflake_count=SNOWFLAKE_COUNT, profiler=disabled_profiler, level=None):
+        self.rng = random.Random(seed)
+        self.profiler = profiler
+        self.level = level
+        self.state = MENU
+        self.score = 0
         
-        # Update game logic based on state
-        if game_state == PLAYING:
-            # Handle keyboard input
-            keys = pygame.key.get_pressed()
-            penguin.vel_x = 0
+        self.platform_index = SpatialHash()
+        self.collectible_index = SpatialHash()
+        self.live_collectibles = EntityStore()
+        if level is None:
+            self.level_width = SCREEN_WIDTH
+            self.spawn = (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2)
+            self.streamer = None
             
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                penguin.vel_x = -PLAYER_SPEED
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                penguin.vel_x = PLAYER_SPEED
-                
-            # Update penguin
-            penguin.update(platforms)
+            # Index platforms so the penguin only checks nearby ones
+            self.platforms = create_platforms()
+            for platform in self.platforms:
+                self.platform_index.insert(platform)
             
-            # Check collectibles
-            for collectible in collectibles:
+            # Only uncollected items live in the index
+            self.collectibles = create_collectibles(self.platforms, self.rng)
+            reset_collectibles(self.collectibles, self.collectible_index, self.live_collectibles)
+        else:
+            self.level_width = level.width
+            self.spawn = level.spawns[0] if level.spawns else (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2)
+            self.streamer = LevelStreamer(level, self.platform_index, self.collectible_index, self.live_collectibles)
+        
+        self.camera = Camera(self.level_width)
+        self.penguin = Penguin(*self.spawn)
+        self.follow_penguin()
+        self.snowflakes = SnowField(snowflake_count, seed=seed)
+    
+    def follow_penguin(self):
+        self.camera.follow(self.penguin.x)
+        if self.streamer is not None:
+            self.streamer.update(self.camera.x)
+        
+    def start(self):
+        self.state = PLAYING
+        self.score = 0
+        self.penguin = Penguin(*self.spawn)
+        # Reset collectibles
+        if self.streamer is None:
+            reset_collectibles(self.collectibles, self.collectible_index, self.live_collectibles)
+        else:
+            self.streamer.reset()
+        self.follow_penguin()
+        
+    def visible_platforms(self):
+        if self.streamer is None:
+            return self.platforms
+        return self.streamer.platforms()
+    
+    def visible_collectibles(self):
+        # Only uncollected ones (in loaded chunks when streaming)
+        return self.live_collectibles
+        
+    def step(self, direction, jump=False, time_scale=1.0):
+        # direction is -1 (left), 0 or 1 (right); time_scale comes from FixedTimestep
+        if self.state != PLAYING:
+            return
+        penguin = self.penguin
+        profiler = self.profiler
+        
+        if jump:
+            penguin.jump()
+        penguin.vel_x = direction * PLAYER_SPEED
+        
+        # Update penguin
+        with profiler.scope("penguin"):
+            penguin.update(self.platform_index, time_scale, self.level_width)
+        
+        # Scroll and stream level chunks
+        with profiler.scope("stream"):
+            self.follow_penguin()
+        
+        # Check collectibles near the penguin
+        with profiler.scope("collectibles"):
+            for collectible in self.collectible_index.query(penguin.x, penguin.y, penguin.width, penguin.height):
                 if collectible.check_collision(penguin):
-                    score += 10
+                    remove_collectible(collectible, self.collectible_index, self.live_collectibles)
+                    self.score += 10
+        
+        # Update snowflakes
+        with profiler.scope("snow"):
+            self.snowflakes.update(time_scale)
+        
+        # Check if player fell off the screen
+        if penguin.y > SCREEN_HEIGHT:
+            self.state = GAME_OVER
             
-            # Update snowflakes
-            for snowflake in snowflakes:
-                snowflake.update()
+        # Check if health is depleted
+        if penguin.health <= 0:
+            self.state = GAME_OVER
+    
+    def checksum(self):
+        # Everything a step can change, for replay verification
+        penguin = self.penguin
+        snow = self.snowflakes
+        return state_checksum(
+            (penguin.x, penguin.y, penguin.vel_x, penguin.vel_y, penguin.on_ground, penguin.jump_count, 
+             self.score, self.state, self.camera.x),
+            snow.x.tobytes(), snow.y.tobytes())
             
-            # Check if player fell off the screen
-            if penguin.y > SCREEN_HEIGHT:
-                game_state = GAME_OVER
-                
-            # Check if health is depleted
-            if penguin.health <= 0:
-                game_state = GAME_OVER
-        
-        # Draw everything
+    def draw(self, screen, font, alpha=1.0):
+        # alpha interpolates the penguin between the last two physics steps
         draw_background(screen)
         
         # Draw snowflakes
-        for snowflake in snowflakes:
-            snowflake.draw(screen)
+        self.snowflakes.draw(screen)
         
-        if game_state == MENU:
+        if self.state == MENU:
             draw_menu(screen, font)
-        elif game_state == PLAYING:
+        elif self.state == PLAYING:
+            # The camera tracks the interpolated penguin so scrolling stays smooth
+            camera_x = self.camera.position_for(self.penguin.render_position(alpha)[0])
+            view_right = camera_x + SCREEN_WIDTH
+            
             # Draw platforms
-            for platform in platforms:
-                platform.draw(screen)
+            for platform in self.visible_platforms():
+                if platform.x < view_right and platform.x + platform.width > camera_x:
+                    platform.draw(screen, camera_x)
                 
             # Draw collectibles
-            for collectible in collectibles:
-                collectible.draw(screen)
+            for collectible in self.visible_collectibles():
+                if collectible.x < view_right and collectible.x + collectible.width > camera_x:
+                    collectible.draw(screen, camera_x)
                 
             # Draw penguin
-            penguin.draw(screen)
+            self.penguin.draw(screen, alpha, camera_x)
             
             # Draw HUD
-            draw_hud(screen, font, score, penguin.health)
+            draw_hud(screen, font, self.score, self.penguin.health)
+            
+        elif self.state == GAME_OVER:
+            draw_game_over(screen, font, self.score)
+
+def input_codes(direction, jump, start=False):
+    # One physics step's input as replay codes
+    codes = [INPUT_START] if start else []
+    if direction:
+        codes.append(INPUT_RIGHT if direction > 0 else INPUT_LEFT)
+    if jump:
+        codes.append(INPUT_JUMP)
+    return codes
+
+def decode_input(codes):
+    # (direction, jump, start) from replay codes
+    direction = 1 if INPUT_RIGHT in codes else -1 if INPUT_LEFT in codes else 0
+    return direction, INPUT_JUMP in codes, INPUT_START in codes
+
+def session_recorder(seed, snowflake_count, physics_hz, level):
+    return ReplayRecorder("penguin", seed, physics_hz, snowflakes=snowflake_count, 
+                          level=level.path if level else None)
+
+def main(physics_hz=PHYSICS_HZ, profile=False, profile_output=None, level=None, record=None, input_latency=False):
+    # Set up the screen
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Penguin Platformer")
+    
+    # Set up clock
+    clock = pygame.time.Clock()
+    
+    # Set up font
+    font = get_font(None, 36)
+    
+    # Per-phase timings; F3 shows the overlay
+    profiler = FrameProfiler(enabled=profile or profile_output is not None)
+    
+    # Initialize game state; the seed is picked here so the session can be recorded
+    seed = random.randrange(2 ** 31)
+    world = GameWorld(seed=seed, profiler=profiler, level=level)
+    recorder = session_recorder(seed, SNOWFLAKE_COUNT, physics_hz, level) if record else None
+    
+    # Physics runs in fixed steps, independent of the frame rate
+    timestep = FixedTimestep(physics_hz)
+    jump = False
+    started = False
+    
+    # Keyboard input, read once at the start of each frame
+    controls = InputMap(PENGUIN_PRESS, hold=PENGUIN_HOLD)
+    controls.activate()
+    
+    # Game loop
+    running = True
+    while running:
+        profiler.begin_frame()
+        
+        # Handle input
+        with profiler.scope("events"):
+            frame_input = controls.poll()
+            if frame_input.quit:
+                running = False
+            for event in frame_input.events:
+                profiler.handle_event(event)
             
-        elif game_state == GAME_OVER:
-            draw_game_over(screen, font, score)
+            for action in frame_input.actions:
+                if action == INPUT_QUIT:
+                    running = False
+                
+                if action == INPUT_START and world.state in (MENU, GAME_OVER):
+                    world.start()
+                    timestep.reset()
+                    jump = False
+                    started = True
+                
+                if action == INPUT_JUMP and world.state == PLAYING:
+                    jump = True
+            
+            # Keys only count once the game has started
+            if started:
+                controls.applied()
+            elif world.state != PLAYING:
+                controls.discard()
+        
+        # Update game logic based on state
+        if world.state == PLAYING:
+            # Right wins when both directions are held
+            direction = 1 if INPUT_RIGHT in frame_input.held else -1 if INPUT_LEFT in frame_input.held else 0
+                
+            # A jump waits for the next physics step if none is due this frame
+            for _ in range(timestep.advance()):
+                world.step(direction, jump, timestep.time_scale)
+                controls.applied()
+                if recorder is not None:
+                    recorder.record(input_codes(direction, jump, started), world.checksum())
+                jump = False
+                started = False
+        
+        # Draw everything
+        with profiler.scope("draw"):
+            world.draw(screen, font, timestep.alpha if world.state == PLAYING else 1.0)
+            profiler.draw_overlay(screen, font)
         
         # Update display
-        pygame.display.flip()
+        with profiler.scope("flip"):
+            pygame.display.flip()
+        controls.presented()
+        
+        profiler.end_frame()
         
         # Cap the frame rate
         clock.tick(FPS)
     
+    if profile_output:
+        profiler.export(profile_output)
+    if input_latency:
+        print(controls.latency.report())
+    if recorder is not None:
+        recorder.save(record)
+    
     # Quit pygame
     pygame.quit()
     sys.exit()
 
+def scripted_input(frame, world):
+    # Simple bot: run towards the far wall, turn around there and hop regularly
+    penguin = world.penguin
+    if penguin.x <= 0:
+        world.bot_direction = 1
+    elif penguin.x >= world.level_width - penguin.width:
+        world.bot_direction = -1
+    direction = getattr(world, "bot_direction", 1)
+    return direction, frame % 45 == 0
+
+def load_input_script(path):
+    # One line per frame: L and/or R to move (R wins, like the keyboard), J to jump
+    inputs = []
+    with open(path) as f:
+        for line in f:
+            keys = line.strip().upper()
+            direction = 1 if "R" in keys else -1 if "L" in keys else 0
+            inputs.append((direction, "J" in keys))
+    return inputs
+
+def replay_world(replay):
+    # Rebuilds a recorded session's world; step(codes) re-runs one physics step
+    meta = replay.meta
+    level = LevelFile(meta["level"]) if meta.get("level") else None
+    world = GameWorld(seed=replay.seed, snowflake_count=meta["snowflakes"], level=level)
+    time_scale = FixedTimestep(replay.physics_hz).time_scale
+    
+    def step(codes):
+        direction, jump, start = decode_input(codes)
+        if start:
+            world.start()
+        world.step(direction, jump, time_scale)
+        return world.checksum()
+    return world, step
+
+def use_dummy_video_driver():
+    # Re-open the display subsystem on SDL's dummy driver so no window is needed
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.display.quit()
+    pygame.display.init()
+
+def run_headless(frames=HEADLESS_FRAMES, render=False, seed=0, inputs=None, snowflake_count=SNOWFLAKE_COUNT, 
+                 physics_hz=PHYSICS_HZ, level=None, record=None):
+    # Step the game as fast as possible without a window or frame cap.
+    # inputs is a list of (direction, jump) per frame (looped), or None for the
+    # scripted bot. Physics and drawing are timed separately. record saves the
+    # run as a replay file.
+    use_dummy_video_driver()
+    screen = None
+    font = None
+    if render:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        font = get_font(None, 36)
+    
+    world = GameWorld(seed=seed, snowflake_count=snowflake_count, level=level)
+    world.start()
+    recorder = session_recorder(seed, snowflake_count, physics_hz, level) if record else None
+    started = True
+    time_scale = FixedTimestep(physics_hz).time_scale
+    restarts = 0
+    physics_time = 0.0
+    render_time = 0.0
+    
+    for frame in range(frames):
+        if inputs is None:
+            direction, jump = scripted_input(frame, world)
+        else:
+            direction, jump = inputs[frame % len(inputs)]
+        
+        start = time.perf_counter()
+        world.step(direction, jump, time_scale)
+        if recorder is not None:
+            recorder.record(input_codes(direction, jump, started), world.checksum())
+        started = False
+        if world.state == GAME_OVER:
+            world.start()
+            started = True
+            restarts += 1
+        physics_time += time.perf_counter() - start
+        
+        if render:
+            start = time.perf_counter()
+            world.draw(screen, font)
+            pygame.display.flip()
+            render_time += time.perf_counter() - start
+    
+    if recorder is not None:
+        recorder.save(record)
+    
+    total_time = physics_time + render_time
+    return {
+        "frames": frames,
+        "restarts": restarts,
+        "score": world.score,
+        "physics_seconds": physics_time,
+        "render_seconds": render_time,
+        "physics_fps": frames / physics_time if physics_time else float("inf"),
+        "fps": frames / total_time if total_time else float("inf"),
+        "text_cache": text_cache.stats(),
+        "assets": assets.stats(),
+        "distance": world.penguin.x,
+        "chunks_loaded": len(world.streamer.loaded) if world.streamer else 0,
+        "chunks_read": level.chunks_read if level else 0,
+    }
+
+def print_headless_report(report):
+    print(f"Simulated {report['frames']} frames ({report['restarts']} restarts, final score {report['score']})")
+    print(f"Physics: {report['physics_seconds'] * 1000:.1f} ms total, {report['physics_fps']:.0f} frames/s")
+    if report["render_seconds"]:
+        print(f"Render:  {report['render_seconds'] * 1000:.1f} ms total")
+        text_stats = report["text_cache"]
+        print(f"Text cache: {text_stats['hits']} hits, {text_stats['misses']} misses, {text_stats['hit_rate']:.1%} hit rate")
+        asset_stats = report["assets"]
+        print(f"Assets: {asset_stats['assets']} ({asset_stats['atlas_sprites']} in {asset_stats['atlas_pages']} atlas pages, "
+              f"{asset_stats['atlas_fill']:.0%} full), {asset_stats['total_bytes'] / 1024:.0f} KiB")
+    if report["chunks_read"]:
+        print(f"Level: reached x={report['distance']:.0f}, {report['chunks_loaded']} chunks loaded, "
+              f"{report['chunks_read']} chunk reads")
+    print(f"Overall: {report['fps']:.0f} simulated frames/s")
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Penguin Platformer")
+    parser.add_argument("--headless", action="store_true", help="run without a window or frame cap and report simulated FPS")
+    parser.add_argument("--frames", type=int, default=HEADLESS_FRAMES, help="frames to simulate in headless mode")
+    parser.add_argument("--render", action="store_true", help="also draw each frame in headless mode")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for headless mode")
+    parser.add_argument("--snowflakes", type=int, default=SNOWFLAKE_COUNT, help="number of snowflakes in headless mode")
+    parser.add_argument("--physics-hz", type=int, default=PHYSICS_HZ, help="physics steps per second")
+    parser.add_argument("--profile", action="store_true", help="record per-phase frame timings (F3 shows them)")
+    parser.add_argument("--profile-out", help="export timings on exit (.csv, *trace*.json or .json)")
+    parser.add_argument("--level", help="level file to play (see penguin_levels.py)")
+    parser.add_argument("--input", help="input script for headless mode (one line per frame, L/R/J)")
+    parser.add_argument("--record", help="save the session as a replay file (play it back with replay.py)")
+    parser.add_argument("--input-latency", action="store_true", help="report input-to-display latency on exit")
+    args = parser.parse_args()
+    if args.physics_hz <= 0:
+        parser.error("--physics-hz must be a positive number of steps per second")
+    
+    level = LevelFile(args.level) if args.level else None
+    if args.headless:
+        inputs = load_input_script(args.input) if args.input else None
+        print_headless_report(run_headless(args.frames, args.render, args.seed, inputs, args.snowflakes, 
+                                            args.physics_hz, level, args.record))
+        pygame.quit()
+    else:
+        main(args.physics_hz, args.profile, args.profile_out, level, args.record, args.input_latency)
@@ -0,0 +1,141 @@
+# Project: Asset Registry
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+# Shared registry of display-format surfaces for both pygame games. Every asset
+# is drawn and converted once (colorkeyed sprites are also RLE encoded), so no
+# blit pays for a pixel-format conversion. Assets requested before the window
+# exists are kept in their original format and rebuilt on the first request
+# after it opens.
+#
+# Small sprites can instead be packed into atlas pages and handed out as
+# subsurfaces, which share a few large allocations. That is off by default:
+# pygame's software blitter is slower from a subsurface (20-30% for 15-30 px
+# sprites, several times slower from wide pages), and there is no texture
+# binding for an atlas to save.
+
+import pygame
+
+ATLAS_PAGE_SIZE = 512  # Atlas pages are square
+ATLAS_MAX_SPRITE = 128  # Sprites larger than this in either direction get their own surface
+ATLAS_SPRITES = False  # Pack small sprites into atlas pages
+
+class AtlasPage:
+    # Shelf packer: sprites fill rows left to right, a new row starts under the tallest so far
+    def __init__(self, size, colorkey=None):
+        self.size = size
+        self.colorkey = colorkey
+        self.surface = pygame.Surface((size, size)).convert()
+        if colorkey is not None:
+            self.surface.fill(colorkey)
+            self.surface.set_colorkey(colorkey)
+        self.shelves = []  # [y, height, next_x]
+        self.next_y = 0
+        self.used_area = 0
+
+    def place(self, width, height):
+        # Rect for a width x height sprite, or None if the page is full
+        for shelf in self.shelves:
+            y, shelf_height, x = shelf
+            if height <= shelf_height and x + width <= self.size:
+                shelf[2] += width
+                return self.claim(x, y, width, height)
+        if self.next_y + height > self.size or width > self.size:
+            return None
+        self.shelves.append([self.next_y, height, width])
+        self.next_y += height
+        return self.claim(0, self.shelves[-1][0], width, height)
+
+    def claim(self, x, y, width, height):
+        self.used_area += width * height
+        return pygame.Rect(x, y, width, height)
+
+class AssetRegistry:
+    def __init__(self, use_atlas=ATLAS_SPRITES, page_size=ATLAS_PAGE_SIZE, max_sprite=ATLAS_MAX_SPRITE):
+        self.use_atlas = use_atlas
+        self.page_size = page_size
+        self.max_sprite = max_sprite
+        self.assets = {}  # key -> (surface, display format?)
+        self.pages = []
+        self.standalone_bytes = 0
+
+    def sprite(self, key, size, draw, colorkey=None):
+        # draw(surface) paints the sprite onto a blank surface of the given size
+        # (filled with colorkey when there is one, black otherwise)
+        entry = self.assets.get(key)
+        display_ready = pygame.display.get_surface() is not None
+        if entry is not None and (entry[1] or not display_ready):
+            return entry[0]
+
+        width, height = size
+        if self.use_atlas and display_ready and width <= self.max_sprite and height <= self.max_sprite:
+            surface = self.pack(width, height, colorkey)
+        else:
+            surface = pygame.Surface(size)
+            if colorkey is not None:
+                surface.fill(colorkey)
+                surface.set_colorkey(colorkey)
+        draw(surface)
+
+        if display_ready and surface.get_parent() is None:
+            surface = surface.convert()
+            if colorkey is not None:
+                surface.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.standalone_bytes += width * height * surface.get_bytesize()
+        self.assets[key] = (surface, display_ready)
+        return surface
+
+    def surface(self, key, build):
+        # build() returns a finished surface; it is converted (alpha kept) and kept whole
+        entry = self.assets.get(key)
+        display_ready = pygame.display.get_surface() is not None
+        if entry is not None and (entry[1] or not display_ready):
+            return entry[0]
+
+        surface = build()
+        if display_ready:
+            surface = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+            self.standalone_bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.assets[key] = (surface, display_ready)
+        return surface
+
+    def pack(self, width, height, colorkey):
+        # Subsurface of an atlas page with the same colorkey
+        for page in self.pages:
+            if page.colorkey == colorkey:
+                rect = page.place(width, height)
+                if rect is not None:
+                    return page.surface.subsurface(rect)
+        page = AtlasPage(self.page_size, colorkey)
+        self.pages.append(page)
+        return page.surface.subsurface(page.place(width, height))
+
+    def clear(self):
+        # Drops everything, e.g. after the display mode changes
+        self.assets.clear()
+        self.pages = []
+        self.standalone_bytes = 0
+
+    def stats(self):
+        page_bytes = sum(page.size * page.size * page.surface.get_bytesize() for page in self.pages)
+        page_area = sum(page.size * page.size for page in self.pages)
+        used_area = sum(page.used_area for page in self.pages)
+        return {
+            "assets": len(self.assets),
+            "atlas_sprites": sum(1 for surface, _ in self.assets.values() if surface.get_parent() is not None),
+            "atlas_pages": len(self.pages),
+            "atlas_fill": used_area / page_area if page_area else 0.0,
+            "atlas_bytes": page_bytes,
+            "standalone_bytes": self.standalone_bytes,
+            "total_bytes": page_bytes + self.standalone_bytes,
+        }
+
+# Shared registry used by both games
+assets = AssetRegistry()
+
+def get_sprite(key, size, draw, colorkey=None):
+    return assets.sprite(key, size, draw, colorkey)
+
+def get_surface(key, build):
+    return assets.surface(key, build)
@@ -0,0 +1,377 @@
+# Project: Game Benchmarks
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Repeatable headless benchmarks for Penguin Platformer and Mages of Might and Power.
+# Every scenario runs from a fixed seed and reports frame-time percentiles; results
+# can be saved as JSON and compared against a stored baseline to flag regressions.
+# Recorded sessions (see replay.py) can be added as scenarios with --replay.
+#
+# Usage: python benchmarks.py [--frames N] [--only NAME] [--output results.json]
+#                             [--baseline baseline.json] [--threshold 0.10]
+#                             [--replay SESSION.rply]
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+# Everything runs without a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from assets import assets
+
+BENCHMARK_SEED = 1234
+BENCHMARK_FRAMES = 300
+WARMUP_FRAMES = 30
+REGRESSION_THRESHOLD = 0.10  # Flag a scenario whose p50 or p95 grows by more than this
+SNOW_COUNTS = (100, 1000, 10000)
+COLLECTIBLE_COUNT = 1000
+MAGES_LOADS = ((10, 10), (100, 50), (500, 200), (3000, 200))  # (enemies, projectiles)
+INPUT_PRESS_INTERVAL = 5  # Frames between synthetic key presses in the input latency runs
+
+def percentile(samples, pct):
+    return float(np.percentile(samples, pct))
+
+def summarize(samples):
+    samples_ms = np.asarray(samples) * 1000
+    return {
+        "frames": len(samples_ms),
+        "mean_ms": float(samples_ms.mean()),
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+        "max_ms": float(samples_ms.max()),
+    }
+
+def time_frames(frame, frames, warmup=WARMUP_FRAMES):
+    for i in range(warmup):
+        frame(i)
+    samples = []
+    for i in range(frames):
+        start = time.perf_counter()
+        frame(warmup + i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+# Penguin Platformer scenarios. Each builder returns a function that runs one frame.
+
+def penguin_scenarios():
+    import PenguinPlatformer as penguin_game
+
+    screen = pygame.display.set_mode((penguin_game.SCREEN_WIDTH, penguin_game.SCREEN_HEIGHT))
+
+    def draw_background():
+        penguin_game.background_layer.invalidate()
+        return lambda frame: penguin_game.draw_background(screen)
+
+    def bake_background():
+        layer = penguin_game.BackgroundLayer()
+        return lambda frame: layer.bake()
+
+    def penguin_update():
+        world = penguin_game.GameWorld(seed=BENCHMARK_SEED)
+        world.start()
+
+        def frame(i):
+            direction, jump = penguin_game.scripted_input(i, world)
+            if jump:
+                world.penguin.jump()
+            world.penguin.vel_x = direction * penguin_game.PLAYER_SPEED
+            world.penguin.update(world.platform_index)
+            if world.penguin.y > penguin_game.SCREEN_HEIGHT:
+                world.start()
+        return frame
+
+    def penguin_draw():
+        penguin = penguin_game.Penguin(200, 300)
+
+        def frame(i):
+            # Cycle through the walking frames
+            penguin.vel_x = penguin_game.PLAYER_SPEED
+            penguin.facing_right = (i // 30) % 2 == 0
+            penguin.animation_count = i % 30
+            penguin.draw(screen)
+        return frame
+
+    def platform_draw():
+        platforms = penguin_game.create_platforms()
+
+        def frame(i):
+            for platform in platforms:
+                platform.draw(screen)
+        return frame
+
+    def collectible_draw():
+        rng = random.Random(BENCHMARK_SEED)
+        collectibles = [penguin_game.Collectible(rng.randint(0, penguin_game.SCREEN_WIDTH - 15), 
+                                                 rng.randint(0, penguin_game.SCREEN_HEIGHT - 15))
+                        for _ in range(COLLECTIBLE_COUNT)]
+
+        def frame(i):
+            for collectible in collectibles:
+                collectible.draw(screen)
+        return frame
+
+    def snow_field(count):
+        def build():
+            snowflakes = penguin_game.SnowField(count, seed=BENCHMARK_SEED)
+
+            def frame(i):
+                snowflakes.update()
+                snowflakes.draw(screen)
+            return frame
+        return build
+
+    def snowflake_list(count):
+        def build():
+            snowflakes = [penguin_game.Snowflake() for _ in range(count)]
+
+            def frame(i):
+                for snowflake in snowflakes:
+                    snowflake.update()
+                for snowflake in snowflakes:
+                    snowflake.draw(screen)
+            return frame
+        return build
+
+    def full_frame():
+        world = penguin_game.GameWorld(seed=BENCHMARK_SEED)
+        world.start()
+        font = penguin_game.get_font(None, 36)
+
+        def frame(i):
+            world.step(*penguin_game.scripted_input(i, world))
+            if world.state == penguin_game.GAME_OVER:
+                world.start()
+            world.draw(screen, font)
+        return frame
+
+    scenarios = [
+        ("penguin.draw_background", draw_background),
+        ("penguin.bake_background", bake_background),
+        ("penguin.penguin_update", penguin_update),
+        ("penguin.penguin_draw", penguin_draw),
+        ("penguin.platform_draw", platform_draw),
+        ("penguin.collectible_draw", collectible_draw),
+    ]
+    for count in SNOW_COUNTS:
+        scenarios.append((f"penguin.snow_field_{count}", snow_field(count)))
+        scenarios.append((f"penguin.snowflake_list_{count}", snowflake_list(count)))
+    scenarios.append(("penguin.full_frame", full_frame))
+    return scenarios
+
+# Mages of Might and Power scenarios: the body of game_loop with a fixed load of
+# enemies and projectiles kept on screen
+
+def mages_scenarios():
+    try:
+        import MagesofMightandPower as mages_game
+    except ImportError as error:
+        return [(f"mages.game_loop_{enemies}e_{projectiles}p", error) for enemies, projectiles in MAGES_LOADS]
+
+    screen = mages_game.init_display()
+    font = mages_game.get_font("Arial", 20)
+
+    def game_loop(enemy_count, projectile_count):
+        def build():
+            player = mages_game.Player("fire")
+            world = mages_game.GameWorld(player, seed=BENCHMARK_SEED)
+            world.spawn_enemy(enemy_count)
+
+            def frame(i):
+                world.last_enemy_spawn = world.time
+                while len(world.projectiles) < projectile_count:
+                    player.facing_right = len(world.projectiles) % 2 == 0
+                    world.shoot()
+                if len(world.enemies) < enemy_count:
+                    world.spawn_enemy(enemy_count - len(world.enemies))
+                # Keep the match running so every frame does the full amount of work
+                world.game_over = world.victory = False
+                player.kills = 0
+                world.step()
+                world.draw(screen, font)
+                pygame.display.flip()
+            return frame
+        return build
+
+    return [(f"mages.game_loop_{enemies}e_{projectiles}p", game_loop(enemies, projectiles))
+            for enemies, projectiles in MAGES_LOADS]
+
+# Input-to-display latency under the same Mages loads: a synthetic key press
+# goes through the real input path (queue, poll, physics step, draw, flip)
+# every few frames
+
+def input_latency_runs(frames=BENCHMARK_FRAMES, only=None):
+    try:
+        import MagesofMightandPower as mages_game
+        from input_map import InputMap
+    except ImportError as error:
+        return {"mages.input_latency": {"skipped": str(error)}}
+
+    screen = mages_game.init_display()
+    font = mages_game.get_font("Arial", 20)
+    results = {}
+    for enemy_count, projectile_count in MAGES_LOADS:
+        name = f"mages.input_latency_{enemy_count}e_{projectile_count}p"
+        if only and not any(pattern in name for pattern in only):
+            continue
+        player = mages_game.Player("fire")
+        world = mages_game.GameWorld(player, seed=BENCHMARK_SEED)
+        world.spawn_enemy(enemy_count)
+        controls = InputMap(mages_game.MAGE_PRESS, mages_game.MAGE_RELEASE)
+        controls.activate()
+        pygame.event.clear()
+
+        for i in range(WARMUP_FRAMES + frames):
+            if i == WARMUP_FRAMES:
+                controls.latency.samples.clear()
+            if i % INPUT_PRESS_INTERVAL == 0:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_z))
+            world.handle_actions(controls.poll().actions)
+            while len(world.projectiles) > projectile_count:
+                world.projectiles.sprites()[0].kill()
+            if len(world.enemies) < enemy_count:
+                world.spawn_enemy(enemy_count - len(world.enemies))
+            # Keep the match running, as in the game loop scenarios
+            world.last_enemy_spawn = world.time
+            world.game_over = world.victory = False
+            player.kills = 0
+            world.step()
+            controls.applied()
+            world.draw(screen, font)
+            pygame.display.flip()
+            controls.presented()
+        results[name] = controls.latency.stats()
+    return results
+
+# Recorded sessions: one physics step per frame, starting the session over
+# when the recording runs out
+
+def replay_scenarios(paths):
+    from replay import Replay, replay_world
+    
+    def replay_steps(replay):
+        def build():
+            session = {"step": replay_world(replay)[1]}
+            
+            def frame(i):
+                number = i % len(replay.steps)
+                if number == 0 and i:
+                    session["step"] = replay_world(replay)[1]
+                session["step"](replay.steps[number][0])
+            return frame
+        return build
+    
+    scenarios = []
+    for path in paths:
+        replay = Replay.load(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        scenarios.append((f"replay.{replay.game}.{name}", replay_steps(replay)))
+    return scenarios
+
+def run_benchmarks(frames=BENCHMARK_FRAMES, only=None, seed=BENCHMARK_SEED, replays=()):
+    pygame.init()
+    results = {}
+    for name, build in penguin_scenarios() + mages_scenarios() + replay_scenarios(replays):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        if isinstance(build, Exception):
+            results[name] = {"skipped": str(build)}
+            continue
+        seed_everything(seed)
+        frame = build()
+        results[name] = summarize(time_frames(frame, frames))
+    return {
+        "seed": seed,
+        "frames": frames,
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "assets": assets.stats(),
+        "scenarios": results,
+        "input_latency": input_latency_runs(frames, only),
+    }
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    # Returns a list of (scenario, metric, baseline_ms, current_ms, change)
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            change = (current[metric] - previous[metric]) / previous[metric] if previous[metric] else 0.0
+            if change > threshold:
+                regressions.append((name, metric, previous[metric], current[metric], change))
+    return regressions
+
+def print_results(results, baseline=None):
+    print(f"{'scenario':40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'vs base':>9}")
+    for name, stats in results["scenarios"].items():
+        if "skipped" in stats:
+            print(f"{name:40} skipped: {stats['skipped']}")
+            continue
+        delta = ""
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous and "p50_ms" in previous and previous["p50_ms"]:
+            delta = f"{(stats['p50_ms'] - previous['p50_ms']) / previous['p50_ms']:+.1%}"
+        print(f"{name:40} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} "
+              f"{stats['max_ms']:9.3f} {delta:>9}")
+
+    latency = results.get("input_latency")
+    if latency:
+        print(f"\n{'input latency':40} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'frames':>9}")
+        for name, stats in latency.items():
+            if "skipped" in stats:
+                print(f"{name:40} skipped: {stats['skipped']}")
+                continue
+            print(f"{name:40} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['max_ms']:9.3f} "
+                  f"{stats['max_frames']:9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for both pygame games")
+    parser.add_argument("--frames", type=int, default=BENCHMARK_FRAMES, help="measured frames per scenario")
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SEED, help="random seed for every scenario")
+    parser.add_argument("--only", action="append", help="only run scenarios whose name contains this (repeatable)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON results file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="allowed slowdown before flagging")
+    parser.add_argument("--replay", action="append", default=[], help="add a recorded session as a scenario (repeatable)")
+    args = parser.parse_args()
+    # A baseline that was asked for but can't be found must not pass as "no regressions"
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"baseline file not found: {args.baseline}")
+
+    results = run_benchmarks(args.frames, args.only, args.seed, args.replay)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, before, after, change in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.3f} ms -> {after:.3f} ms ({change:+.1%})")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
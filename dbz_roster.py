@@ -0,0 +1,227 @@
+# Project: Dragon Ball Z Binary Rosters
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+# Compact binary roster files for rosters too big to load into dicts. The file
+# is opened with mmap and nothing is read up front: a name lookup is a binary
+# search over the name index, and a power level range is a binary search over
+# the power column, so both are O(log n) page reads.
+#
+# Layout (little endian, every column fixed width):
+#   header      magic "DBZR", version, fighter count, name bytes
+#   powers      int64 per fighter, ascending (equal power levels keep roster order)
+#   name ends   uint64 per fighter, end of its name in the names blob
+#   name index  uint32 per fighter, fighter numbers sorted by lowercased name
+#               (a repeated name keeps roster order, so lookups find the first)
+#   names       UTF-8 names, back to back in the same order as the powers
+#
+# Usage: python dbz_roster.py convert ROSTER OUT.dbzr
+#        python dbz_roster.py lookup OUT.dbzr NAME [NAME ...]
+#        python dbz_roster.py range OUT.dbzr LOW HIGH [--limit N]
+#        python dbz_roster.py info OUT.dbzr
+
+import sys
+import mmap
+import time
+import struct
+import argparse
+from itertools import islice
+
+from dbz_tournament import read_fighters, report_throughput
+
+ROSTER_MAGIC = b"DBZR"
+ROSTER_VERSION = 1
+RANGE_LIMIT = 20  # Fighters printed by the range command
+
+HEADER = struct.Struct("<4sHHQQ")
+POWER = struct.Struct("<q")
+NAME_END = struct.Struct("<Q")
+INDEX_ENTRY = struct.Struct("<I")
+
+class RosterFormatError(ValueError):
+    pass
+
+def write_binary_roster(path, fighters):
+    # fighters: (name, power) in roster order; returns the number written
+    names = []
+    powers = []
+    for name, power in fighters:
+        names.append(name)
+        powers.append(int(power))
+
+    order = sorted(range(len(powers)), key=powers.__getitem__)  # Stable, so ties keep roster order
+    lowered = [names[position].lower() for position in order]
+    index = sorted(range(len(order)), key=lambda fighter: (lowered[fighter], order[fighter]))
+    encoded = [names[position].encode() for position in order]
+
+    ends = []
+    end = 0
+    for name in encoded:
+        end += len(name)
+        ends.append(end)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(ROSTER_MAGIC, ROSTER_VERSION, 0, len(order), end))
+        f.write(struct.pack(f"<{len(order)}q", *(powers[position] for position in order)))
+        f.write(struct.pack(f"<{len(ends)}Q", *ends))
+        f.write(struct.pack(f"<{len(index)}I", *index))
+        f.writelines(encoded)
+    return len(order)
+
+def convert(source, path):
+    # CSV or JSON Lines roster (see dbz_tournament.py) -> binary roster
+    return write_binary_roster(path, read_fighters(source))
+
+class BinaryRoster:
+    # Memory-mapped binary roster; opening it only checks the header
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            header = self.file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise RosterFormatError(f"{path}: truncated header")
+            magic, version, _, self.count, name_bytes = HEADER.unpack(header)
+            if magic != ROSTER_MAGIC:
+                raise RosterFormatError(f"{path}: not a binary roster")
+            if version != ROSTER_VERSION:
+                raise RosterFormatError(f"{path}: unsupported roster version {version}")
+
+            self.powers_at = HEADER.size
+            self.ends_at = self.powers_at + POWER.size * self.count
+            self.index_at = self.ends_at + NAME_END.size * self.count
+            self.names_at = self.index_at + INDEX_ENTRY.size * self.count
+            size = self.names_at + name_bytes
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self.data) < size:
+                self.data.close()
+                raise RosterFormatError(f"{path}: truncated roster")
+        except Exception:
+            self.file.close()
+            raise
+        self.reads = 0
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.count
+
+    def power_at(self, fighter):
+        return POWER.unpack_from(self.data, self.powers_at + POWER.size * fighter)[0]
+
+    def name_at(self, fighter):
+        start = NAME_END.unpack_from(self.data, self.ends_at + NAME_END.size * (fighter - 1))[0] if fighter else 0
+        end = NAME_END.unpack_from(self.data, self.ends_at + NAME_END.size * fighter)[0]
+        return self.data[self.names_at + start:self.names_at + end].decode()
+
+    def indexed(self, position):
+        # Fighter number at a position of the name index
+        return INDEX_ENTRY.unpack_from(self.data, self.index_at + INDEX_ENTRY.size * position)[0]
+
+    def find(self, name):
+        # Fighter number for a name (case-insensitive), or None
+        key = name.lower()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.name_at(self.indexed(middle)).lower() < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            fighter = self.indexed(low)
+            if self.name_at(fighter).lower() == key:
+                return fighter
+        return None
+
+    def power(self, name):
+        # Same interface as the rosters in dbz_service.py
+        self.reads += 1
+        fighter = self.find(name)
+        return None if fighter is None else self.power_at(fighter)
+
+    def lookup(self, name):
+        # (stored name, power), or None
+        fighter = self.find(name)
+        return None if fighter is None else (self.name_at(fighter), self.power_at(fighter))
+
+    def bisect_power(self, power, right=False):
+        # First fighter with a power level above (right) or at least (left) power
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            value = self.power_at(middle)
+            if value < power or (right and value == power):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def count_range(self, low, high):
+        # Fighters with low <= power <= high
+        return max(0, self.bisect_power(high, right=True) - self.bisect_power(low))
+
+    def power_range(self, low, high):
+        # Yields (name, power) with low <= power <= high, weakest first
+        for fighter in range(self.bisect_power(low), self.bisect_power(high, right=True)):
+            yield self.name_at(fighter), self.power_at(fighter)
+
+    def names(self):
+        return [self.name_at(fighter) for fighter in range(self.count)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary power level rosters")
+    commands = parser.add_subparsers(dest="command", required=True)
+    converter = commands.add_parser("convert", help="convert a CSV or JSON Lines roster")
+    converter.add_argument("source")
+    converter.add_argument("path")
+    lookup = commands.add_parser("lookup", help="power levels by name")
+    lookup.add_argument("path")
+    lookup.add_argument("names", nargs="+")
+    power_range = commands.add_parser("range", help="fighters between two power levels")
+    power_range.add_argument("path")
+    power_range.add_argument("low", type=int)
+    power_range.add_argument("high", type=int)
+    power_range.add_argument("--limit", type=int, default=RANGE_LIMIT, help="fighters to print")
+    info = commands.add_parser("info", help="describe a binary roster")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "convert":
+        count = convert(args.source, args.path)
+        report_throughput("Fighters converted", count, time.perf_counter() - start)
+        return 0
+
+    with BinaryRoster(args.path) as roster:
+        opened = time.perf_counter()
+        if args.command == "lookup":
+            for name in args.names:
+                found = roster.lookup(name)
+                print(f"{found[0]}: {found[1]}" if found else f"{name}: not in roster")
+            report_throughput("Lookups", len(args.names), time.perf_counter() - opened)
+        elif args.command == "range":
+            count = roster.count_range(args.low, args.high)
+            for name, power in islice(roster.power_range(args.low, args.high), args.limit):
+                print(f"{name}: {power}")
+            print(f"{count} fighters between {args.low} and {args.high}")
+            report_throughput("Range query", count, time.perf_counter() - opened)
+        else:
+            print(f"{args.path}: {len(roster)} fighters")
+            if len(roster):
+                print(f"Power levels {roster.power_at(0)} to {roster.power_at(len(roster) - 1)}")
+        print(f"Opened in {(opened - start) * 1000:.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+# Project: Dragon Ball Z Power Level Showdown Service
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+# Answers "who is stronger" over a local TCP socket with asyncio, using the same
+# showdown() rule as the game (dbz_tournament.py). The protocol is one JSON
+# object per line each way:
+#   {"a": "Goku", "b": "Vegeta"}  ->  {"a": "Goku", "b": "Vegeta", "a_power": 9001, "b_power": 9040, "winner": "Vegeta"}
+#   {"op": "metrics"}             ->  request rate, latency percentiles, cache and batch stats
+# Queries are collected into small batches so each fighter is looked up once
+# per batch, and lookups go through an LRU cache in front of the roster.
+# Binary rosters (.dbzr, see dbz_roster.py) are searched in place, so even a
+# very large roster starts serving at once.
+#
+# Usage: python dbz_service.py serve [--roster ROSTER] [--port 8765]
+#        python dbz_service.py load [--port 8765] [--connections 2000] [--requests 20]
+#        python dbz_service.py bench [--roster ROSTER] [--connections 2000] [--requests 20]
+
+import sys
+import csv
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import OrderedDict, deque
+
+from dbz_tournament import showdown
+from dbz_roster import BinaryRoster
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+LOOKUP_CACHE_SIZE = 4096  # Fighters kept in the LRU cache
+BATCH_SIZE = 256  # Most queries answered per batch
+BATCH_WINDOW = 0.001  # Seconds a batch waits to fill up once its first query arrives
+LATENCY_HISTORY = 10000  # Recent latencies kept for percentiles
+RATE_WINDOW = 5.0  # Seconds of requests counted for the request rate
+LOAD_CONNECTIONS = 2000
+LOAD_REQUESTS = 20  # Queries per connection
+
+# Fighters answered when no roster is given
+DEFAULT_FIGHTERS = {"Goku": 9001, "Vegeta": 9040}
+
+class DictRoster:
+    def __init__(self, fighters):
+        self.powers = {name.lower(): power for name, power in fighters.items()}
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.powers)
+
+    def names(self):
+        return list(self.powers)
+
+    def power(self, name):
+        self.reads += 1
+        return self.powers.get(name.lower())
+
+class RosterFile:
+    # Roster on disk: only name -> file offset is kept in memory and each
+    # lookup reads its one line back, so this is what the cache saves
+    def __init__(self, path):
+        self.path = path
+        self.jsonl = path.endswith((".jsonl", ".ndjson"))
+        self.offsets = {}
+        self.reads = 0
+        with open(path, "rb") as f:
+            if not self.jsonl:
+                f.readline()  # Header
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    name, _ = self.parse(line)
+                    self.offsets.setdefault(name.lower(), offset)
+        self.file = open(path, "rb")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def names(self):
+        return list(self.offsets)
+
+    def parse(self, line):
+        if self.jsonl:
+            fighter = json.loads(line)
+            return fighter["name"], int(fighter["power"])
+        name, power = next(csv.reader([line.decode()]))
+        return name, int(power)
+
+    def power(self, name):
+        offset = self.offsets.get(name.lower())
+        if offset is None:
+            return None
+        self.reads += 1
+        self.file.seek(offset)
+        return self.parse(self.file.readline())[1]
+
+    def close(self):
+        self.file.close()
+
+class LookupCache:
+    # LRU cache of power levels by lowercased name, in front of a roster
+    def __init__(self, roster, max_entries=LOOKUP_CACHE_SIZE):
+        self.roster = roster
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def power(self, name):
+        key = name.lower()
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        power = self.roster.power(key)
+        self.entries[key] = power
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return power
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+def percentile_ms(sorted_seconds, pct):
+    if not sorted_seconds:
+        return 0.0
+    index = min(len(sorted_seconds) - 1, round(pct / 100 * (len(sorted_seconds) - 1)))
+    return sorted_seconds[index] * 1000
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.open_connections = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.latencies = deque(maxlen=LATENCY_HISTORY)
+        self.recent = deque()  # Completion times inside RATE_WINDOW
+
+    def record(self, latency, error=False):
+        now = time.perf_counter()
+        self.requests += 1
+        self.errors += error
+        self.latencies.append(latency)
+        self.recent.append(now)
+        while self.recent and now - self.recent[0] > RATE_WINDOW:
+            self.recent.popleft()
+
+    def snapshot(self, cache):
+        now = time.perf_counter()
+        while self.recent and now - self.recent[0] > RATE_WINDOW:
+            self.recent.popleft()
+        window = min(RATE_WINDOW, now - self.started)
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_second": len(self.recent) / window if window else 0.0,
+            "latency_ms": {
+                "p50": percentile_ms(latencies, 50),
+                "p95": percentile_ms(latencies, 95),
+                "p99": percentile_ms(latencies, 99),
+            },
+            "connections": self.connections,
+            "open_connections": self.open_connections,
+            "batches": self.batches,
+            "average_batch": self.batched_queries / self.batches if self.batches else 0.0,
+            "cache": cache.stats(),
+        }
+
+class ShowdownService:
+    def __init__(self, roster, cache_size=LOOKUP_CACHE_SIZE, batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW):
+        self.cache = LookupCache(roster, cache_size)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.metrics = Metrics()
+        self.queue = None
+        self.batcher = None
+        self.server = None
+        self.clients = set()  # Connection handler tasks
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.create_task(self.run_batches())
+        self.server = await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self, timeout=1.0):
+        # Stops accepting, then gives open connections a moment to finish
+        self.server.close()
+        if self.clients:
+            await asyncio.wait(self.clients, timeout=timeout)
+        await self.server.wait_closed()
+        self.batcher.cancel()
+
+    async def query(self, name_a, name_b):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((name_a, name_b, future))
+        return await future
+
+    async def run_batches(self):
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+                    if queue.empty():
+                        break
+                batch.append(queue.get_nowait())
+            self.answer(batch)
+
+    def answer(self, batch):
+        # Each distinct fighter is looked up once per batch. A lookup that
+        # raises only fails the queries that need that fighter.
+        powers = {}
+        failed = {}
+        for name_a, name_b, _ in batch:
+            for name in (name_a, name_b):
+                key = name.lower()
+                if key not in powers and key not in failed:
+                    try:
+                        powers[key] = self.cache.power(key)
+                    except Exception as error:
+                        failed[key] = error
+
+        for name_a, name_b, future in batch:
+            if future.cancelled():
+                continue
+            broken = next((name for name in (name_a, name_b) if name.lower() in failed), None)
+            if broken is not None:
+                future.set_result({"error": f"lookup failed for {broken!r}: {failed[broken.lower()]}"})
+                continue
+            power_a, power_b = powers[name_a.lower()], powers[name_b.lower()]
+            if power_a is None or power_b is None:
+                missing = name_a if power_a is None else name_b
+                future.set_result({"error": f"unknown fighter {missing!r}"})
+                continue
+            winner = showdown(name_a, power_a, name_b, power_b)
+            future.set_result({"a": name_a, "b": name_b, "a_power": power_a, "b_power": power_b, "winner": winner})
+        self.metrics.batches += 1
+        self.metrics.batched_queries += len(batch)
+
+    async def handle_client(self, reader, writer):
+        metrics = self.metrics
+        task = asyncio.current_task()
+        self.clients.add(task)
+        metrics.connections += 1
+        metrics.open_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the stream limit (LimitOverrunError); the
+                    # rest of the line can't be skipped reliably, so hang up
+                    writer.write(json.dumps({"error": "request line too long"}).encode() + b"\n")
+                    await writer.drain()
+                    metrics.record(0.0, True)
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    if request.get("op") == "metrics":
+                        response = metrics.snapshot(self.cache)
+                    else:
+                        response = await self.query(str(request["a"]), str(request["b"]))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    response = {"error": "expected {\"a\": name, \"b\": name} or {\"op\": \"metrics\"}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                metrics.record(time.perf_counter() - start, "error" in response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            metrics.open_connections -= 1
+            self.clients.discard(task)
+            writer.close()
+
+def load_roster(path):
+    if not path:
+        return DictRoster(DEFAULT_FIGHTERS)
+    return BinaryRoster(path) if path.endswith(".dbzr") else RosterFile(path)
+
+def raise_file_limit(needed):
+    # Thousands of sockets need more file descriptors than many default limits allow
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+async def run_load(host, port, names, connections=LOAD_CONNECTIONS, requests=LOAD_REQUESTS, seed=0):
+    # Opens every connection first, then each sends its queries one after another.
+    # Returns the load generator's own view: throughput and latency percentiles.
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+    connected = 0
+    all_connected = asyncio.Event()
+    ready = asyncio.Event()
+
+    async def client(pairs):
+        nonlocal errors, connected
+        reader, writer = await asyncio.open_connection(host, port)
+        connected += 1
+        if connected == connections:
+            all_connected.set()
+        await ready.wait()
+        for name_a, name_b in pairs:
+            start = time.perf_counter()
+            writer.write(json.dumps({"a": name_a, "b": name_b}).encode() + b"\n")
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            errors += "error" in response
+        writer.close()
+        await writer.wait_closed()
+
+    tasks = [asyncio.create_task(client([(rng.choice(names), rng.choice(names)) for _ in range(requests)]))
+             for _ in range(connections)]
+    # Let every connection open before the clock starts (a failed one ends the wait too)
+    waiter = asyncio.create_task(all_connected.wait())
+    await asyncio.wait(tasks + [waiter], return_when=asyncio.FIRST_COMPLETED)
+    waiter.cancel()
+    start = time.perf_counter()
+    ready.set()
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": seconds,
+        "requests_per_second": len(latencies) / seconds if seconds else float("inf"),
+        "latency_ms": {pct: percentile_ms(latencies, pct) for pct in (50, 95, 99)},
+    }
+
+def print_load_report(report):
+    latency = report["latency_ms"]
+    print(f"{report['requests']} queries over {report['connections']} connections in {report['seconds']:.2f} s: "
+          f"{report['requests_per_second']:,.0f} queries/s, {report['errors']} errors")
+    print(f"Latency: p50 {latency[50]:.2f} ms, p95 {latency[95]:.2f} ms, p99 {latency[99]:.2f} ms")
+
+async def fetch_metrics(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "metrics"}\n')
+    metrics = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return metrics
+
+async def serve(roster, host, port, cache_size):
+    service = ShowdownService(roster, cache_size)
+    port = await service.start(host, port)
+    print(f"Serving {len(roster)} fighters on {host}:{port}")
+    await service.server.serve_forever()
+
+async def bench(roster, connections, requests, cache_size, seed):
+    raise_file_limit(2 * connections + 64)
+    service = ShowdownService(roster, cache_size)
+    port = await service.start(DEFAULT_HOST, 0)
+    try:
+        report = await run_load(DEFAULT_HOST, port, roster.names(), connections, requests, seed)
+        metrics = await fetch_metrics(DEFAULT_HOST, port)
+    finally:
+        await service.stop()
+    print_load_report(report)
+    cache = metrics["cache"]
+    print(f"Server: {metrics['batches']} batches (average {metrics['average_batch']:.1f} queries), "
+          f"p99 {metrics['latency_ms']['p99']:.2f} ms")
+    print(f"Lookup cache: {cache['hits']} hits, {cache['misses']} misses, {cache['evictions']} evictions, "
+          f"{cache['hit_rate']:.1%} hit rate")
+
+def main():
+    parser = argparse.ArgumentParser(description="Power level showdown query service")
+    commands = parser.add_subparsers(dest="command", required=True)
+    server = commands.add_parser("serve", help="answer queries until interrupted")
+    load = commands.add_parser("load", help="load test a running service")
+    benchmark = commands.add_parser("bench", help="start a service and load test it in one process")
+    for command in (server, benchmark):
+        command.add_argument("--roster", help="roster file (.csv, .jsonl or .dbzr, see dbz_roster.py)")
+        command.add_argument("--cache-size", type=int, default=LOOKUP_CACHE_SIZE)
+    for command in (server, load):
+        command.add_argument("--host", default=DEFAULT_HOST)
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    for command in (load, benchmark):
+        command.add_argument("--connections", type=int, default=LOAD_CONNECTIONS)
+        command.add_argument("--requests", type=int, default=LOAD_REQUESTS, help="queries per connection")
+        command.add_argument("--seed", type=int, default=0)
+    load.add_argument("--names", help="roster file to draw fighter names from (default: Goku and Vegeta)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(load_roster(args.roster), args.host, args.port, args.cache_size))
+        elif args.command == "load":
+            raise_file_limit(args.connections + 64)
+            names = load_roster(args.names).names()
+            print_load_report(asyncio.run(run_load(args.host, args.port, names, args.connections,
+                                                   args.requests, args.seed)))
+        else:
+            asyncio.run(bench(load_roster(args.roster), args.connections, args.requests, args.cache_size, args.seed))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# Project: Dragon Ball Z Power Level Tournament
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+#           Requires NumPy for the batch modes - https://pypi.org/project/numpy
+# Power level showdowns over whole rosters. showdown() is the single comparison
+# rule (the higher power level wins, equal power levels are a "tie") used by the
+# interactive game and by every batch mode here:
+#   rank      top-k fighters, streamed through a heap so the roster never has to fit in memory
+#   pairwise  every fighter against every other: wins, ties and losses per fighter,
+#             counted by binary search on the sorted power levels instead of N x N matches
+#   bracket   single elimination in roster order, one vectorized comparison per round
+#
+# Rosters are CSV (name,power header) or JSON Lines ({"name": ..., "power": ...}).
+#
+# Usage: python dbz_tournament.py rank ROSTER [--top K]
+#        python dbz_tournament.py pairwise ROSTER [--top K]
+#        python dbz_tournament.py bracket ROSTER
+#        python dbz_tournament.py generate ROSTER [--count N] [--seed S]
+
+import sys
+import csv
+import json
+import time
+import heapq
+import random
+import argparse
+
+try:
+    import numpy as np
+except ImportError:  # Only the batch modes need it; showdown() and the roster readers don't
+    np = None
+
+TIE = "tie"
+DEFAULT_TOP = 10
+
+def showdown(name_a, power_a, name_b, power_b):
+    # The stronger fighter's name, or TIE when the power levels are exactly the same
+    if power_a > power_b:
+        return name_a
+    elif power_b > power_a:
+        return name_b
+    else:
+        return TIE
+
+def outcomes(powers_a, powers_b):
+    # showdown() over whole arrays: 1 where a wins, -1 where b wins, 0 for a tie
+    return np.sign(np.asarray(powers_a) - np.asarray(powers_b)).astype(np.int8)
+
+def read_fighters(path):
+    # Yields (name, power) one fighter at a time
+    with open(path, newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    fighter = json.loads(line)
+                    yield fighter["name"], int(fighter["power"])
+        else:
+            for row in csv.DictReader(f):
+                yield row["name"], int(row["power"])
+
+def load_roster(path):
+    # (names list, int64 power array) in roster order
+    names = []
+    powers = []
+    for name, power in read_fighters(path):
+        names.append(name)
+        powers.append(power)
+    return names, np.array(powers, dtype=np.int64)
+
+def write_roster(path, fighters):
+    with open(path, "w", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for name, power in fighters:
+                f.write(json.dumps({"name": name, "power": power}) + "\n")
+        else:
+            writer = csv.writer(f)
+            writer.writerow(["name", "power"])
+            writer.writerows(fighters)
+
+def generate_roster(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"Fighter {i + 1}", rng.randint(1, 150_000_000)
+
+def top_k(fighters, k=DEFAULT_TOP):
+    # The k strongest (name, power), strongest first; equal power levels keep roster order
+    return heapq.nlargest(k, fighters, key=lambda fighter: fighter[1])
+
+def stream_top_k(path, k=DEFAULT_TOP):
+    # top_k() straight from a roster file; returns (best, fighters read)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for fighter in read_fighters(path):
+            count += 1
+            yield fighter
+    best = top_k(counted(), k)
+    return best, count
+
+def ranks(powers_sorted_desc):
+    # Competition ranking ("1224"): tied fighters share a rank
+    powers = np.asarray(powers_sorted_desc)
+    if len(powers) == 0:
+        return np.zeros(0, dtype=np.int64)
+    new_rank = np.concatenate(([True], powers[1:] != powers[:-1]))
+    positions = np.arange(1, len(powers) + 1)
+    return np.maximum.accumulate(np.where(new_rank, positions, 0))
+
+def pairwise_records(powers):
+    # (wins, ties, losses) per fighter over every pairing with every other fighter
+    powers = np.asarray(powers)
+    ordered = np.sort(powers)
+    weaker = np.searchsorted(ordered, powers, side="left")
+    not_stronger = np.searchsorted(ordered, powers, side="right")
+    wins = weaker
+    ties = not_stronger - weaker - 1  # Minus the fighter itself
+    losses = len(powers) - not_stronger
+    return wins, ties, losses
+
+def bracket(names, powers):
+    # Single elimination in roster order. A tied match is recorded as a tie and
+    # the fighter listed first advances; an odd fighter out gets a bye.
+    # Returns (champion, rounds) with rounds as lists of (a, b, result).
+    alive = np.arange(len(powers))
+    powers = np.asarray(powers)
+    rounds = []
+    while len(alive) > 1:
+        paired = len(alive) // 2 * 2
+        first, second = alive[0:paired:2], alive[1:paired:2]
+        result = outcomes(powers[first], powers[second])
+        winners = np.where(result >= 0, first, second)
+        rounds.append(list(zip(first.tolist(), second.tolist(), result.tolist())))
+        alive = np.concatenate((winners, alive[paired:]))
+    champion = names[alive[0]] if len(alive) else None
+    return champion, rounds
+
+def describe(index_a, index_b, result, names):
+    if result == 0:
+        return f"{names[index_a]} vs {names[index_b]}: {TIE}"
+    winner = names[index_a] if result > 0 else names[index_b]
+    return f"{names[index_a]} vs {names[index_b]}: {winner}"
+
+def report_throughput(label, count, seconds):
+    rate = count / seconds if seconds else float("inf")
+    print(f"{label}: {count} in {seconds * 1000:.1f} ms ({rate:,.0f}/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Power level showdowns over whole rosters")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rank = commands.add_parser("rank", help="top-k fighters, streamed")
+    rank.add_argument("path")
+    rank.add_argument("--top", type=int, default=DEFAULT_TOP)
+    pairwise = commands.add_parser("pairwise", help="every fighter against every other")
+    pairwise.add_argument("path")
+    pairwise.add_argument("--top", type=int, default=DEFAULT_TOP, help="records to print")
+    elimination = commands.add_parser("bracket", help="single elimination in roster order")
+    elimination.add_argument("path")
+    generate = commands.add_parser("generate", help="write a random roster (.csv or .jsonl)")
+    generate.add_argument("path")
+    generate.add_argument("--count", type=int, default=100_000)
+    generate.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if np is None and args.command != "generate":
+        parser.error(f"{args.command} requires NumPy - https://pypi.org/project/numpy")
+
+    start = time.perf_counter()
+    if args.command == "generate":
+        write_roster(args.path, generate_roster(args.count, args.seed))
+        report_throughput("Fighters written", args.count, time.perf_counter() - start)
+
+    elif args.command == "rank":
+        best, count = stream_top_k(args.path, args.top)
+        seconds = time.perf_counter() - start
+        for position, (name, power) in zip(ranks([power for _, power in best]), best):
+            print(f"{position:>4}. {name}: {power}")
+        report_throughput("Fighters ranked", count, seconds)
+
+    elif args.command == "pairwise":
+        names, powers = load_roster(args.path)
+        loaded = time.perf_counter()
+        wins, ties, losses = pairwise_records(powers)
+        seconds = time.perf_counter() - loaded
+        for index in np.argsort(-wins, kind="stable")[:args.top]:
+            print(f"{names[index]}: {wins[index]} wins, {ties[index]} ties, {losses[index]} losses")
+        report_throughput("Fighters loaded", len(powers), loaded - start)
+        report_throughput("Showdowns decided", len(powers) * (len(powers) - 1) // 2, seconds)
+
+    else:
+        names, powers = load_roster(args.path)
+        loaded = time.perf_counter()
+        champion, rounds = bracket(names, powers)
+        seconds = time.perf_counter() - loaded
+        if rounds:
+            print(describe(*rounds[-1][0], names))
+        print(f"Champion: {champion} after {len(rounds)} rounds")
+        report_throughput("Fighters loaded", len(powers), loaded - start)
+        report_throughput("Matches fought", sum(len(matches) for matches in rounds), seconds)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
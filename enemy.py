@@ -0,0 +1,174 @@
+# Project: Mages of Might and Power - Enemies
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Enemy swarm for Mages of Might and Power. Positions and velocities live in
+# NumPy arrays, enemies home in on the player in one batched update, and hits
+# against the player and projectiles are vectorized AABB tests, so late waves
+# can hold thousands of enemies.
+
+import numpy as np
+import pygame
+
+from assets import get_sprite
+
+ENEMY_SIZE = (30, 30)
+ENEMY_COLOR = (170, 0, 170)
+ENEMY_SPEED = 2  # Pixels per 60 Hz step
+ENEMY_SPEED_SPREAD = 0.25  # Each enemy's speed varies by up to this fraction
+ENEMY_MIN_SPAWN_Y = 100
+MAX_PAIR_TESTS = 4_000_000  # Projectile x enemy tests per batch
+
+def get_enemy_image():
+    return get_sprite(("enemy",) + ENEMY_SIZE, ENEMY_SIZE, lambda image: image.fill(ENEMY_COLOR))
+
+class EnemySwarm:
+    def __init__(self, screen_width, screen_height, seed=None, capacity=64):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.width, self.height = ENEMY_SIZE
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.next_id = 0
+
+        # Struct-of-arrays storage; only the first `count` entries are live
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        capacity = len(self.x)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("x", "y", "prev_x", "prev_y", "speed", "ids"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, count=1):
+        # New enemies enter just off the left or right edge of the screen
+        self.grow(self.count + count)
+        start, end = self.count, self.count + count
+        rng = self.rng
+        from_left = rng.random(count) < 0.5
+        self.x[start:end] = np.where(from_left, -self.width, self.screen_width)
+        self.y[start:end] = rng.uniform(ENEMY_MIN_SPAWN_Y, self.screen_height - self.height, count)
+        self.prev_x[start:end] = self.x[start:end]
+        self.prev_y[start:end] = self.y[start:end]
+        self.speed[start:end] = ENEMY_SPEED * rng.uniform(1 - ENEMY_SPEED_SPREAD, 1 + ENEMY_SPEED_SPREAD, count)
+        self.ids[start:end] = np.arange(self.next_id, self.next_id + count)
+        self.next_id += count
+        self.count = end
+
+    def update(self, target_x, target_y, time_scale=1.0):
+        # Move every enemy's center straight towards the target point (or
+        # towards its own target when given arrays with one point per enemy)
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        dx = target_x - (x + self.width / 2)
+        dy = target_y - (y + self.height / 2)
+        distance = np.hypot(dx, dy)
+        step = np.minimum(self.speed[:n] * time_scale, distance)
+        scale = np.divide(step, distance, out=np.zeros(n), where=distance > 0)
+        x += dx * scale
+        y += dy * scale
+
+    def chase(self, targets, time_scale=1.0):
+        # update() with every enemy heading for whichever (x, y) target is nearest
+        n = self.count
+        if n == 0 or not targets:
+            return
+        if len(targets) == 1:
+            self.update(targets[0][0], targets[0][1], time_scale)
+            return
+        target_x, target_y = np.asarray(targets, dtype=float).T
+        center_x = self.x[:n, None] + self.width / 2
+        center_y = self.y[:n, None] + self.height / 2
+        nearest = ((target_x - center_x) ** 2 + (target_y - center_y) ** 2).argmin(axis=1)
+        self.update(target_x[nearest], target_y[nearest], time_scale)
+
+    def boxes(self):
+        # Integer (left, top) of each live enemy, as pygame would place its rect
+        n = self.count
+        return np.rint(self.x[:n]).astype(np.int64), np.rint(self.y[:n]).astype(np.int64)
+
+    def overlapping(self, rect):
+        # Mask of enemies touching one rect (same rules as Rect.colliderect)
+        left, top = self.boxes()
+        return ((left < rect.right) & (left + self.width > rect.left) &
+                (top < rect.bottom) & (top + self.height > rect.top))
+
+    def collides_with(self, rect):
+        return self.count > 0 and bool(self.overlapping(rect).any())
+
+    def resolve_hits(self, rects):
+        # Like groupcollide(projectiles, enemies, True, True): every rect that
+        # touches an enemy is hit and every enemy touched by a rect dies.
+        # Returns a boolean mask over rects.
+        hit = np.zeros(len(rects), dtype=bool)
+        if self.count == 0 or not rects:
+            return hit
+        boxes = np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.int64)
+        left, top = self.boxes()
+        right, bottom = left + self.width, top + self.height
+        killed = np.zeros(self.count, dtype=bool)
+
+        batch = max(1, MAX_PAIR_TESTS // self.count)
+        for start in range(0, len(boxes), batch):
+            b = boxes[start:start + batch]
+            pairs = ((left[None, :] < b[:, 2:3]) & (right[None, :] > b[:, 0:1]) &
+                     (top[None, :] < b[:, 3:4]) & (bottom[None, :] > b[:, 1:2]))
+            hit[start:start + batch] = pairs.any(axis=1)
+            killed |= pairs.any(axis=0)
+
+        self.remove(killed)
+        return hit
+
+    def remove(self, mask):
+        # Compact the live range, dropping enemies where mask is True
+        if not mask.any():
+            return
+        keep = ~mask
+        n = self.count
+        remaining = int(keep.sum())
+        for name in ("x", "y", "prev_x", "prev_y", "speed", "ids"):
+            column = getattr(self, name)
+            column[:remaining] = column[:n][keep]
+        self.count = remaining
+
+    def clear(self):
+        self.count = 0
+
+    def get_image(self):
+        return get_enemy_image()
+
+    def render_positions(self, alpha=1.0):
+        # (id, (x, y)) for drawing between the previous and current physics step
+        n = self.count
+        x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        return zip(self.ids[:n].tolist(), np.rint(x).astype(np.int64).tolist(), np.rint(y).astype(np.int64).tolist())
+
+    def render_items(self, alpha=1.0):
+        # Items in the (key, image, position) form the dirty-rect renderer takes
+        image = self.get_image()
+        return [(("enemy", enemy_id), image, (x, y)) for enemy_id, x, y in self.render_positions(alpha)]
+
+    def draw(self, surface, alpha=1.0):
+        image = self.get_image()
+        surface.blits([(image, (x, y)) for _, x, y in self.render_positions(alpha)], False)
@@ -0,0 +1,56 @@
+# Project: Fixed Timestep Clock
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+# Shared simulation clock for the pygame games: physics runs in fixed steps from
+# an accumulator while rendering interpolates between the last two physics states
+
+import time
+
+# The games' speeds, gravity and jump strengths are tuned per step at this rate
+TUNED_HZ = 60
+MAX_CATCH_UP_STEPS = 5
+
+def lerp(start, end, alpha):
+    return start + (end - start) * alpha
+
+class FixedTimestep:
+    def __init__(self, hz=TUNED_HZ, max_steps=MAX_CATCH_UP_STEPS, clock=time.perf_counter):
+        self.hz = hz
+        self.dt = 1.0 / hz
+        self.time_scale = TUNED_HZ / hz  # Multiply per-step constants by this
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last_time = clock()
+        self.steps = 0
+        self.dropped_steps = 0
+
+    def reset(self):
+        # Forget time spent outside the simulation (menus, loading) so it isn't replayed
+        self.accumulator = 0.0
+        self.last_time = self.clock()
+
+    def advance(self):
+        # Number of physics steps to run this frame
+        now = self.clock()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Too far behind: run a bounded number of steps and let the rest go,
+            # otherwise a slow frame leads to an even slower one
+            self.dropped_steps += steps - self.max_steps
+            self.accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+
+        self.accumulator -= steps * self.dt
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        # How far rendering is between the previous and current physics state
+        return min(1.0, self.accumulator / self.dt)
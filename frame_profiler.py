@@ -0,0 +1,197 @@
+# Project: Frame Profiler
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+# Named timing scopes around each phase of a game loop, kept in a ring buffer of
+# recent frames. Shows per-phase p50/p95/p99 in a toggleable overlay and exports
+# to CSV, JSON or Chrome trace format (chrome://tracing, Perfetto).
+# When disabled, scope() hands back a shared no-op context so the hooks cost
+# about one method call each.
+
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+PROFILE_HISTORY = 600  # Frames kept in the ring buffer
+OVERLAY_REFRESH_FRAMES = 15  # Overlay percentiles are recomputed this often
+OVERLAY_TOGGLE_KEY = pygame.K_F3
+
+class NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SCOPE = NullScope()
+
+class Scope:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class FrameProfiler:
+    def __init__(self, history=PROFILE_HISTORY, enabled=False):
+        # recording keeps the profiler on while the overlay is hidden (for export)
+        self.recording = enabled
+        self.enabled = enabled
+        self.show_overlay = False
+        self.frames = deque(maxlen=history)
+        self.phase_names = []
+        self.frame_number = 0
+        self.epoch = time.perf_counter()
+        self.current = None
+        self.overlay_stats = {}
+        self.overlay_frame = None
+
+    def toggle(self):
+        # Showing the overlay switches timing on; hiding it switches timing back
+        # off unless the profiler is recording for export
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.recording
+        if not self.enabled:
+            self.current = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {"frame": self.frame_number, "start": time.perf_counter(), "events": []}
+
+    def end_frame(self):
+        if not self.enabled or self.current is None:
+            return
+        frame = self.current
+        frame["end"] = time.perf_counter()
+        self.frames.append(frame)
+        self.frame_number += 1
+        self.current = None
+
+    def scope(self, name):
+        if not self.enabled or self.current is None:
+            return NULL_SCOPE
+        return Scope(self, name)
+
+    def record(self, name, start, end):
+        if self.current is None:
+            return
+        if name not in self.phase_names:
+            self.phase_names.append(name)
+        self.current["events"].append((name, start, end))
+
+    def phase_totals(self, frame):
+        # Seconds per phase in one frame (a phase can be entered several times)
+        totals = {}
+        for name, start, end in frame["events"]:
+            totals[name] = totals.get(name, 0.0) + (end - start)
+        totals["frame"] = frame["end"] - frame["start"]
+        return totals
+
+    def stats(self):
+        # {phase: {"p50": ms, "p95": ms, "p99": ms}} over the ring buffer
+        samples = {}
+        for frame in self.frames:
+            for name, seconds in self.phase_totals(frame).items():
+                samples.setdefault(name, []).append(seconds * 1000)
+        result = {}
+        for name in self.phase_names + ["frame"]:
+            values = sorted(samples.get(name, []))
+            if values:
+                result[name] = {
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "p99": percentile(values, 99),
+                }
+        return result
+
+    def draw_overlay(self, surface, font):
+        if not self.show_overlay:
+            return
+        if self.overlay_frame is None or self.frame_number - self.overlay_frame >= OVERLAY_REFRESH_FRAMES:
+            self.overlay_stats = self.stats()
+            self.overlay_frame = self.frame_number
+
+        lines = [f"{'phase':12} {'p50':>6} {'p95':>6} {'p99':>6} ms"]
+        for name, stat in self.overlay_stats.items():
+            lines.append(f"{name[:12]:12} {stat['p50']:6.2f} {stat['p95']:6.2f} {stat['p99']:6.2f}")
+
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 16
+        height = line_height * len(lines) + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (255, 255, 255)), (8, 6 + i * line_height))
+        surface.blit(panel, (surface.get_width() - width - 10, surface.get_height() - height - 10))
+
+    def export_csv(self, path):
+        names = self.phase_names + ["frame"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_number"] + [f"{name}_ms" for name in names])
+            for frame in self.frames:
+                totals = self.phase_totals(frame)
+                writer.writerow([frame["frame"]] + [f"{totals.get(name, 0.0) * 1000:.4f}" for name in names])
+
+    def export_json(self, path):
+        data = {
+            "stats_ms": self.stats(),
+            "frames": [
+                {"frame": frame["frame"],
+                 "phases_ms": {name: seconds * 1000 for name, seconds in self.phase_totals(frame).items()}}
+                for frame in self.frames
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def export_chrome_trace(self, path):
+        # Complete ("X") events with microsecond timestamps
+        events = []
+        for frame in self.frames:
+            events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": (frame["start"] - self.epoch) * 1e6,
+                           "dur": (frame["end"] - frame["start"]) * 1e6,
+                           "args": {"frame": frame["frame"]}})
+            for name, start, end in frame["events"]:
+                events.append({"name": name, "ph": "X", "pid": 0, "tid": 0,
+                               "ts": (start - self.epoch) * 1e6, "dur": (end - start) * 1e6})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path):
+        # Format follows the file name: .csv, *trace*.json or plain .json
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        elif "trace" in path:
+            self.export_chrome_trace(path)
+        else:
+            self.export_json(path)
+
+# Shared profiler that stays disabled unless a game turns it on
+disabled_profiler = FrameProfiler(enabled=False)
@@ -0,0 +1,153 @@
+# Project: Input Map
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+# Shared keyboard input for both pygame games. Keys are bound to actions once,
+# input devices a screen doesn't read (mouse, joysticks, touch, text input) are
+# dropped by SDL before their events reach Python, and input is read at a single
+# point in each frame by poll(). Window, video and other system events always
+# get through.
+#
+# Input-to-display latency is measured from the poll that reads a key press to
+# the flip that first shows a frame simulated with it, in milliseconds and in
+# frames (1 means it was shown in the frame that read it). Time a press spends
+# in the queue before that poll (at most one frame) is not included.
+
+import time
+from collections import deque
+
+import pygame
+
+from frame_profiler import percentile
+
+# Event types every input map lets through
+BASE_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)
+# Input event types an input map blocks unless a screen asks for them
+INPUT_EVENTS = (
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+    pygame.JOYAXISMOTION, pygame.JOYBALLMOTION, pygame.JOYHATMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+    pygame.CONTROLLERAXISMOTION, pygame.CONTROLLERBUTTONDOWN, pygame.CONTROLLERBUTTONUP,
+    pygame.CONTROLLERTOUCHPADDOWN, pygame.CONTROLLERTOUCHPADMOTION, pygame.CONTROLLERTOUCHPADUP,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION, pygame.MULTIGESTURE,
+    pygame.TEXTINPUT, pygame.TEXTEDITING,
+)
+LATENCY_HISTORY = 600  # Latency samples kept for percentiles
+
+def bind(bindings):
+    # {action: keys} -> {key: [actions]}, keeping the order actions were listed in
+    by_key = {}
+    for action, keys in (bindings or {}).items():
+        for key in keys:
+            by_key.setdefault(key, []).append(action)
+    return by_key
+
+class InputFrame:
+    # One frame's input: actions in the order their keys went down or up, the
+    # held actions, whether the window was closed, and the raw events (for
+    # handlers such as the profiler's F3 toggle)
+    def __init__(self, actions, held, quit, events):
+        self.actions = actions
+        self.held = held
+        self.quit = quit
+        self.events = events
+
+class LatencyTracker:
+    def __init__(self, history=LATENCY_HISTORY):
+        self.waiting = []  # (frame, time) read but not simulated yet
+        self.simulated = []  # Simulated but not shown yet
+        self.samples = deque(maxlen=history)  # (ms, frames)
+
+    def read(self, frame, when):
+        self.waiting.append((frame, when))
+
+    def applied(self):
+        self.simulated.extend(self.waiting)
+        self.waiting = []
+
+    def discard(self):
+        # Input that was read but will never be simulated (e.g. on a game over screen)
+        self.waiting = []
+
+    def presented(self, frame):
+        if not self.simulated:
+            return
+        now = time.perf_counter()
+        for read_frame, when in self.simulated:
+            self.samples.append(((now - when) * 1000, frame - read_frame + 1))
+        self.simulated = []
+
+    def stats(self):
+        milliseconds = sorted(ms for ms, _ in self.samples)
+        frames = sorted(count for _, count in self.samples)
+        return {
+            "inputs": len(milliseconds),
+            "p50_ms": percentile(milliseconds, 50),
+            "p95_ms": percentile(milliseconds, 95),
+            "max_ms": milliseconds[-1] if milliseconds else 0.0,
+            "p50_frames": percentile(frames, 50) if frames else 0,
+            "max_frames": frames[-1] if frames else 0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        return (f"Input latency: {stats['inputs']} inputs, p50 {stats['p50_ms']:.1f} ms, "
+                f"p95 {stats['p95_ms']:.1f} ms, max {stats['max_ms']:.1f} ms, "
+                f"{stats['p50_frames']} frames typical, {stats['max_frames']} at most")
+
+class InputMap:
+    # press and release map actions to the keys that fire them on key down and
+    # key up; hold maps actions to keys that keep them active while any is down.
+    # events lists extra event types the screen reads from InputFrame.events.
+    def __init__(self, press=None, release=None, hold=None, events=()):
+        self.press = bind(press)
+        self.release = bind(release)
+        self.hold = dict(hold or {})
+        self.held_keys = set(bind(hold))
+        self.allowed = list(BASE_EVENTS) + [event for event in events if event not in BASE_EVENTS]
+        self.blocked = [event for event in INPUT_EVENTS if event not in self.allowed]
+        self.frame = 0
+        self.latency = LatencyTracker()
+
+    def activate(self):
+        # From now on the only input events that reach the queue are the ones
+        # this map reads (another map's extra types are blocked again)
+        pygame.event.set_allowed(None)
+        pygame.event.set_blocked(self.blocked)
+
+    def poll(self):
+        # The frame's one input point: drains the queue, then samples held keys
+        now = time.perf_counter()
+        self.frame += 1
+        events = pygame.event.get()
+        actions = []
+        quit = False
+        pressed = False
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                bound = self.press.get(event.key, ())
+                actions.extend(bound)
+                pressed = pressed or bool(bound) or event.key in self.held_keys
+            elif event.type == pygame.KEYUP:
+                actions.extend(self.release.get(event.key, ()))
+            elif event.type == pygame.QUIT:
+                quit = True
+        if pressed:
+            self.latency.read(self.frame, now)
+
+        held = set()
+        if self.hold:
+            keys = pygame.key.get_pressed()
+            held = {action for action, bound in self.hold.items() if any(keys[key] for key in bound)}
+        return InputFrame(actions, held, quit, events)
+
+    def applied(self):
+        # Call once the simulation has used the input read so far
+        self.latency.applied()
+
+    def discard(self):
+        self.latency.discard()
+
+    def presented(self):
+        # Call right after the display flip
+        self.latency.presented(self.frame)
@@ -0,0 +1,221 @@
+# Project: Mages of Might and Power - Balance Sweeps
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Plays thousands of headless Mages of Might and Power matches with a scripted
+# bot over a grid of balance settings (enemy spawn rate, spawn floor, projectile
+# speed and projectile size), spread across a process pool. Each match is the
+# game loop's simulation (GameWorld at PHYSICS_HZ) without the window or frame
+# cap. Results are aggregated per setting and mage type: win rate, time to the
+# 20th kill, kills, death rate and survival time, plus the share of matches that
+# hit the time limit. Survival time only averages matches that ended in death,
+# so the time limit doesn't skew it.
+#
+# Match i of a sweep always uses seed + i, and matches are numbered in grid
+# order, so a sweep gives the same results with any number of workers.
+#
+# Usage: python mages_balance.py [--spawn-rate 2000 1500] [--spawn-floor 500 300]
+#                                [--projectile-speed 7 10] [--projectile-scale 1.0 1.5]
+#                                [--matches 50] [--workers N] [--seed 0] [--output results.csv]
+
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import itertools
+import statistics
+import multiprocessing as mp
+
+import numpy as np
+
+import MagesofMightandPower as mages_game
+from fixed_timestep import FixedTimestep
+
+MAGE_TYPES = ("fire", "water", "earth", "air")
+MATCHES_PER_SETTING = 50  # Per mage type
+MAX_MATCH_SECONDS = 180  # Simulated; a match still going by then counts as a loss
+BOT_FIRE_INTERVAL = 10  # Physics steps between shots
+BOT_DANGER_DISTANCE = 120  # Pixels; the bot backs away from enemies closer than this
+BOT_MISS_RATE = 0.1  # Share of shots the bot hesitates on
+
+# Scripted player: fires at the nearest enemy every few steps and otherwise
+# backs away from it, jumping when it gets very close
+class BalanceBot:
+    def __init__(self, rng, fire_interval=BOT_FIRE_INTERVAL, danger=BOT_DANGER_DISTANCE, miss_rate=BOT_MISS_RATE):
+        self.rng = rng
+        self.fire_interval = fire_interval
+        self.danger = danger
+        self.miss_rate = miss_rate
+        self.steps = 0
+
+    def actions(self, world):
+        self.steps += 1
+        enemies = world.enemies
+        n = len(enemies)
+        if n == 0:
+            return [mages_game.ACTION_STOP]
+
+        player_x, player_y = world.player.rect.center
+        center_x = enemies.x[:n] + enemies.width / 2
+        center_y = enemies.y[:n] + enemies.height / 2
+        distance = np.hypot(center_x - player_x, center_y - player_y)
+        nearest = int(distance.argmin())
+        target_right = center_x[nearest] > player_x
+
+        if self.steps % self.fire_interval == 0 and self.rng.random() >= self.miss_rate:
+            # Turn to face the target, stand still and shoot
+            face = mages_game.ACTION_RIGHT if target_right else mages_game.ACTION_LEFT
+            return [face, mages_game.ACTION_STOP, mages_game.ACTION_SHOOT]
+        if distance[nearest] < self.danger:
+            away = mages_game.ACTION_LEFT if target_right else mages_game.ACTION_RIGHT
+            return [away, mages_game.ACTION_JUMP] if distance[nearest] < self.danger / 2 else [away]
+        return [mages_game.ACTION_STOP]
+
+def projectile_sizes(scale):
+    # Every mage type's projectile (width, height) scaled, or None to keep PROJECTILE_STYLES
+    if scale == 1.0:
+        return None
+    return {mage_type: (max(1, round(width * scale)), max(1, round(height * scale)))
+            for mage_type, (_, (width, height)) in mages_game.PROJECTILE_STYLES.items()}
+
+def run_match(task):
+    # task: (index, setting, mage type, seed, max seconds) -> one result row
+    index, setting, mage_type, seed, max_seconds = task
+    spawn_rate, spawn_floor, projectile_speed, projectile_scale = setting
+    world = mages_game.GameWorld(mages_game.Player(mage_type), 0, seed=seed, spawn_rate=spawn_rate,
+                                 spawn_floor=spawn_floor, projectile_speed=projectile_speed,
+                                 projectile_sizes=projectile_sizes(projectile_scale))
+    bot = BalanceBot(random.Random(seed))
+    time_scale = FixedTimestep(mages_game.PHYSICS_HZ).time_scale
+    max_ms = max_seconds * 1000
+
+    while not world.finished and world.time < max_ms:
+        for action in bot.actions(world):
+            world.apply_action(action)
+        world.step(time_scale)
+
+    # Killed projectiles go back to the shared pool; live ones are dropped with the world
+    for projectile in world.projectiles.sprites():
+        projectile.kill()
+    return {
+        "index": index,
+        "setting": setting,
+        "mage": mage_type,
+        "victory": world.victory,
+        "timed_out": not world.finished,
+        "kills": world.player.kills,
+        "seconds": world.time / 1000,
+    }
+
+def sweep_tasks(settings, mage_types, matches, seed, max_seconds):
+    tasks = []
+    for setting in settings:
+        for mage_type in mage_types:
+            for _ in range(matches):
+                index = len(tasks)
+                tasks.append((index, setting, mage_type, seed + index, max_seconds))
+    return tasks
+
+def run_sweep(settings, mage_types=MAGE_TYPES, matches=MATCHES_PER_SETTING, seed=0, workers=None,
+              max_seconds=MAX_MATCH_SECONDS):
+    # Returns (results in match order, wall seconds, worker count)
+    tasks = sweep_tasks(settings, mage_types, matches, seed, max_seconds)
+    workers = max(1, min(workers or mp.cpu_count(), len(tasks)))
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_match(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with mp.Pool(workers) as pool:
+            results = list(pool.imap_unordered(run_match, tasks, chunksize))
+    results.sort(key=lambda result: result["index"])
+    return results, time.perf_counter() - start, workers
+
+def summary_row(setting, mage_type, group):
+    wins = [result["seconds"] for result in group if result["victory"]]
+    deaths = [result["seconds"] for result in group if not result["victory"] and not result["timed_out"]]
+    timeouts = sum(result["timed_out"] for result in group)
+    spawn_rate, spawn_floor, projectile_speed, projectile_scale = setting
+    return {
+        "spawn_rate": spawn_rate,
+        "spawn_floor": spawn_floor,
+        "projectile_speed": projectile_speed,
+        "projectile_scale": projectile_scale,
+        "mage": mage_type,
+        "matches": len(group),
+        "win_rate": len(wins) / len(group),
+        "median_seconds_to_win": statistics.median(wins) if wins else None,
+        "mean_kills": statistics.fmean(result["kills"] for result in group),
+        "death_rate": len(deaths) / len(group),
+        "mean_seconds_to_death": statistics.fmean(deaths) if deaths else None,
+        "timeout_rate": timeouts / len(group),
+    }
+
+def summarize(results):
+    # One row per (setting, mage type), plus one per setting over every mage type ("all")
+    groups = {}
+    for result in results:
+        groups.setdefault(result["setting"], {}).setdefault(result["mage"], []).append(result)
+
+    rows = []
+    for setting, by_mage in groups.items():
+        for mage_type, group in by_mage.items():
+            rows.append(summary_row(setting, mage_type, group))
+        rows.append(summary_row(setting, "all", [result for group in by_mage.values() for result in group]))
+    return rows
+
+def print_table(rows):
+    print(f"{'spawn':>6} {'floor':>6} {'speed':>6} {'scale':>6} {'mage':6} {'matches':>8} {'win %':>7} "
+          f"{'to 20 s':>8} {'kills':>6} {'deaths %':>9} {'to death s':>11} {'timeout %':>10}")
+    for row in rows:
+        to_win = f"{row['median_seconds_to_win']:.1f}" if row["median_seconds_to_win"] is not None else "-"
+        to_death = f"{row['mean_seconds_to_death']:.1f}" if row["mean_seconds_to_death"] is not None else "-"
+        print(f"{row['spawn_rate']:>6} {row['spawn_floor']:>6} {row['projectile_speed']:>6g} "
+              f"{row['projectile_scale']:>6g} {row['mage']:6} {row['matches']:>8} {row['win_rate']:>7.1%} "
+              f"{to_win:>8} {row['mean_kills']:>6.1f} {row['death_rate']:>9.1%} {to_death:>11} "
+              f"{row['timeout_rate']:>10.1%}")
+
+def write_rows(path, rows):
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=2)
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Balance sweeps for Mages of Might and Power")
+    parser.add_argument("--spawn-rate", type=int, nargs="+", default=[mages_game.ENEMY_SPAWN_RATE],
+                        help="starting enemy spawn delays (ms)")
+    parser.add_argument("--spawn-floor", type=int, nargs="+", default=[mages_game.ENEMY_SPAWN_FLOOR],
+                        help="shortest spawn delays (ms)")
+    parser.add_argument("--projectile-speed", type=float, nargs="+", default=[mages_game.PROJECTILE_SPEED])
+    parser.add_argument("--projectile-scale", type=float, nargs="+", default=[1.0],
+                        help="multipliers on every mage type's projectile size")
+    parser.add_argument("--mages", nargs="+", choices=MAGE_TYPES, default=list(MAGE_TYPES))
+    parser.add_argument("--matches", type=int, default=MATCHES_PER_SETTING, help="matches per setting and mage type")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=MAX_MATCH_SECONDS, help="simulated time limit per match")
+    parser.add_argument("--output", help="write the table to this .csv or .json file")
+    args = parser.parse_args()
+
+    settings = list(itertools.product(args.spawn_rate, args.spawn_floor, args.projectile_speed, args.projectile_scale))
+    results, seconds, workers = run_sweep(settings, args.mages, args.matches, args.seed, args.workers,
+                                          args.max_seconds)
+    rows = summarize(results)
+    print_table(rows)
+    simulated = sum(result["seconds"] for result in results)
+    print(f"{len(results)} matches ({simulated / 60:.0f} simulated minutes) in {seconds:.1f} s on {workers} "
+          f"workers: {len(results) / seconds:.1f} matches/s")
+    if args.output:
+        write_rows(args.output, rows)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
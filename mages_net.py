@@ -0,0 +1,787 @@
+# Project: Mages of Might and Power - Network Play
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Co-op Mages of Might and Power over TCP, on localhost or a LAN. The server
+# runs the only simulation (players, projectiles and the enemy swarm) and sends
+# every client a state snapshot at a fixed tick rate; clients send their key
+# actions and draw the world interpolated between the last two snapshots.
+#
+# Snapshots are delta compressed against the previous snapshot sent to the
+# same client. TCP delivers every snapshot in order, so that baseline is always
+# the one the client has, and no acks are needed. Per entity a snapshot carries
+# nothing when it didn't move, a 1-byte dx, dy when it moved a little, or a full
+# record when it is new or jumped. The whole message is then zlib compressed.
+#
+# Each message is framed as: payload length (uint32), type (uint8), payload.
+# A peer that announces a payload longer than the receiver's limit is
+# disconnected rather than buffered.
+#   join      client -> server  JSON {"mage": ...}
+#   welcome   server -> client  JSON {"player": id, "tick_hz": ...}
+#   input     client -> server  player action codes, one byte each
+#   snapshot  server -> client  zlib(header, player info, three entity sections)
+#   resync    client -> server  empty; the client lost its baseline, send a full snapshot
+#
+# Usage: python mages_net.py server [--port 8766] [--enemies 200]
+#        python mages_net.py client [--host HOST] [--port 8766] [--mage fire]
+#        python mages_net.py bench [--players 8] [--enemies 300] [--seconds 10]
+
+import sys
+import json
+import time
+import zlib
+import random
+import socket
+import struct
+import argparse
+import selectors
+from collections import deque
+
+import pygame
+
+import MagesofMightandPower as mages_game
+from enemy import EnemySwarm, get_enemy_image
+from fixed_timestep import FixedTimestep, lerp, TUNED_HZ
+from text_cache import get_font, render_text
+from input_map import InputMap
+from frame_profiler import percentile
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+TICK_HZ = 20  # Snapshots per second; physics runs at PHYSICS_HZ in between
+INTERPOLATION_DELAY = 2 / TICK_HZ  # Seconds clients draw behind the newest snapshot
+SNAPSHOT_HISTORY = 32  # Snapshots a client keeps for interpolation
+CLOCK_WINDOW = 2 * TICK_HZ  # Snapshots the client's clock offset is estimated over
+VICTORY_KILLS = 20  # Per player, as in the single player game
+ROUND_RESTART_MS = 3000  # Simulated time between the end of a round and the next one
+MAX_SEND_BACKLOG = 4 * 1024 * 1024  # Bytes queued for a client before it is dropped
+MAX_CLIENT_FRAME = 64 * 1024  # Largest message payload the server accepts; joins and inputs are tiny
+MAX_FRAME = 64 * 1024 * 1024  # Largest payload the client accepts
+STATS_INTERVAL = 5.0  # Seconds between server stat lines
+MAGE_TYPES = ("fire", "water", "earth", "air")
+
+MSG_JOIN = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_SNAPSHOT = 4
+MSG_RESYNC = 5
+
+FRAME = struct.Struct("<IB")
+# Counts, kills and positions are 32-bit so no reachable game state overflows
+# a field (zlib removes most of the extra zero bytes); entity ids wrap at 2^32
+SNAPSHOT_HEADER = struct.Struct("<IIBI")  # tick, baseline tick (0 = full), flags, player count
+PLAYER_INFO = struct.Struct("<IBIB")  # id, mage, kills, alive
+SECTION_COUNTS = struct.Struct("<III")  # removed, full, moved
+REMOVED = struct.Struct("<I")
+FULL = struct.Struct("<IiiB")  # id, x, y, tag
+MOVED = struct.Struct("<Ibb")  # id, dx, dy
+ENTITY_ID_MASK = 0xFFFFFFFF
+
+# Entity sections in snapshot order; the tag is the mage type for players and projectiles
+SECTIONS = ("players", "projectiles", "enemies")
+FLAG_FINISHED = 1
+FLAG_VICTORY = 2
+
+# One co-op round: every connected player, their projectiles and one shared
+# enemy swarm that chases whichever living player is nearest. A player touched
+# by an enemy is out until the next round. With sustain set (load tests) the
+# swarm is topped back up every step and nobody is knocked out.
+class NetWorld:
+    def __init__(self, seed=None, enemies=0, victory_kills=VICTORY_KILLS, sustain=False):
+        self.time = 0  # Milliseconds
+        self.players = {}  # id -> Player
+        self.alive = {}
+        self.enemies = EnemySwarm(mages_game.SCREEN_WIDTH, mages_game.SCREEN_HEIGHT, seed)
+        self.projectiles = pygame.sprite.Group()
+        self.next_projectile_id = 0
+        self.wave = enemies
+        self.enemies.spawn(enemies)
+        self.last_enemy_spawn = 0
+        self.enemy_spawn_delay = mages_game.ENEMY_SPAWN_RATE
+        self.victory_kills = victory_kills
+        self.sustain = sustain
+        self.victory = False
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.victory or (bool(self.players) and not any(self.alive.values()))
+
+    @property
+    def kills(self):
+        return sum(player.kills for player in self.players.values())
+
+    def add_player(self, player_id, mage_type):
+        player = mages_game.Player(mage_type)
+        # Spread players out along the ground
+        player.x = (100 + player_id * 90) % (mages_game.SCREEN_WIDTH - player.rect.width)
+        player.prev_x = player.x
+        player.rect.x = round(player.x)
+        self.players[player_id] = player
+        self.alive[player_id] = True
+        return player
+
+    def remove_player(self, player_id):
+        self.players.pop(player_id, None)
+        self.alive.pop(player_id, None)
+
+    def apply_action(self, player_id, action):
+        player = self.players.get(player_id)
+        if player is None or not self.alive[player_id] or self.finished:
+            return
+        if action == mages_game.ACTION_LEFT:
+            player.move_left()
+        elif action == mages_game.ACTION_RIGHT:
+            player.move_right()
+        elif action == mages_game.ACTION_JUMP:
+            player.jump()
+        elif action == mages_game.ACTION_SHOOT:
+            projectile = player.shoot()
+            projectile.net_id = self.next_projectile_id
+            projectile.owner = player_id
+            self.next_projectile_id += 1
+            self.projectiles.add(projectile)
+        elif action == mages_game.ACTION_STOP:
+            player.stop()
+
+    def step(self, time_scale=1.0):
+        self.time += time_scale * 1000 / TUNED_HZ
+        if self.finished:
+            return
+        living = [player for player_id, player in self.players.items() if self.alive[player_id]]
+        for player in living:
+            player.update(time_scale)
+        self.projectiles.update(time_scale)
+        self.enemies.chase([player.rect.center for player in living], time_scale)
+
+        # Spawn enemies; the delay shrinks with the team's kills
+        if self.sustain:
+            if len(self.enemies) < self.wave:
+                self.enemies.spawn(self.wave - len(self.enemies))
+        elif self.time - self.last_enemy_spawn > self.enemy_spawn_delay:
+            self.enemies.spawn()
+            self.last_enemy_spawn = self.time
+            self.enemy_spawn_delay = max(mages_game.ENEMY_SPAWN_FLOOR,
+                                         mages_game.ENEMY_SPAWN_RATE - self.kills * mages_game.ENEMY_SPAWN_SPEEDUP)
+
+        if not self.sustain:
+            for player_id, player in self.players.items():
+                if self.alive[player_id] and self.enemies.collides_with(player.rect):
+                    self.alive[player_id] = False
+
+        projectiles = self.projectiles.sprites()
+        hits = self.enemies.resolve_hits([projectile.rect for projectile in projectiles])
+        for projectile, hit in zip(projectiles, hits):
+            if hit:
+                projectile.kill()
+                owner = self.players.get(projectile.owner)
+                if owner is not None:
+                    owner.kills += 1
+
+        if self.players and self.kills >= self.victory_kills * len(self.players):
+            self.victory = True
+
+    def entity_states(self):
+        # {section: {id: (x, y, tag)}} with whole-pixel positions
+        players = {player_id: (player.rect.x, player.rect.y, MAGE_TYPES.index(player.mage_type))
+                   for player_id, player in self.players.items() if self.alive[player_id]}
+        projectiles = {projectile.net_id & ENTITY_ID_MASK:
+                       (projectile.rect.x, projectile.rect.y, MAGE_TYPES.index(projectile.mage_type))
+                       for projectile in self.projectiles}
+        left, top = self.enemies.boxes()
+        ids = (self.enemies.ids[:len(self.enemies)] & ENTITY_ID_MASK).tolist()
+        enemies = dict(zip(ids, zip(left.tolist(), top.tolist(), [0] * len(ids))))
+        return {"players": players, "projectiles": projectiles, "enemies": enemies}
+
+    def player_info(self):
+        return [(player_id, MAGE_TYPES.index(player.mage_type), player.kills, self.alive[player_id])
+                for player_id, player in sorted(self.players.items())]
+
+def encode_section(current, baseline):
+    removed = [REMOVED.pack(entity_id) for entity_id in baseline if entity_id not in current]
+    full = []
+    moved = []
+    for entity_id, state in current.items():
+        old = baseline.get(entity_id)
+        if old == state:
+            continue
+        if old is not None and old[2] == state[2]:
+            dx, dy = state[0] - old[0], state[1] - old[1]
+            if -128 <= dx <= 127 and -128 <= dy <= 127:
+                moved.append(MOVED.pack(entity_id, dx, dy))
+                continue
+        full.append(FULL.pack(entity_id, *state))
+    return b"".join([SECTION_COUNTS.pack(len(removed), len(full), len(moved))] + removed + full + moved)
+
+def encode_snapshot(tick, baseline_tick, states, baseline, flags, player_info):
+    # baseline is the states the client already has ({} sections for a full snapshot)
+    parts = [SNAPSHOT_HEADER.pack(tick, baseline_tick, flags, len(player_info))]
+    parts += [PLAYER_INFO.pack(*info) for info in player_info]
+    parts += [encode_section(states[section], baseline.get(section, {})) for section in SECTIONS]
+    raw = b"".join(parts)
+    return zlib.compress(raw, 1), len(raw)
+
+class SnapshotDesync(ValueError):
+    # A delta snapshot that doesn't apply to the baseline it was decoded against
+    pass
+
+def decode_snapshot(payload, baseline):
+    # Returns (tick, baseline tick, flags, player info, states); baseline is not
+    # modified. Raises SnapshotDesync when a moved entity isn't in the baseline.
+    data = zlib.decompress(payload)
+    tick, baseline_tick, flags, player_count = SNAPSHOT_HEADER.unpack_from(data)
+    offset = SNAPSHOT_HEADER.size
+    player_info = [PLAYER_INFO.unpack_from(data, offset + i * PLAYER_INFO.size) for i in range(player_count)]
+    offset += player_count * PLAYER_INFO.size
+
+    states = {}
+    for section in SECTIONS:
+        removed_count, full_count, moved_count = SECTION_COUNTS.unpack_from(data, offset)
+        offset += SECTION_COUNTS.size
+        entities = dict(baseline.get(section, {})) if baseline_tick else {}
+
+        end = offset + removed_count * REMOVED.size
+        for (entity_id,) in REMOVED.iter_unpack(data[offset:end]):
+            entities.pop(entity_id, None)
+        offset = end
+
+        end = offset + full_count * FULL.size
+        for entity_id, x, y, tag in FULL.iter_unpack(data[offset:end]):
+            entities[entity_id] = (x, y, tag)
+        offset = end
+
+        end = offset + moved_count * MOVED.size
+        for entity_id, dx, dy in MOVED.iter_unpack(data[offset:end]):
+            if entity_id not in entities:
+                raise SnapshotDesync(f"moved {section} entity {entity_id} is not in the baseline")
+            x, y, tag = entities[entity_id]
+            entities[entity_id] = (x + dx, y + dy, tag)
+        offset = end
+        states[section] = entities
+    return tick, baseline_tick, flags, player_info, states
+
+def frame_message(message_type, payload=b""):
+    return FRAME.pack(len(payload), message_type) + payload
+
+class FrameTooLarge(ValueError):
+    pass
+
+def read_frames(buffer, max_length=MAX_FRAME):
+    # Pops every complete (type, payload) off the front of a bytearray. Raises
+    # FrameTooLarge as soon as a frame announces more than max_length bytes,
+    # so a bad length never makes the caller buffer it.
+    messages = []
+    offset = 0
+    while len(buffer) - offset >= FRAME.size:
+        length, message_type = FRAME.unpack_from(buffer, offset)
+        if length > max_length:
+            raise FrameTooLarge(f"{length} byte frame (limit {max_length})")
+        if len(buffer) - offset - FRAME.size < length:
+            break
+        start = offset + FRAME.size
+        messages.append((message_type, bytes(buffer[start:start + length])))
+        offset = start + length
+    del buffer[:offset]
+    return messages
+
+class ClientConnection:
+    # The server's side of one client
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+        self.player_id = None
+        self.baseline_tick = 0  # Tick of the last snapshot sent (0 = none yet)
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+
+class NetServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, seed=None, enemies=0, tick_hz=TICK_HZ,
+                 physics_hz=mages_game.PHYSICS_HZ, victory_kills=VICTORY_KILLS, sustain=False):
+        self.seed = seed
+        self.wave = enemies
+        self.tick_hz = tick_hz
+        self.physics_hz = physics_hz
+        self.steps_per_tick = max(1, round(physics_hz / tick_hz))
+        self.time_scale = FixedTimestep(physics_hz).time_scale
+        self.victory_kills = victory_kills
+        self.sustain = sustain
+        self.world = self.new_world()
+        self.tick = 0
+        self.next_player_id = 1
+        self.previous_states = {}
+        self.clients = {}
+
+        self.listener = socket.create_server((host, port), backlog=64)
+        self.listener.setblocking(False)
+        self.port = self.listener.getsockname()[1]
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+        # Stats
+        self.tick_times = deque(maxlen=TICK_HZ * 60)
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.full_snapshot_bytes = 0
+
+    def new_world(self):
+        return NetWorld(self.seed, self.wave, self.victory_kills, self.sustain)
+
+    def close(self):
+        for client in list(self.clients.values()):
+            self.drop(client)
+        self.selector.unregister(self.listener)
+        self.listener.close()
+        self.selector.close()
+
+    def drop(self, client):
+        self.selector.unregister(client.sock)
+        client.sock.close()
+        del self.clients[client.sock]
+        if client.player_id is not None:
+            self.world.remove_player(client.player_id)
+
+    def send(self, client, message):
+        client.outbox += message
+        if len(client.outbox) > MAX_SEND_BACKLOG:
+            self.drop(client)
+            return
+        self.flush(client)
+
+    def flush(self, client):
+        try:
+            sent = client.sock.send(client.outbox)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.drop(client)
+            return
+        del client.outbox[:sent]
+        client.bytes_sent += sent
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbox else 0)
+        self.selector.modify(client.sock, events, client)
+
+    def poll(self, timeout):
+        # Accepts connections and reads input until timeout (seconds) runs out
+        for key, events in self.selector.select(max(0.0, timeout)):
+            if key.fileobj is self.listener:
+                try:
+                    sock, address = self.listener.accept()
+                except BlockingIOError:
+                    continue
+                sock.setblocking(False)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                client = ClientConnection(sock, address)
+                self.clients[sock] = client
+                self.selector.register(sock, selectors.EVENT_READ, client)
+                continue
+
+            client = key.data
+            if events & selectors.EVENT_WRITE:
+                self.flush(client)
+                if client.sock not in self.clients:
+                    continue
+            if events & selectors.EVENT_READ:
+                try:
+                    data = client.sock.recv(65536)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    data = b""
+                if not data:
+                    self.drop(client)
+                    continue
+                client.inbox += data
+                try:
+                    for message_type, payload in read_frames(client.inbox, MAX_CLIENT_FRAME):
+                        self.handle_message(client, message_type, payload)
+                except (ValueError, AttributeError, KeyError, TypeError):
+                    # A malformed or oversized message only costs its sender the connection
+                    if client.sock in self.clients:
+                        self.drop(client)
+
+    def handle_message(self, client, message_type, payload):
+        if message_type == MSG_JOIN and client.player_id is None:
+            request = json.loads(payload)
+            if not isinstance(request, dict):
+                raise ValueError("join request is not an object")
+            mage_type = request.get("mage") if request.get("mage") in MAGE_TYPES else MAGE_TYPES[0]
+            client.player_id = self.next_player_id
+            self.next_player_id += 1
+            self.world.add_player(client.player_id, mage_type)
+            client.mage_type = mage_type
+            welcome = {"player": client.player_id, "tick_hz": self.tick_hz, "physics_hz": self.physics_hz,
+                       "victory_kills": self.victory_kills}
+            self.send(client, frame_message(MSG_WELCOME, json.dumps(welcome).encode()))
+        elif message_type == MSG_INPUT and client.player_id is not None:
+            for action in payload:
+                self.world.apply_action(client.player_id, action)
+        elif message_type == MSG_RESYNC and client.player_id is not None:
+            client.baseline_tick = 0  # The next snapshot is a full one
+
+    def run_tick(self):
+        # Physics steps for one tick, then a snapshot to every joined client
+        start = time.perf_counter()
+        world = self.world
+        for _ in range(self.steps_per_tick):
+            world.step(self.time_scale)
+
+        restarted = False
+        if world.finished:
+            if world.finished_at is None:
+                world.finished_at = world.time
+            elif world.time - world.finished_at >= ROUND_RESTART_MS:
+                # Same players, fresh round
+                self.world = self.new_world()
+                for client in self.clients.values():
+                    if client.player_id is not None:
+                        self.world.add_player(client.player_id, client.mage_type)
+                world = self.world
+                restarted = True
+
+        self.tick += 1
+        states = world.entity_states()
+        flags = (FLAG_FINISHED if world.finished else 0) | (FLAG_VICTORY if world.victory else 0)
+        player_info = world.player_info()
+        encoded = {}  # Baseline tick -> message, since most clients share one
+        for client in list(self.clients.values()):
+            if client.player_id is None:
+                continue
+            baseline_tick = 0 if restarted else client.baseline_tick
+            message = encoded.get(baseline_tick)
+            if message is None:
+                baseline = self.previous_states if baseline_tick else {}
+                payload, raw_size = encode_snapshot(self.tick, baseline_tick, states, baseline, flags, player_info)
+                message = encoded[baseline_tick] = frame_message(MSG_SNAPSHOT, payload)
+                self.raw_bytes += raw_size
+                self.compressed_bytes += len(payload)
+            self.send(client, message)
+            client.baseline_tick = self.tick
+            client.snapshots_sent += 1
+        self.previous_states = states
+        self.tick_times.append(time.perf_counter() - start)
+
+    def measure_full_snapshot(self):
+        # Size of a full (non-delta) snapshot of the current state, for comparison
+        world = self.world
+        payload, _ = encode_snapshot(self.tick, 0, world.entity_states(), {}, 0, world.player_info())
+        self.full_snapshot_bytes = len(payload)
+        return self.full_snapshot_bytes
+
+    def stats(self, seconds):
+        times = sorted(self.tick_times)
+        joined = [client for client in self.clients.values() if client.player_id is not None]
+        sent = sum(client.bytes_sent for client in joined)
+        snapshots = sum(client.snapshots_sent for client in joined)
+        return {
+            "players": len(joined),
+            "enemies": len(self.world.enemies),
+            "tick_ms": {
+                "p50": percentile(times, 50) * 1000,
+                "p95": percentile(times, 95) * 1000,
+                "max": times[-1] * 1000 if times else 0.0,
+            },
+            "tick_budget_ms": 1000 / self.tick_hz,
+            "bytes_per_client_per_second": sent / len(joined) / seconds if joined and seconds else 0.0,
+            "average_snapshot_bytes": sent / snapshots if snapshots else 0.0,
+            "full_snapshot_bytes": self.measure_full_snapshot(),
+            "compression": self.compressed_bytes / self.raw_bytes if self.raw_bytes else 0.0,
+        }
+
+    def serve(self, duration=None, on_tick=None):
+        # Runs ticks at tick_hz, reading input in between; on_tick() runs after each tick
+        interval = 1 / self.tick_hz
+        start = time.perf_counter()
+        next_tick = start + interval
+        while duration is None or time.perf_counter() - start < duration:
+            self.poll(next_tick - time.perf_counter())
+            if time.perf_counter() >= next_tick:
+                self.run_tick()
+                next_tick += interval
+                # Don't try to catch up on ticks lost to a stall
+                next_tick = max(next_tick, time.perf_counter())
+                if on_tick is not None:
+                    on_tick()
+        return time.perf_counter() - start
+
+def print_server_stats(stats):
+    tick = stats["tick_ms"]
+    print(f"{stats['players']} players, {stats['enemies']} enemies: tick p50 {tick['p50']:.2f} ms, "
+          f"p95 {tick['p95']:.2f} ms, max {tick['max']:.2f} ms (budget {stats['tick_budget_ms']:.0f} ms)")
+    print(f"Bandwidth: {stats['bytes_per_client_per_second'] / 1024:.1f} KiB/s per client, "
+          f"{stats['average_snapshot_bytes']:.0f} bytes per snapshot "
+          f"(full snapshot {stats['full_snapshot_bytes']} bytes, zlib to {stats['compression']:.0%} of raw)")
+
+# The client's side: joins, sends actions, and keeps recent snapshots for interpolation
+class NetClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, mage_type=MAGE_TYPES[0]):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.sendall(frame_message(MSG_JOIN, json.dumps({"mage": mage_type}).encode()))
+        self.sock.setblocking(False)
+        self.inbox = bytearray()
+        self.player_id = None
+        self.tick_hz = TICK_HZ
+        self.victory_kills = VICTORY_KILLS
+        self.snapshots = deque(maxlen=SNAPSHOT_HISTORY)  # (tick, states)
+        self.latest = None  # (tick, flags, player info, states)
+        self.resyncing = False  # Waiting for a full snapshot after a desync
+        self.resyncs = 0
+        self.clock_offsets = deque(maxlen=CLOCK_WINDOW)  # Local time minus server time, per snapshot
+        self.clock_offset = None  # Smallest of those
+        self.connected = True
+        self.bytes_received = 0
+
+    def close(self):
+        self.sock.close()
+
+    def send_actions(self, actions):
+        if actions and self.connected:
+            try:
+                self.sock.sendall(frame_message(MSG_INPUT, bytes(actions)))
+            except OSError:
+                self.connected = False
+
+    def request_resync(self):
+        # Ask for a full snapshot and ignore deltas until it arrives
+        if not self.resyncing:
+            self.resyncing = True
+            self.resyncs += 1
+            try:
+                self.sock.sendall(frame_message(MSG_RESYNC))
+            except OSError:
+                self.connected = False
+
+    def pump(self):
+        # Reads whatever has arrived; returns the number of snapshots decoded
+        while True:
+            try:
+                data = self.sock.recv(262144)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.connected = False
+                break
+            self.inbox += data
+            self.bytes_received += len(data)
+
+        decoded = 0
+        try:
+            messages = read_frames(self.inbox)
+        except FrameTooLarge:
+            self.connected = False
+            self.sock.close()
+            return decoded
+        for message_type, payload in messages:
+            if message_type == MSG_WELCOME:
+                welcome = json.loads(payload)
+                self.player_id = welcome["player"]
+                self.tick_hz = welcome["tick_hz"]
+                self.victory_kills = welcome["victory_kills"]
+            elif message_type == MSG_SNAPSHOT:
+                try:
+                    if self.resyncing and SNAPSHOT_HEADER.unpack_from(zlib.decompress(payload))[1]:
+                        continue  # Deltas against a baseline we don't have
+                    baseline = self.latest[3] if self.latest else {}
+                    tick, baseline_tick, flags, player_info, states = decode_snapshot(payload, baseline)
+                    if baseline_tick and (self.latest is None or baseline_tick != self.latest[0]):
+                        raise SnapshotDesync(f"delta against tick {baseline_tick}, have "
+                                             f"{self.latest[0] if self.latest else 'none'}")
+                except SnapshotDesync:
+                    self.request_resync()
+                    continue
+                self.resyncing = False
+                if not baseline_tick:
+                    # A full snapshot starts over (new round or first contact)
+                    self.snapshots.clear()
+                self.snapshots.append((tick, states))
+                self.latest = (tick, flags, player_info, states)
+                # Smallest recent offset rather than the smallest ever: the
+                # server skips ticks lost to a stall, which moves its tick clock
+                # back against ours for good
+                self.clock_offsets.append(time.perf_counter() - tick / self.tick_hz)
+                self.clock_offset = min(self.clock_offsets)
+                decoded += 1
+        return decoded
+
+    def view(self, now=None, delay=INTERPOLATION_DELAY):
+        # {section: [(x, y, tag)]} interpolated for server time now - delay
+        if not self.snapshots:
+            return {section: [] for section in SECTIONS}
+        if now is None:
+            now = time.perf_counter()
+        render_tick = (now - self.clock_offset - delay) * self.tick_hz
+
+        older = newer = self.snapshots[-1]
+        for index in range(len(self.snapshots) - 1, 0, -1):
+            if self.snapshots[index - 1][0] <= render_tick:
+                older, newer = self.snapshots[index - 1], self.snapshots[index]
+                break
+        else:
+            older = newer = self.snapshots[0]
+
+        span = newer[0] - older[0]
+        alpha = min(1.0, max(0.0, (render_tick - older[0]) / span)) if span else 1.0
+        view = {}
+        for section in SECTIONS:
+            before = older[1][section]
+            entities = []
+            for entity_id, (x, y, tag) in newer[1][section].items():
+                old = before.get(entity_id)
+                if old is not None:
+                    x, y = round(lerp(old[0], x, alpha)), round(lerp(old[1], y, alpha))
+                entities.append((x, y, tag))
+            view[section] = entities
+        return view
+
+def draw_view(surface, font, view, client):
+    surface.fill(mages_game.BLACK)
+    pygame.draw.rect(surface, mages_game.WHITE, [0, mages_game.SCREEN_HEIGHT - 20, mages_game.SCREEN_WIDTH, 20])
+
+    enemy_image = get_enemy_image()
+    surface.blits([(enemy_image, (x, y)) for x, y, _ in view["enemies"]], False)
+    for x, y, tag in view["players"]:
+        color = mages_game.PROJECTILE_STYLES[MAGE_TYPES[tag]][0]
+        surface.blit(mages_game.get_colored_sprite(40, 60, color), (x, y))
+    surface.blits([(mages_game.get_projectile_image(MAGE_TYPES[tag]), (x, y)) for x, y, tag in view["projectiles"]],
+                  False)
+
+    if client.latest is None:
+        message = render_text(font, "Waiting for the server...", mages_game.WHITE)
+        surface.blit(message, (10, 10))
+        return
+    _, flags, player_info, _ = client.latest
+    own = next((info for info in player_info if info[0] == client.player_id), None)
+    team_kills = sum(info[2] for info in player_info)
+    hud = (f"Enemies Defeated: {own[2] if own else 0} (team {team_kills}/{client.victory_kills * len(player_info)})  "
+           f"Mages standing: {sum(info[3] for info in player_info)}/{len(player_info)}")
+    surface.blit(render_text(font, hud, mages_game.WHITE), (10, 10))
+
+    if flags & FLAG_FINISHED:
+        if flags & FLAG_VICTORY:
+            message = render_text(font, "Victory! Next round soon, or press Q to quit", mages_game.GREEN)
+        else:
+            message = render_text(font, "Game Over! Next round soon, or press Q to quit", mages_game.RED)
+    elif own is not None and not own[3]:
+        message = render_text(font, "You're out! Waiting for the round to end", mages_game.RED)
+    else:
+        return
+    surface.blit(message, (mages_game.SCREEN_WIDTH // 2 - message.get_width() // 2, mages_game.SCREEN_HEIGHT // 2))
+
+def run_client(host, port, mage_type=None):
+    screen = mages_game.init_display()
+    pygame.display.set_caption("Mages of Might and Power - Online")
+    if mage_type is None:
+        mage_type = mages_game.character_selection_screen()
+    font = get_font("Arial", 20)
+    client = NetClient(host, port, mage_type)
+    controls = InputMap(mages_game.MAGE_PRESS, mages_game.MAGE_RELEASE)
+    controls.activate()
+
+    started = time.perf_counter()
+    running = True
+    while running and client.connected:
+        frame_input = controls.poll()
+        if frame_input.quit or mages_game.ACTION_QUIT in frame_input.actions:
+            running = False
+        client.send_actions([action for action in frame_input.actions if action in mages_game.PLAYER_ACTIONS])
+        # Input takes effect on the server, so it isn't timed here
+        controls.discard()
+
+        client.pump()
+        draw_view(screen, font, client.view(), client)
+        pygame.display.flip()
+        mages_game.clock.tick(mages_game.FPS)
+
+    seconds = time.perf_counter() - started
+    client.close()
+    print(f"Received {client.bytes_received / 1024:.0f} KiB in {seconds:.0f} s "
+          f"({client.bytes_received / 1024 / seconds:.1f} KiB/s)")
+
+def run_bench(players, enemies, seconds, seed=0, tick_hz=TICK_HZ):
+    # Server plus bot clients in one process: bots send random actions, decode
+    # every snapshot and build an interpolated view, as a real client would.
+    # Players can't be knocked out and the swarm stays at full size.
+    server = NetServer(DEFAULT_HOST, 0, seed, enemies, tick_hz, victory_kills=10 ** 9, sustain=True)
+    rng = random.Random(seed)
+    bots = []
+    for i in range(players):
+        bots.append(NetClient(DEFAULT_HOST, server.port, MAGE_TYPES[i % len(MAGE_TYPES)]))
+        server.poll(0.05)
+
+    decode_times = []
+
+    def bots_play():
+        for bot in bots:
+            start = time.perf_counter()
+            if bot.pump():
+                bot.view()
+                decode_times.append(time.perf_counter() - start)
+            if rng.random() < 0.3:
+                bot.send_actions([rng.choice(mages_game.PLAYER_ACTIONS)])
+
+    try:
+        elapsed = server.serve(seconds, bots_play)
+        stats = server.stats(elapsed)
+    finally:
+        for bot in bots:
+            bot.close()
+        server.close()
+    decode_times.sort()
+    stats["client_update_ms"] = percentile(decode_times, 50) * 1000
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Co-op Mages of Might and Power over the network")
+    commands = parser.add_subparsers(dest="command", required=True)
+    server = commands.add_parser("server", help="host a session")
+    server.add_argument("--host", default="0.0.0.0", help="address to listen on (0.0.0.0 for the LAN)")
+    client = commands.add_parser("client", help="join a session")
+    client.add_argument("--host", default=DEFAULT_HOST)
+    client.add_argument("--mage", choices=MAGE_TYPES, help="skip the selection screen")
+    bench = commands.add_parser("bench", help="measure tick time and bandwidth with bot players")
+    bench.add_argument("--players", type=int, default=8)
+    bench.add_argument("--seconds", type=float, default=10.0)
+    for command in (server, client):
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    for command in (server, bench):
+        command.add_argument("--enemies", type=int, default=0 if command is server else 300,
+                             help="enemies in the starting wave")
+        command.add_argument("--tick-hz", type=int, default=TICK_HZ, help="snapshots per second")
+        command.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if getattr(args, "tick_hz", 1) <= 0:
+        parser.error("--tick-hz must be a positive number of snapshots per second")
+
+    if args.command == "server":
+        host = NetServer(args.host, args.port, args.seed, args.enemies, args.tick_hz)
+        print(f"Serving Mages of Might and Power on {args.host}:{host.port}")
+        started = time.perf_counter()
+        last_report = [started]
+
+        def report():
+            now = time.perf_counter()
+            if now - last_report[0] >= STATS_INTERVAL and host.clients:
+                print_server_stats(host.stats(now - started))
+                last_report[0] = now
+        try:
+            host.serve(on_tick=report)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            host.close()
+    elif args.command == "client":
+        run_client(args.host, args.port, args.mage)
+        pygame.quit()
+    else:
+        stats = run_bench(args.players, args.enemies, args.seconds, args.seed or 0, args.tick_hz)
+        print_server_stats(stats)
+        print(f"Client snapshot decode and interpolation: p50 {stats['client_update_ms']:.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+# Project: Penguin Platformer Environments
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Step/reset environment API for training and evaluating Penguin Platformer bots.
+# PenguinVectorEnv runs N independent worlds in one process and writes their
+# state into batched NumPy arrays; ParallelPenguinEnv spreads the worlds over a
+# process pool whose workers write straight into shared-memory arrays.
+# World i always uses seed + i, so both give the same results for the same seed.
+#
+# Usage: python penguin_env.py [--envs N] [--workers W] [--steps S] [--level LEVEL]
+
+import sys
+import time
+import argparse
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+import PenguinPlatformer as penguin_game
+from fixed_timestep import FixedTimestep
+from penguin_levels import LevelFile
+
+# Observation columns
+OBS_FIELDS = ("x", "y", "vel_x", "vel_y", "on_ground", "score", "camera_x", "episode_steps")
+OBS_SIZE = len(OBS_FIELDS)
+
+# Action index -> (direction, jump)
+ACTIONS = ((0, False), (-1, False), (1, False), (0, True), (-1, True), (1, True))
+
+ENV_SNOWFLAKES = 0  # Snow is cosmetic, so environments skip it unless asked
+BENCHMARK_STEPS = 1000
+WORKER_CLOSE_TIMEOUT = 5.0  # Seconds a worker gets to exit before it is terminated
+
+class WorkerError(RuntimeError):
+    # An exception raised inside a ParallelPenguinEnv worker, or a worker that died
+    pass
+
+class PenguinVectorEnv:
+    # N worlds stepped together. step() takes one action index per world and
+    # fills obs (N x OBS_SIZE), rewards (score gained) and dones. A world that
+    # ends an episode is restarted at once; its final score is kept in
+    # final_scores. render lists the worlds that get an offscreen surface
+    # (True for all of them).
+    def __init__(self, num_envs, seed=0, level_path=None, snowflake_count=ENV_SNOWFLAKES,
+                 physics_hz=penguin_game.PHYSICS_HZ, max_episode_steps=None, render=(),
+                 first_index=0, buffers=None):
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        self.time_scale = FixedTimestep(physics_hz).time_scale
+
+        # Every world needs its own level file handle, since chunks are read on demand
+        self.levels = [LevelFile(level_path) if level_path else None for _ in range(num_envs)]
+        self.worlds = [penguin_game.GameWorld(seed=seed + first_index + i, snowflake_count=snowflake_count,
+                                              level=self.levels[i])
+                       for i in range(num_envs)]
+
+        if buffers is None:
+            buffers = (np.zeros((num_envs, OBS_SIZE), dtype=np.float32),
+                       np.zeros(num_envs, dtype=np.float32),
+                       np.zeros(num_envs, dtype=bool))
+        self.obs, self.rewards, self.dones = buffers
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.final_scores = np.zeros(num_envs, dtype=np.int64)
+        self.total_steps = 0
+
+        if render is True:
+            render = range(num_envs)
+        self.surfaces = {i: pygame.Surface((penguin_game.SCREEN_WIDTH, penguin_game.SCREEN_HEIGHT)) for i in render}
+        self.font = penguin_game.get_font(None, 36) if self.surfaces else None
+
+    def observe(self, i):
+        world = self.worlds[i]
+        penguin = world.penguin
+        self.obs[i] = (penguin.x, penguin.y, penguin.vel_x, penguin.vel_y, penguin.on_ground,
+                       world.score, world.camera.x, self.episode_steps[i])
+
+    def reset(self):
+        for i, world in enumerate(self.worlds):
+            world.start()
+            self.episode_steps[i] = 0
+            self.observe(i)
+        self.rewards[:] = 0
+        self.dones[:] = False
+        return self.obs
+
+    def step(self, actions):
+        time_scale = self.time_scale
+        max_steps = self.max_episode_steps
+        for i, world in enumerate(self.worlds):
+            direction, jump = ACTIONS[actions[i]]
+            score = world.score
+            world.step(direction, jump, time_scale)
+            self.episode_steps[i] += 1
+            self.rewards[i] = world.score - score
+
+            done = world.state == penguin_game.GAME_OVER or (max_steps is not None and self.episode_steps[i] >= max_steps)
+            self.dones[i] = done
+            if done:
+                self.final_scores[i] = world.score
+                world.start()
+                self.episode_steps[i] = 0
+            self.observe(i)
+        self.total_steps += self.num_envs
+        return self.obs, self.rewards, self.dones
+
+    def render(self, i):
+        surface = self.surfaces.get(i)
+        if surface is None:
+            raise ValueError(f"rendering is not enabled for environment {i}")
+        self.worlds[i].draw(surface, self.font)
+        return surface
+
+    def close(self):
+        for level in self.levels:
+            if level is not None:
+                level.close()
+
+def shared_array(shape, dtype, name=None):
+    # NumPy view over a shared memory block; creates the block when name is None
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    if name is None:
+        block = shared_memory.SharedMemory(create=True, size=max(1, size))
+    else:
+        block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def buffer_layout(num_envs):
+    # (shape, dtype) of the shared obs, rewards, dones and actions arrays
+    return (((num_envs, OBS_SIZE), np.float32), ((num_envs,), np.float32),
+            ((num_envs,), bool), ((num_envs,), np.int8))
+
+def worker_main(conn, names, num_envs, start, count, env_kwargs):
+    # Every reply is ("ok", value) or ("error", traceback text); the first one
+    # reports whether the worker's environments could be created
+    blocks = []
+    views = []
+    env = None
+    try:
+        for name, (shape, dtype) in zip(names, buffer_layout(num_envs)):
+            block, array = shared_array(shape, dtype, name)
+            blocks.append(block)
+            views.append(array[start:start + count])
+        obs, rewards, dones, actions = views
+        env = PenguinVectorEnv(count, first_index=start, buffers=(obs, rewards, dones), **env_kwargs)
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    else:
+        conn.send(("ok", None))
+
+    try:
+        while env is not None:
+            command, argument = conn.recv()
+            if command == "close":
+                break
+            try:
+                if command == "reset":
+                    env.reset()
+                    result = None
+                elif command == "step":
+                    env.step(actions)
+                    result = None
+                elif command == "final_scores":
+                    result = env.final_scores.copy()
+                elif command == "render":
+                    result = pygame.surfarray.array3d(env.render(argument - start))
+                else:
+                    raise ValueError(f"unknown command {command!r}")
+            except Exception:
+                conn.send(("error", traceback.format_exc()))
+            else:
+                conn.send(("ok", result))
+    except (EOFError, OSError):
+        pass  # The parent went away
+    finally:
+        if env is not None:
+            env.close()
+        obs = rewards = dones = actions = array = None
+        views.clear()
+        for block in blocks:
+            block.close()
+        conn.close()
+
+def receive(conn, worker):
+    # A worker's reply, raising WorkerError for an error reply or a dead worker
+    try:
+        status, value = conn.recv()
+    except (EOFError, OSError) as error:
+        raise WorkerError(f"worker {worker} exited unexpectedly") from error
+    if status == "error":
+        raise WorkerError(f"worker {worker} failed:\n{value}")
+    return value
+
+class ParallelPenguinEnv:
+    # Same API as PenguinVectorEnv, with the worlds split across worker
+    # processes. Observations, rewards, dones and actions live in shared memory,
+    # so a step only sends one short message to each worker. render(i) returns
+    # an RGB array (width x height x 3) instead of a surface.
+    def __init__(self, num_envs, num_workers=None, render=(), **env_kwargs):
+        num_workers = min(num_envs, num_workers or mp.cpu_count())
+        self.num_envs = num_envs
+        self.total_steps = 0
+
+        self.blocks = []
+        arrays = []
+        for shape, dtype in buffer_layout(num_envs):
+            block, array = shared_array(shape, dtype)
+            self.blocks.append(block)
+            arrays.append(array)
+        self.obs, self.rewards, self.dones, self.actions = arrays
+        del arrays, array  # close() can only free the blocks once the attributes are the last views
+        names = [block.name for block in self.blocks]
+
+        if render is True:
+            render = range(num_envs)
+        render = set(render)
+
+        self.workers = []
+        self.ranges = []
+        per_worker, extra = divmod(num_envs, num_workers)
+        start = 0
+        try:
+            for w in range(num_workers):
+                count = per_worker + (1 if w < extra else 0)
+                parent, child = mp.Pipe()
+                kwargs = dict(env_kwargs, render=[i - start for i in render if start <= i < start + count])
+                process = mp.Process(target=worker_main, args=(child, names, num_envs, start, count, kwargs),
+                                     daemon=True)
+                process.start()
+                child.close()
+                self.workers.append((process, parent))
+                self.ranges.append((start, count))
+                start += count
+            self.collect()  # Every worker's environments are ready
+        except BaseException:
+            self.close()
+            raise
+
+    def collect(self):
+        # One reply from every worker, in order; the first failure is raised
+        # once all of them have answered, so the pipes stay in step
+        results = []
+        failure = None
+        for worker, (_, conn) in enumerate(self.workers):
+            try:
+                results.append(receive(conn, worker))
+            except WorkerError as error:
+                failure = failure or error
+                results.append(None)
+        if failure is not None:
+            raise failure
+        return results
+
+    def broadcast(self, command, argument=None):
+        for worker, (_, conn) in enumerate(self.workers):
+            try:
+                conn.send((command, argument))
+            except OSError as error:
+                raise WorkerError(f"worker {worker} exited unexpectedly") from error
+        return self.collect()
+
+    def reset(self):
+        self.broadcast("reset")
+        return self.obs
+
+    def step(self, actions):
+        self.actions[:] = actions
+        self.broadcast("step")
+        self.total_steps += self.num_envs
+        return self.obs, self.rewards, self.dones
+
+    @property
+    def final_scores(self):
+        return np.concatenate(self.broadcast("final_scores"))
+
+    def render(self, i):
+        for worker, ((start, count), (_, conn)) in enumerate(zip(self.ranges, self.workers)):
+            if start <= i < start + count:
+                try:
+                    conn.send(("render", i))
+                except OSError as error:
+                    raise WorkerError(f"worker {worker} exited unexpectedly") from error
+                return receive(conn, worker)
+        raise IndexError(i)
+
+    def close(self):
+        # Safe to call more than once, and after a worker has died
+        try:
+            for _, conn in self.workers:
+                try:
+                    conn.send(("close", None))
+                except OSError:
+                    pass  # Already gone
+            for process, conn in self.workers:
+                process.join(WORKER_CLOSE_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+                conn.close()
+            self.workers = []
+        finally:
+            self.obs = self.rewards = self.dones = self.actions = None
+            for block in self.blocks:
+                block.close()
+                block.unlink()
+            self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def random_actions(rng, num_envs):
+    return rng.integers(0, len(ACTIONS), num_envs, dtype=np.int8)
+
+def measure(env, steps=BENCHMARK_STEPS, seed=0):
+    # Aggregate steps per second (world steps across every environment) with random actions
+    rng = np.random.default_rng(seed)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(random_actions(rng, env.num_envs))
+    seconds = time.perf_counter() - start
+    return env.num_envs * steps / seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Penguin Platformer environment throughput")
+    parser.add_argument("--envs", type=int, default=16, help="number of worlds")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 runs every world in this process)")
+    parser.add_argument("--steps", type=int, default=BENCHMARK_STEPS, help="steps per world")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--level", help="level file for every world (see penguin_levels.py)")
+    args = parser.parse_args()
+
+    if args.workers:
+        env = ParallelPenguinEnv(args.envs, args.workers, seed=args.seed, level_path=args.level)
+    else:
+        env = PenguinVectorEnv(args.envs, seed=args.seed, level_path=args.level)
+    try:
+        steps_per_second = measure(env, args.steps, args.seed)
+    finally:
+        env.close()
+    where = f"{args.workers} worker processes" if args.workers else "one process"
+    print(f"{args.envs} worlds in {where}: {steps_per_second:.0f} steps/s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
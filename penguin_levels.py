@@ -0,0 +1,196 @@
+# Project: Penguin Platformer Levels
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+# Compact chunked level files for Penguin Platformer. A level is cut into
+# fixed-width chunks; opening a file reads only the header and chunk table, and
+# each chunk is read on demand, so load time and memory don't grow with length.
+#
+# Layout (little endian):
+#   header       magic "PLVL", version, spawn count, chunk width, chunk count, level width, level height
+#   spawns       x, y per spawn point
+#   chunk table  file offset, platform count, collectible count per chunk
+#   chunk data   platforms (x, y, width, height, flags) then collectibles (x, y);
+#                x is relative to the chunk's left edge
+#
+# A platform that crosses a chunk edge is stored as one piece per chunk, and
+# each piece's flags say which of its sides continue into the next piece, so
+# the game draws no edge there and the platform looks whole.
+#
+# Usage: python penguin_levels.py generate LEVEL [--screens N] [--seed S]
+#        python penguin_levels.py info LEVEL
+
+import sys
+import struct
+import random
+import argparse
+
+LEVEL_MAGIC = b"PLVL"
+LEVEL_VERSION = 2
+CHUNK_WIDTH = 400  # Pixels of level per chunk
+LEVEL_HEIGHT = 600
+SCREEN_WIDTH = 800
+
+HEADER = struct.Struct("<4sHHIIII")
+SPAWN = struct.Struct("<ii")
+CHUNK_ENTRY = struct.Struct("<IHH")
+PLATFORM = struct.Struct("<HhHHB")
+COLLECTIBLE = struct.Struct("<Hh")
+
+# Platform piece flags
+CONTINUES_LEFT = 1
+CONTINUES_RIGHT = 2
+
+class LevelFormatError(ValueError):
+    pass
+
+def split_platform(x, y, width, height, chunk_width):
+    # Platforms that cross a chunk edge are stored as one piece per chunk;
+    # returns (chunk, x, y, width, height, flags) per piece
+    pieces = []
+    flags = 0
+    while width > 0:
+        chunk = x // chunk_width
+        piece_width = min(width, (chunk + 1) * chunk_width - x)
+        pieces.append([chunk, x, y, piece_width, height, flags])
+        x += piece_width
+        width -= piece_width
+        flags = CONTINUES_LEFT
+    for piece in pieces[:-1]:
+        piece[5] |= CONTINUES_RIGHT
+    return [tuple(piece) for piece in pieces]
+
+def write_level(path, platforms, collectibles, spawns, chunk_width=CHUNK_WIDTH, level_height=LEVEL_HEIGHT):
+    # platforms: (x, y, width, height); collectibles and spawns: (x, y); all ints, x >= 0
+    level_width = max([x + width for x, _, width, _ in platforms] + [x + 1 for x, _ in collectibles] + [chunk_width])
+    chunk_count = -(-level_width // chunk_width)
+    chunk_platforms = [[] for _ in range(chunk_count)]
+    chunk_collectibles = [[] for _ in range(chunk_count)]
+
+    for platform in platforms:
+        for chunk, piece_x, piece_y, piece_width, piece_height, flags in split_platform(*platform, chunk_width):
+            chunk_platforms[chunk].append((piece_x - chunk * chunk_width, piece_y, piece_width, piece_height, flags))
+    for x, y in collectibles:
+        chunk = x // chunk_width
+        chunk_collectibles[chunk].append((x - chunk * chunk_width, y))
+
+    data_start = HEADER.size + SPAWN.size * len(spawns) + CHUNK_ENTRY.size * chunk_count
+    table = []
+    blobs = []
+    offset = data_start
+    for chunk in range(chunk_count):
+        blob = b"".join(PLATFORM.pack(*platform) for platform in chunk_platforms[chunk])
+        blob += b"".join(COLLECTIBLE.pack(*collectible) for collectible in chunk_collectibles[chunk])
+        table.append(CHUNK_ENTRY.pack(offset, len(chunk_platforms[chunk]), len(chunk_collectibles[chunk])))
+        blobs.append(blob)
+        offset += len(blob)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, len(spawns), chunk_width, chunk_count, level_width, level_height))
+        for spawn in spawns:
+            f.write(SPAWN.pack(*spawn))
+        f.writelines(table)
+        f.writelines(blobs)
+
+class LevelFile:
+    # Reads the header and chunk table up front, chunk contents on demand
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            header = self.file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise LevelFormatError(f"{path}: truncated header")
+            (magic, version, spawn_count, self.chunk_width, self.chunk_count,
+             self.width, self.height) = HEADER.unpack(header)
+            if magic != LEVEL_MAGIC:
+                raise LevelFormatError(f"{path}: not a Penguin Platformer level")
+            if version != LEVEL_VERSION:
+                raise LevelFormatError(f"{path}: unsupported level version {version}")
+
+            self.spawns = [SPAWN.unpack(self.file.read(SPAWN.size)) for _ in range(spawn_count)]
+            table = self.file.read(CHUNK_ENTRY.size * self.chunk_count)
+            self.chunk_table = [entry for entry in CHUNK_ENTRY.iter_unpack(table)]
+        except Exception:
+            self.file.close()
+            raise
+        self.chunks_read = 0
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def chunk_at(self, x):
+        return int(x // self.chunk_width)
+
+    def read_chunk(self, chunk):
+        # Returns (platforms, collectibles) in level coordinates; platforms are
+        # (x, y, width, height, flags)
+        offset, platform_count, collectible_count = self.chunk_table[chunk]
+        self.file.seek(offset)
+        data = self.file.read(PLATFORM.size * platform_count + COLLECTIBLE.size * collectible_count)
+        self.chunks_read += 1
+
+        left = chunk * self.chunk_width
+        split = PLATFORM.size * platform_count
+        platforms = [(left + x, y, width, height, flags)
+                     for x, y, width, height, flags in PLATFORM.iter_unpack(data[:split])]
+        collectibles = [(left + x, y) for x, y in COLLECTIBLE.iter_unpack(data[split:])]
+        return platforms, collectibles
+
+def generate_level(screens, seed=0, screen_width=SCREEN_WIDTH, height=LEVEL_HEIGHT):
+    # Endless ground with floating platforms and two collectibles per platform,
+    # laid out like the hand-made first screen
+    rng = random.Random(seed)
+    width = screens * screen_width
+    platforms = [(0, height - 100, width, 20)]
+    collectibles = []
+
+    x = 100
+    while x < width - 150:
+        platform_width = rng.randint(100, 200)
+        y = height - rng.choice((200, 250, 300, 350, 400, 450))
+        platforms.append((x, y, platform_width, 20))
+        x += platform_width + rng.randint(50, 150)
+
+    for platform_x, platform_y, platform_width, _ in platforms:
+        count = 2 if platform_width < screen_width else max(2, platform_width // 400)
+        for _ in range(count):
+            collectibles.append((platform_x + rng.randint(20, platform_width - 20), platform_y - 30))
+
+    spawns = [(screen_width // 4, height // 2)]
+    return platforms, collectibles, spawns
+
+def main():
+    parser = argparse.ArgumentParser(description="Penguin Platformer level files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="write a procedurally generated level")
+    generate.add_argument("path")
+    generate.add_argument("--screens", type=int, default=100, help="level length in screens")
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--chunk-width", type=int, default=CHUNK_WIDTH)
+    info = commands.add_parser("info", help="describe a level file")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        platforms, collectibles, spawns = generate_level(args.screens, args.seed)
+        write_level(args.path, platforms, collectibles, spawns, args.chunk_width)
+        print(f"Wrote {args.path}: {len(platforms)} platforms, {len(collectibles)} collectibles")
+    else:
+        with LevelFile(args.path) as level:
+            platform_total = sum(entry[1] for entry in level.chunk_table)
+            collectible_total = sum(entry[2] for entry in level.chunk_table)
+            print(f"{args.path}: {level.width}x{level.height} px, {level.chunk_count} chunks of {level.chunk_width} px")
+            print(f"{platform_total} platform pieces, {collectible_total} collectibles, spawns {level.spawns}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# Project: Session Replays
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+# Deterministic input recording and replay for both pygame games. A recording
+# stores the RNG seed, the physics rate and, for every physics step, the input
+# codes applied before it plus a checksum of the game state after it. Replays
+# re-run the session headless as fast as possible and stop at the first step
+# whose checksum differs, which points straight at any nondeterminism.
+#
+# File layout: magic "RPLY", version, JSON metadata (game, seed, physics rate,
+# game options), then a zlib compressed body of steps (code count, codes, crc32
+# of the state).
+#
+# Usage: python replay.py SESSION.rply [--no-verify]
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+
+REPLAY_MAGIC = b"RPLY"
+REPLAY_VERSION = 1
+
+HEADER = struct.Struct("<4sHH")  # magic, version, metadata length
+STEP_CHECKSUM = struct.Struct("<I")
+
+class ReplayError(ValueError):
+    pass
+
+def state_checksum(*parts):
+    # crc32 over the bytes of every part (bytes, or anything struct can pack as doubles)
+    crc = 0
+    for part in parts:
+        if not isinstance(part, (bytes, bytearray, memoryview)):
+            part = struct.pack(f"<{len(part)}d", *part)
+        crc = zlib.crc32(part, crc)
+    return crc
+
+class ReplayRecorder:
+    def __init__(self, game, seed, physics_hz, **meta):
+        self.meta = {"game": game, "seed": seed, "physics_hz": physics_hz}
+        self.meta.update(meta)
+        self.body = bytearray()
+        self.steps = 0
+
+    def record(self, codes, checksum):
+        # codes: small ints (0-255) applied before this step
+        self.body.append(len(codes))
+        self.body.extend(codes)
+        self.body.extend(STEP_CHECKSUM.pack(checksum))
+        self.steps += 1
+
+    def save(self, path):
+        meta = dict(self.meta, steps=self.steps)
+        meta_bytes = json.dumps(meta).encode()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, len(meta_bytes)))
+            f.write(meta_bytes)
+            f.write(zlib.compress(bytes(self.body), 9))
+
+class Replay:
+    def __init__(self, meta, steps):
+        self.meta = meta
+        self.steps = steps  # list of (codes, checksum)
+
+    @property
+    def game(self):
+        return self.meta["game"]
+
+    @property
+    def seed(self):
+        return self.meta["seed"]
+
+    @property
+    def physics_hz(self):
+        return self.meta["physics_hz"]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ReplayError(f"{path}: truncated header")
+        magic, version, meta_length = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ReplayError(f"{path}: not a replay file")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"{path}: unsupported replay version {version}")
+        meta = json.loads(data[HEADER.size:HEADER.size + meta_length])
+        body = zlib.decompress(data[HEADER.size + meta_length:])
+
+        steps = []
+        offset = 0
+        while offset < len(body):
+            count = body[offset]
+            codes = tuple(body[offset + 1:offset + 1 + count])
+            offset += 1 + count
+            checksum, = STEP_CHECKSUM.unpack_from(body, offset)
+            offset += STEP_CHECKSUM.size
+            steps.append((codes, checksum))
+        return cls(meta, steps)
+
+class ReplayResult:
+    def __init__(self, steps, seconds, mismatch=None):
+        self.steps = steps
+        self.seconds = seconds
+        self.mismatch = mismatch  # (step, expected, actual) or None
+
+    @property
+    def ok(self):
+        return self.mismatch is None
+
+    @property
+    def steps_per_second(self):
+        return self.steps / self.seconds if self.seconds else float("inf")
+
+def game_module(name):
+    if name == "penguin":
+        import PenguinPlatformer as game
+    elif name == "mages":
+        import MagesofMightandPower as game
+    else:
+        raise ReplayError(f"unknown game {name!r}")
+    return game
+
+def replay_world(replay):
+    # (world, step) for the game the replay was recorded in; step(codes)
+    # applies one recorded step and returns the new state checksum
+    return game_module(replay.game).replay_world(replay)
+
+def run_replay(replay, verify=True):
+    _, step = replay_world(replay)
+    start = time.perf_counter()
+    for number, (codes, expected) in enumerate(replay.steps):
+        actual = step(codes)
+        if verify and actual != expected:
+            return ReplayResult(number + 1, time.perf_counter() - start, (number, expected, actual))
+    return ReplayResult(len(replay.steps), time.perf_counter() - start)
+
+def numbered_path(path, number):
+    # session.rply, session-2.rply, session-3.rply, ... for one file per match
+    if number <= 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{number}{ext}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run a recorded session headless and check it")
+    parser.add_argument("path")
+    parser.add_argument("--no-verify", action="store_true", help="skip the per-step checksum comparison")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    replay = Replay.load(args.path)
+    result = run_replay(replay, not args.no_verify)
+    print(f"{args.path}: {replay.game}, seed {replay.seed}, {len(replay.steps)} recorded steps")
+    print(f"Replayed {result.steps} steps in {result.seconds * 1000:.1f} ms ({result.steps_per_second:.0f} steps/s)")
+    if result.ok:
+        print("All checksums match" if not args.no_verify else "Checksums not verified")
+        return 0
+    step, expected, actual = result.mismatch
+    print(f"DESYNC at step {step}: expected {expected:08x}, got {actual:08x}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# Project: Dragon Ball Z Binary Roster Tests
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+# Round-trip and format checks for dbz_roster.py binary rosters, with lookups
+# and power level ranges checked against a plain list of fighters.
+#
+# Usage: python -m unittest test_dbz_roster
+
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+import dbz_roster
+from dbz_roster import BinaryRoster, RosterFormatError
+
+class BinaryRosterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "roster.dbzr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_and_ranges(self):
+        rng = random.Random(6)
+        fighters = [(f"Fighter {i + 1}", rng.randint(-50, 50)) for i in range(500)]
+        fighters += [("Kakarot", 9001), ("Bulma", 12), ("Trunks é", 40)]
+        self.assertEqual(dbz_roster.write_binary_roster(self.path, fighters), len(fighters))
+
+        by_power = sorted(fighters, key=lambda fighter: fighter[1])  # Stable, like the file
+        with BinaryRoster(self.path) as roster:
+            self.assertEqual(len(roster), len(fighters))
+            self.assertEqual(roster.names(), [name for name, _ in by_power])
+            for name, power in fighters:
+                self.assertEqual(roster.lookup(name), (name, power))
+                self.assertEqual(roster.power(name.upper()), power)
+            self.assertIsNone(roster.lookup("Frieza"))
+            self.assertIsNone(roster.power(""))
+
+            for _ in range(200):
+                low = rng.randint(-60, 60)
+                high = low + rng.randint(-5, 40)
+                expected = [fighter for fighter in by_power if low <= fighter[1] <= high]
+                self.assertEqual(list(roster.power_range(low, high)), expected)
+                self.assertEqual(roster.count_range(low, high), len(expected))
+
+    def test_repeated_names_find_the_first(self):
+        fighters = [("Goku", 500), ("Vegeta", 300), ("goku", 100), ("GOKU", 900)]
+        dbz_roster.write_binary_roster(self.path, fighters)
+        with BinaryRoster(self.path) as roster:
+            self.assertEqual(roster.lookup("gOkU"), ("Goku", 500))
+
+    def test_empty_roster(self):
+        self.assertEqual(dbz_roster.write_binary_roster(self.path, []), 0)
+        with BinaryRoster(self.path) as roster:
+            self.assertEqual(len(roster), 0)
+            self.assertIsNone(roster.lookup("Goku"))
+            self.assertEqual(roster.count_range(-10, 10), 0)
+            self.assertEqual(list(roster.power_range(-10, 10)), [])
+            self.assertEqual(roster.names(), [])
+
+    def test_bad_files(self):
+        dbz_roster.write_binary_roster(self.path, [("Goku", 9001), ("Krillin", 1770)])
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        cases = {
+            "truncated header": data[:dbz_roster.HEADER.size - 1],
+            "not a binary roster": b"XXXX" + data[4:],
+            "unsupported roster version": data[:4] + struct.pack("<H", dbz_roster.ROSTER_VERSION + 1) + data[6:],
+            "truncated roster": data[:-1],
+        }
+        for message, contents in cases.items():
+            with open(self.path, "wb") as f:
+                f.write(contents)
+            with self.assertRaisesRegex(RosterFormatError, message):
+                BinaryRoster(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
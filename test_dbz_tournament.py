@@ -0,0 +1,64 @@
+# Project: Dragon Ball Z Power Level Tournament Tests
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+#           Requires NumPy - https://pypi.org/project/numpy
+# Checks the batch modes in dbz_tournament.py against match-by-match showdown()
+# results.
+#
+# Usage: python -m unittest test_dbz_tournament
+
+import random
+import unittest
+
+import dbz_tournament
+from dbz_tournament import showdown, TIE, np
+
+@unittest.skipIf(np is None, "the batch modes require NumPy")
+class TournamentTest(unittest.TestCase):
+    def test_ranks(self):
+        self.assertEqual(dbz_tournament.ranks([900, 500, 500, 100]).tolist(), [1, 2, 2, 4])
+        self.assertEqual(dbz_tournament.ranks([7, 7, 7]).tolist(), [1, 1, 1])
+        self.assertEqual(dbz_tournament.ranks([3, 2, 1]).tolist(), [1, 2, 3])
+        self.assertEqual(dbz_tournament.ranks([]).tolist(), [])
+
+    def test_pairwise_records_match_showdowns(self):
+        rng = random.Random(2)
+        powers = [rng.randint(1, 20) for _ in range(60)]  # Small range, plenty of ties
+        wins, ties, losses = dbz_tournament.pairwise_records(powers)
+        for index, power in enumerate(powers):
+            results = [showdown("a", power, "b", other) for position, other in enumerate(powers) if position != index]
+            self.assertEqual((wins[index], ties[index], losses[index]),
+                             (results.count("a"), results.count(TIE), results.count("b")))
+
+    def brute_force_bracket(self, names, powers):
+        alive = list(range(len(names)))
+        rounds = []
+        while len(alive) > 1:
+            matches = []
+            winners = []
+            for a, b in zip(alive[0::2], alive[1::2]):
+                winner = showdown(names[a], powers[a], names[b], powers[b])
+                matches.append((a, b, 0 if winner == TIE else 1 if winner == names[a] else -1))
+                winners.append(b if winner == names[b] else a)  # The first-listed fighter advances on a tie
+            if len(alive) % 2:
+                winners.append(alive[-1])  # Bye
+            rounds.append(matches)
+            alive = winners
+        return (names[alive[0]] if alive else None), rounds
+
+    def test_bracket_matches_showdowns(self):
+        rng = random.Random(8)
+        for count in (0, 1, 2, 3, 5, 8, 13, 64, 101):
+            names = [f"Fighter {i + 1}" for i in range(count)]
+            powers = [rng.randint(1, 10) for _ in range(count)]
+            self.assertEqual(dbz_tournament.bracket(names, powers), self.brute_force_bracket(names, powers))
+
+    def test_bracket_ties_and_byes(self):
+        champion, rounds = dbz_tournament.bracket(["Goku", "Vegeta", "Gohan"], [9000, 9000, 8000])
+        self.assertEqual(rounds, [[(0, 1, 0)], [(0, 2, 1)]])
+        self.assertEqual(champion, "Goku")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+# Project: Mages of Might and Power - Network Play Tests
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Tests for mages_net.py: server robustness over real localhost sockets,
+# message framing and the snapshot codec.
+#
+# Usage: python -m unittest test_mages_net
+
+import os
+import json
+import time
+import socket
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import mages_net
+
+POLL_TIMEOUT = 5.0  # Seconds to wait for the server to see a connection change
+
+class NetServerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = mages_net.NetServer(mages_net.DEFAULT_HOST, 0, seed=1, enemies=5)
+        self.address = (mages_net.DEFAULT_HOST, self.server.port)
+
+    def tearDown(self):
+        self.server.close()
+
+    def poll_until(self, condition):
+        deadline = time.perf_counter() + POLL_TIMEOUT
+        while not condition():
+            self.assertLess(time.perf_counter(), deadline, "server did not catch up")
+            self.server.poll(0.01)
+
+    def joined(self):
+        return [client for client in self.server.clients.values() if client.player_id is not None]
+
+    def connect(self, payload, message_type=mages_net.MSG_JOIN):
+        sock = socket.create_connection(self.address)
+        sock.sendall(mages_net.frame_message(message_type, payload))
+        return sock
+
+    def join(self, mage_type="fire"):
+        return self.connect(json.dumps({"mage": mage_type}).encode())
+
+    def test_player_ids_past_one_byte(self):
+        for _ in range(300):
+            sock = self.join()
+            self.poll_until(lambda: len(self.joined()) == 1)
+            sock.close()
+            self.poll_until(lambda: not self.server.clients)
+
+        client = mages_net.NetClient(*self.address, "water")
+        try:
+            self.poll_until(lambda: len(self.joined()) == 1)
+            self.server.run_tick()
+            deadline = time.perf_counter() + POLL_TIMEOUT
+            while client.latest is None and time.perf_counter() < deadline:
+                client.pump()
+            self.assertEqual(client.player_id, 301)
+            self.assertIsNotNone(client.latest)
+            _, _, player_info, _ = client.latest
+            self.assertEqual([info[0] for info in player_info], [301])
+        finally:
+            client.close()
+
+    def test_garbage_only_drops_its_sender(self):
+        good = mages_net.NetClient(*self.address, "earth")
+        bad = [self.connect(b"\xff\xfe not json"), self.connect(b"[1, 2, 3]"), self.connect(b"null"),
+               self.connect(json.dumps({"mage": ["fire"]}).encode())]
+        try:
+            self.poll_until(lambda: len(self.joined()) == 2 and len(self.server.clients) == 2)
+            good.send_actions(list(b"\x00\x07\xff"))  # Unknown action codes are ignored
+            self.server.poll(0.05)
+            self.server.run_tick()
+
+            deadline = time.perf_counter() + POLL_TIMEOUT
+            while good.latest is None and time.perf_counter() < deadline:
+                good.pump()
+            self.assertTrue(good.connected)
+            self.assertIsNotNone(good.latest)
+        finally:
+            good.close()
+            for sock in bad:
+                sock.close()
+
+    def snapshot_for(self, client, tick):
+        deadline = time.perf_counter() + POLL_TIMEOUT
+        while (client.latest is None or client.latest[0] < tick) and time.perf_counter() < deadline:
+            client.pump()
+            self.server.poll(0.005)
+
+    def test_desync_requests_a_full_snapshot(self):
+        client = mages_net.NetClient(*self.address, "fire")
+        try:
+            self.poll_until(lambda: len(self.joined()) == 1)
+            self.server.run_tick()
+            self.snapshot_for(client, 1)
+            self.assertEqual(client.latest[0], 1)
+
+            # Lose an enemy the next delta will move
+            del client.latest[3]["enemies"][next(iter(client.latest[3]["enemies"]))]
+            self.server.run_tick()
+            self.poll_until(lambda: client.pump() is not None and client.resyncing)
+            self.assertEqual(client.resyncs, 1)
+            self.assertEqual(client.latest[0], 1)  # The broken delta was not applied
+
+            # The server answers with a full snapshot and the client matches it again
+            self.poll_until(lambda: self.joined()[0].baseline_tick == 0)
+            self.server.run_tick()
+            self.snapshot_for(client, 3)
+            self.assertFalse(client.resyncing)
+            self.assertEqual(client.latest[3], self.server.previous_states)
+        finally:
+            client.close()
+
+    def test_oversized_frame_drops_its_sender(self):
+        good = mages_net.NetClient(*self.address, "air")
+        bad = socket.create_connection(self.address)
+        try:
+            # Announce a ~4 GiB payload and start sending it
+            bad.sendall(mages_net.FRAME.pack(0xFFFFFFF0, mages_net.MSG_JOIN) + b"x" * 1024)
+            self.poll_until(lambda: len(self.server.clients) == 2)
+            self.poll_until(lambda: len(self.server.clients) == 1)
+            self.assertEqual(len(self.joined()), 1)
+            self.assertTrue(all(len(client.inbox) <= mages_net.MAX_CLIENT_FRAME
+                                for client in self.server.clients.values()))
+        finally:
+            good.close()
+            bad.close()
+
+class FrameTest(unittest.TestCase):
+    def test_read_frames_limit(self):
+        buffer = bytearray(mages_net.frame_message(mages_net.MSG_INPUT, b"\x01\x02"))
+        buffer += mages_net.FRAME.pack(100, mages_net.MSG_INPUT)
+        self.assertEqual(mages_net.read_frames(buffer, 100), [(mages_net.MSG_INPUT, b"\x01\x02")])
+        self.assertEqual(len(buffer), mages_net.FRAME.size)  # The partial frame waits for its payload
+        with self.assertRaises(mages_net.FrameTooLarge):
+            mages_net.read_frames(buffer, 99)
+
+class SnapshotTest(unittest.TestCase):
+    def round_trip(self, states, baseline, player_info=()):
+        payload, _ = mages_net.encode_snapshot(7, 6 if baseline else 0, states, baseline, 0, list(player_info))
+        return mages_net.decode_snapshot(payload, baseline)
+
+    def test_values_past_16_bits(self):
+        enemies = {entity_id: (entity_id % 1000, -entity_id % 700, 0) for entity_id in range(70_000)}
+        states = {"players": {1: (40_000, -40_000, 2)}, "projectiles": {2 ** 32 - 1: (-5, 900, 1)},
+                  "enemies": enemies}
+        player_info = [(300, 2, 70_000, True), (2 ** 31, 0, 0, False)]
+        tick, baseline_tick, _, decoded_info, decoded = self.round_trip(states, {}, player_info)
+        self.assertEqual((tick, baseline_tick), (7, 0))
+        self.assertEqual(decoded, states)
+        self.assertEqual(decoded_info, player_info)
+
+        # Every enemy moves a little and the rest of the world changes: a delta
+        # snapshot with more than 65535 moved records
+        moved = {"players": {1: (-40_000, 40_000, 2)}, "projectiles": {},
+                 "enemies": {entity_id: (x + 1, y - 1, tag) for entity_id, (x, y, tag) in enemies.items()}}
+        _, baseline_tick, _, _, decoded = self.round_trip(moved, states)
+        self.assertEqual(baseline_tick, 6)
+        self.assertEqual(decoded, moved)
+
+    def test_unknown_moved_id_is_a_desync(self):
+        baseline = {"players": {}, "projectiles": {}, "enemies": {5: (10, 10, 0)}}
+        states = {"players": {}, "projectiles": {}, "enemies": {5: (11, 12, 0)}}
+        payload, _ = mages_net.encode_snapshot(2, 1, states, baseline, 0, [])
+        with self.assertRaises(mages_net.SnapshotDesync):
+            mages_net.decode_snapshot(payload, {"players": {}, "projectiles": {}, "enemies": {}})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# Project: Penguin Platformer Level Tests
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires Python to run. Python.org
+# Round-trip and format checks for penguin_levels.py level files.
+#
+# Usage: python -m unittest test_penguin_levels
+
+import os
+import struct
+import tempfile
+import unittest
+
+import penguin_levels
+from penguin_levels import LevelFile, LevelFormatError, CONTINUES_LEFT, CONTINUES_RIGHT
+
+class LevelFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "level.plvl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_all(self, level):
+        platforms = []
+        collectibles = []
+        for chunk in range(level.chunk_count):
+            chunk_platforms, chunk_collectibles = level.read_chunk(chunk)
+            platforms += chunk_platforms
+            collectibles += chunk_collectibles
+        return platforms, collectibles
+
+    def test_generated_level_round_trip(self):
+        platforms, collectibles, spawns = penguin_levels.generate_level(12, seed=4)
+        penguin_levels.write_level(self.path, platforms, collectibles, spawns)
+
+        with LevelFile(self.path) as level:
+            self.assertEqual(level.spawns, spawns)
+            self.assertEqual(level.width, 12 * penguin_levels.SCREEN_WIDTH)
+            self.assertEqual(level.chunk_count, -(-level.width // level.chunk_width))
+            pieces, read_collectibles = self.read_all(level)
+            self.assertEqual(level.chunks_read, level.chunk_count)
+
+        self.assertEqual(sorted(read_collectibles), sorted(collectibles))
+
+        # Join the pieces back up along their continues flags
+        joined = []
+        for x, y, width, height, flags in sorted(pieces, key=lambda piece: (piece[1], piece[0])):
+            if flags & CONTINUES_LEFT:
+                last_x, last_y, last_width, last_height = joined[-1]
+                self.assertEqual((last_x + last_width, last_y, last_height), (x, y, height))
+                joined[-1] = (last_x, last_y, last_width + width, last_height)
+            else:
+                joined.append((x, y, width, height))
+        self.assertEqual(sorted(joined), sorted(platforms))
+
+        # Every piece sits inside its chunk
+        for x, _, width, _, flags in pieces:
+            self.assertEqual(x // penguin_levels.CHUNK_WIDTH, (x + width - 1) // penguin_levels.CHUNK_WIDTH)
+
+    def test_split_flags(self):
+        pieces = penguin_levels.split_platform(350, 100, 500, 20, 400)
+        self.assertEqual(pieces, [(0, 350, 100, 50, 20, CONTINUES_RIGHT),
+                                  (1, 400, 100, 400, 20, CONTINUES_LEFT | CONTINUES_RIGHT),
+                                  (2, 800, 100, 50, 20, CONTINUES_LEFT)])
+        self.assertEqual(penguin_levels.split_platform(400, 100, 400, 20, 400), [(1, 400, 100, 400, 20, 0)])
+
+    def test_bad_files(self):
+        penguin_levels.write_level(self.path, [(0, 500, 800, 20)], [(10, 470)], [(200, 300)])
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        cases = {
+            "truncated header": data[:penguin_levels.HEADER.size - 1],
+            "not a Penguin Platformer level": b"XXXX" + data[4:],
+            "unsupported level version": data[:4] + struct.pack("<H", 1) + data[6:],
+        }
+        for message, contents in cases.items():
+            with open(self.path, "wb") as f:
+                f.write(contents)
+            with self.assertRaisesRegex(LevelFormatError, message):
+                LevelFile(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
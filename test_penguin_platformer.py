@@ -0,0 +1,110 @@
+# Project: Penguin Platformer Tests
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame and NumPy - https://pypi.org/project/pygame
+# Tests for the data structures behind Penguin Platformer's collision checks
+# and live entity lists.
+#
+# Usage: python -m unittest test_penguin_platformer
+
+import os
+import random
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from PenguinPlatformer import SpatialHash, EntityStore
+
+class Box:
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+def overlaps(box, x, y, width, height):
+    return box.x <= x + width and x <= box.x + box.width and box.y <= y + height and y <= box.y + box.height
+
+class SpatialHashTest(unittest.TestCase):
+    def test_query_finds_every_overlap_in_insertion_order(self):
+        rng = random.Random(3)
+        boxes = [Box(rng.randint(-200, 2000), rng.randint(-100, 600), rng.randint(1, 400), rng.randint(1, 60))
+                 for _ in range(300)]
+        index = SpatialHash(cell_size=64)
+        for box in boxes:
+            index.insert(box)
+        self.assertEqual(len(index), len(boxes))
+        self.assertEqual(index.items(), boxes)
+
+        order = {id(box): position for position, box in enumerate(boxes)}
+        for _ in range(200):
+            x, y = rng.randint(-300, 2100), rng.randint(-150, 650)
+            width, height = rng.randint(1, 300), rng.randint(1, 100)
+            found = index.query(x, y, width, height)
+            self.assertEqual([order[id(box)] for box in found], sorted(order[id(box)] for box in found))
+            self.assertEqual(len({id(box) for box in found}), len(found))
+            found_ids = {id(box) for box in found}
+            for box in boxes:
+                if overlaps(box, x, y, width, height):
+                    self.assertIn(id(box), found_ids)
+
+    def test_remove_and_reinsert(self):
+        index = SpatialHash(cell_size=50)
+        first, second, third = Box(0, 0, 120, 20), Box(10, 10, 20, 20), Box(500, 500, 10, 10)
+        for box in (first, second, third):
+            index.insert(box)
+
+        self.assertTrue(index.remove(first))
+        self.assertFalse(index.remove(first))
+        self.assertEqual(index.query(0, 0, 200, 40), [second])
+        self.assertEqual(len(index), 2)
+
+        # Inserting again moves an item to the end of the order, at its new position
+        second.x, second.y = 505, 505
+        index.insert(second)
+        self.assertEqual(index.query(0, 0, 200, 40), [])
+        self.assertEqual(index.query(495, 495, 30, 30), [third, second])
+        self.assertEqual(index.items(), [third, second])
+
+        index.remove(second)
+        index.remove(third)
+        self.assertEqual(index.cells, {})
+
+class EntityStoreTest(unittest.TestCase):
+    def test_swap_remove_keeps_handles_valid(self):
+        rng = random.Random(5)
+        store = EntityStore()
+        live = {}  # handle -> item, the reference the store must agree with
+        for step in range(2000):
+            if live and rng.random() < 0.45:
+                handle = rng.choice(list(live))
+                self.assertIs(store.remove(handle), live.pop(handle))
+                self.assertIsNone(store.remove(handle))  # Stale now
+                self.assertNotIn(handle, store)
+            else:
+                item = object()
+                handle = store.add(item)
+                self.assertNotIn(handle, live)
+                live[handle] = item
+            self.assertEqual(len(store), len(live))
+        for handle, item in live.items():
+            self.assertIn(handle, store)
+            self.assertIs(store.get(handle), item)
+        self.assertEqual({id(item) for item in store}, {id(item) for item in live.values()})
+
+    def test_remove_last_and_clear(self):
+        store = EntityStore()
+        first, second = store.add("a"), store.add("b")
+        self.assertEqual(store.remove(second), "b")
+        self.assertEqual(list(store), ["a"])
+        self.assertEqual(store.remove(first), "a")
+        self.assertEqual(list(store), [])
+        third = store.add("c")
+        self.assertNotIn(third, (first, second))  # Handles are never reused
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertIsNone(store.get(third))
+
+if __name__ == "__main__":
+    unittest.main()
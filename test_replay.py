@@ -0,0 +1,85 @@
+# Project: Session Replay Tests
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+# Round-trip and format checks for replay.py files, plus a recorded Penguin
+# Platformer session replayed headless.
+#
+# Usage: python -m unittest test_replay
+
+import os
+import struct
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import replay
+from replay import Replay, ReplayRecorder, ReplayError
+
+class ReplayFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.rply")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        steps = [((), 0), ((1,), 0xFFFFFFFF), ((0, 7, 255), 12345), (tuple(range(255)), 1)]
+        recorder = ReplayRecorder("mages", 42, 120, mage="water")
+        for codes, checksum in steps:
+            recorder.record(codes, checksum)
+        recorder.save(self.path)
+
+        loaded = Replay.load(self.path)
+        self.assertEqual((loaded.game, loaded.seed, loaded.physics_hz), ("mages", 42, 120))
+        self.assertEqual(loaded.meta["mage"], "water")
+        self.assertEqual(loaded.meta["steps"], len(steps))
+        self.assertEqual(loaded.steps, steps)
+
+    def test_bad_files(self):
+        recorder = ReplayRecorder("penguin", 1, 60)
+        recorder.record((1,), 5)
+        recorder.save(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        cases = {
+            "truncated header": data[:replay.HEADER.size - 1],
+            "not a replay file": b"XXXX" + data[4:],
+            "unsupported replay version": data[:4] + struct.pack("<H", replay.REPLAY_VERSION + 1) + data[6:],
+        }
+        for message, contents in cases.items():
+            with open(self.path, "wb") as f:
+                f.write(contents)
+            with self.assertRaisesRegex(ReplayError, message):
+                Replay.load(self.path)
+
+    def test_state_checksum(self):
+        self.assertEqual(replay.state_checksum(b"abc", [1.0, 2.5]), replay.state_checksum(b"abc", (1.0, 2.5)))
+        self.assertNotEqual(replay.state_checksum(b"abc", [1.0, 2.5]), replay.state_checksum(b"abc", [2.5, 1.0]))
+
+class PenguinReplayTest(unittest.TestCase):
+    def test_recorded_session_verifies(self):
+        import PenguinPlatformer as penguin_game
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "penguin.rply")
+            penguin_game.run_headless(frames=300, seed=9, snowflake_count=50, record=path)
+            session = Replay.load(path)
+
+        self.assertEqual(session.game, "penguin")
+        self.assertEqual(len(session.steps), session.meta["steps"])
+        self.assertTrue(replay.run_replay(session).ok)
+
+        # A changed checksum is reported at its step
+        codes, checksum = session.steps[100]
+        session.steps[100] = (codes, checksum ^ 1)
+        result = replay.run_replay(session)
+        self.assertEqual(result.mismatch, (100, checksum ^ 1, checksum))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# Project: Text Cache
+# Version :  0.1
+# Date    :  10/17/2026
+# Author: Jody Ingram
+# Pre-reqs: Requires PyGame libraries - https://pypi.org/project/pygame
+# Shared font registry and LRU cache of rendered text for HUDs and menus, so
+# unchanged text costs one blit instead of a font lookup plus a glyph render.
+# Fonts can be loaded ahead of time on a background thread (warm_fonts), since
+# the first SysFont call scans every installed font.
+
+import threading
+from collections import OrderedDict
+
+import pygame
+
+TEXT_CACHE_SIZE = 256  # Rendered strings kept before the least recently used is dropped
+
+class FontRegistry:
+    # Fonts are loaded once per (name, size); name None is pygame's default font
+    def __init__(self):
+        self.fonts = {}
+        self.lock = threading.Lock()
+
+    def get(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            # A font being loaded by a warm-up thread is waited for, not loaded twice
+            with self.lock:
+                font = self.fonts.get(key)
+                if font is None:
+                    if name is None:
+                        font = pygame.font.Font(None, size)
+                    else:
+                        font = pygame.font.SysFont(name, size)
+                    self.fonts[key] = font
+        return font
+
+    def loaded(self, name, size):
+        # The font if it is ready, without waiting for it
+        return self.fonts.get((name, size))
+
+    def warm(self, specs):
+        # Load (name, size) fonts on a daemon thread; returns the thread
+        thread = threading.Thread(target=lambda: [self.get(name, size) for name, size in specs],
+                                  name="font-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        self.fonts.clear()
+
+class TextCache:
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+# Shared instances used by both games
+fonts = FontRegistry()
+text_cache = TextCache()
+
+def get_font(name, size):
+    return fonts.get(name, size)
+
+def warm_fonts(specs):
+    return fonts.warm(specs)
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)